@@ -3,12 +3,21 @@ __version__ = '2022.2.2'
 from .camera.camera import Camera
 from .camera.camera_calibration import CameraCalibration
 from .camera.camera_configuration import CameraConfiguration
+from .camera.camera_group import CameraGroup
+from .camera.camera_health import CameraHealth
+from .camera.capture_governor import CaptureGovernor
 from .camera.camera_properties import CameraProperties
+from .camera.chessboard_calibration import calibrate_chessboard, find_chessboard_corners
+from .camera.frame import Frame
+from .camera.frame_log import FrameLogReader, FrameLogWriter
+from .camera.mjpeg_decoder import MjpegDecoder, iterate_jpeg_frames
+from .camera.replay_camera import ReplayCamera, ReplayMode
 
 from .networktables_connection.network_tables_connection import NetworkTablesConnection
 
 from .detectors.detector import Detector
 from .detectors.haar_cascade_detector import HaarCascadeDetector
+from .detectors.multi_class_threshold_detector import MultiClassThresholdDetector
 from .detectors.threshold_detector import ThresholdDetector
 
 from .direction_modifiers.direction_modifier import DirectionModifier
@@ -46,16 +55,26 @@ from .target_filters.sorters import *
 from .target_filters.target_filter import target_filter, TARGET_FILTERS
 
 from .thresholds import *
+from .thresholds.adaptive_threshold import AdaptiveThreshold
 from .thresholds.binary_threshold import BinaryThreshold
 from .thresholds.binary_threshold import BinaryThresholdType
 from .thresholds.canny_edge import CannyEdge
 from .thresholds.color.built_in_colors import HSV
 from .thresholds.color.color import Color
 from .thresholds.color.multi_color import MultiColor
+from .thresholds.label_threshold import LabelThreshold
+from .thresholds.lookup_table_threshold import LookupTableThreshold
 
+from .utils.color_space import ColorSpace, ALL_COLOR_SPACES, convert_color_space
 from .utils.constants import *
+from .utils.frame_context import FrameContext
 from .utils.team_number_to_ip import team_number_to_ip
 
 from .visions.ambient_vision import AmbientVision
 from .visions.multi_vision import MultiVision
+from .visions.pipeline_profiler import PipelineProfiler
+from .visions.pipelined_runner import PipelinedRunner
+from .visions.region_tracker import RegionTracker
+from .visions.result_cache import ResultCache, ResultCacheKey
+from .visions.stage_statistics import StageStatistics
 from .visions.vision import Vision
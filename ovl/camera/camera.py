@@ -1,13 +1,30 @@
+import asyncio
+import logging
+import sys
 import time
-from threading import Thread
-from typing import Any, Union
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Union
 
 import cv2
 import numpy as np
 
 from .camera_configuration import CameraConfiguration
+from .camera_health import CameraHealth
+from .capture_governor import CaptureGovernor
+from .capture_statistics import CaptureStatistics
+from .frame import Frame
+from .frame_log import FrameLogWriter
+from .frame_pool import FramePool
+from .frame_ring_buffer import FrameRingBuffer
+from .mjpeg_decoder import MjpegDecoder
+from .profile_switch import ProfileSwitch, image_brightness
+from ..exceptions.exceptions import ImageError
 from ..utils.constants import DEFAULT_IMAGE_HEIGHT, DEFAULT_IMAGE_WIDTH, DEFAULT_CAMERA_SOURCE, \
-    MAX_OPENCV_CAMERA_PROPERTY, MIN_OPENCV_CAMERA_PROPERTY
+    MAX_OPENCV_CAMERA_PROPERTY, MIN_OPENCV_CAMERA_PROPERTY, DEFAULT_FRAME_BUFFER_SIZE, DEFAULT_STALL_TIMEOUT, \
+    DEFAULT_RECONNECT_DELAY, MAX_RECONNECT_DELAY, FAILED_READ_DELAY, BASE_LOGGER, CAMERA_LOGGER, \
+    DEFAULT_PROFILE_SETTLE_FRAMES, DEFAULT_PROFILE_SETTLE_TIMEOUT, DEFAULT_DRIVER_BUFFER_FRAMES
+
+logger = logging.getLogger(f"{BASE_LOGGER}.{CAMERA_LOGGER}")
 
 
 def configure_camera(camera, configuration, delay=0):
@@ -18,11 +35,22 @@ def configure_camera(camera, configuration, delay=0):
 
 
 class Camera:
-    __slots__ = ("stream", "grabbed", "frame", "stopped", "camera_thread", "start_immediately")
+    __slots__ = ("stream", "grabbed", "frames", "stopped", "camera_thread", "start_immediately",
+                 "consumed_sequence_number", "dropped_frames", "repeated_frames", "frame_pool_size", "frame_pool",
+                 "_held_frame", "governor", "captured_frames", "delivered_frames", "skipped_frames",
+                 "recorder", "source", "image_width", "image_height", "configuration", "stall_timeout",
+                 "reconnect_delay", "max_reconnect_delay", "_health", "last_frame_time", "stall_started",
+                 "stall_count", "total_stall_duration", "reconnect_attempts", "_stop_event",
+                 "decoder", "profiles", "active_profile", "applied_properties", "_profile_switch", "_profile_lock",
+                 "profile_switch_latency")
 
     def __init__(self, source: Union[str, int, cv2.VideoCapture] = DEFAULT_CAMERA_SOURCE,
                  image_width: int = DEFAULT_IMAGE_WIDTH, image_height: int = DEFAULT_IMAGE_HEIGHT,
-                 start_immediately=True):
+                 start_immediately=True, buffer_size: int = DEFAULT_FRAME_BUFFER_SIZE, frame_pool_size: int = 0,
+                 governor: CaptureGovernor = None, stall_timeout: float = DEFAULT_STALL_TIMEOUT,
+                 reconnect_delay: float = DEFAULT_RECONNECT_DELAY, max_reconnect_delay: float = MAX_RECONNECT_DELAY,
+                 mjpeg_decode_workers: int = 0, mjpeg_reduction: int = 1,
+                 profiles: Dict[str, CameraConfiguration] = None):
         """
         Camera connects to and opens a connected camera and on constantly reads image from the camera.
         ovl.Camera is more real-time oriented and operates at a faster rate than opencv's VideoCapture, but is not
@@ -33,21 +61,99 @@ class Camera:
         Note: as a result of increasing fps, Camera is not fit for opening video files or any other
         definite frame form of video.
 
+        Every image taken is published as a numbered `Frame` into a small ring buffer,
+        `Camera.get_next_image` waits for an image that was not returned before, which prevents processing
+        the same image twice, `Camera.dropped_frames` counts the frames that were taken but never returned.
+
+        When frame_pool_size is given, images are read into a fixed pool of preallocated buffers instead of
+        allocating a new image for every frame, pooled images are reused once they are released:
+        images returned by `read`, `get_image` and `get_next_image` stay valid until the next call to one of them,
+        frames returned by `get_next_frame` stay valid until they are released.
+
+        .. code-block:: python
+
+            camera = ovl.Camera(0, frame_pool_size=8)
+
+            with camera.get_next_frame() as frame:
+                targets, image = vision.detect(frame.image)
+
+        When no image is taken successfully for stall_timeout seconds the camera is considered stalled
+        (a disconnected usb camera for example), the camera is then released and reopened in the background,
+        waiting exponentially longer between attempts (from reconnect_delay up to max_reconnect_delay),
+        and the last `CameraConfiguration` is applied again once it reopens.
+        `Camera.health` and `Camera.stall_duration` describe the state of the camera meanwhile.
+
+        When mjpeg_decode_workers is given, the camera is asked for MJPEG (compressed) images,
+        which many usb cameras need to reach their full frame rate at high resolutions,
+        the compressed images are decoded by a pool of threads (see `MjpegDecoder`),
+        mjpeg_reduction decodes images at a reduced size (2 - half the width and height) which is much faster.
+
+        Named configuration profiles (for example a dark exposure for retroreflective targets and a bright one
+        for game pieces) can be switched quickly using `Camera.switch_profile`,
+        only the properties that differ from the current ones are set and instead of sleeping a fixed time
+        the camera detects when images reflect the new settings (see `Camera.switch_profile`).
+
         :param source: The source of the camera, can be a number, a device name or any other valid source
         for the cv2.VideoCapture object.
         :param image_width: The width of images to be captured in pixels
         :param image_height: The height of images to be captured in pixels
         :param start_immediately: The Camera has an inner thread that reads images, this determines if
         it should start immediately or be started by `Camera.start` manually.
+        :param buffer_size: the amount of latest frames kept by the camera
+        :param frame_pool_size: the amount of preallocated image buffers, must be larger than buffer_size,
+         0 disables the frame pool and allocates a new image for every frame.
+        :param governor: a `CaptureGovernor` that throttles the capture rate to the rate images are processed,
+         None captures images as fast as the camera allows.
+        :param stall_timeout: the time in seconds without a successful image after which the camera is reopened
+        :param reconnect_delay: the time in seconds to wait before the first attempt to reopen the camera
+        :param max_reconnect_delay: the maximum time in seconds to wait between attempts to reopen the camera
+        :param mjpeg_decode_workers: the amount of threads decoding MJPEG images,
+         0 lets opencv decode the images (the default format of the camera)
+        :param mjpeg_reduction: decode MJPEG images at 1 / mjpeg_reduction of their size, can be 1, 2, 4 or 8
+        :param profiles: named camera configurations that can be switched to using `Camera.switch_profile`
         """
-
-        self.stream = cv2.VideoCapture(source)
-
-        if image_width:
-            self.stream.set(cv2.CAP_PROP_FRAME_WIDTH, image_width)
-        if image_height:
-            self.stream.set(cv2.CAP_PROP_FRAME_HEIGHT, image_height)
-        self.grabbed, self.frame = self.stream.read()
+        if frame_pool_size and frame_pool_size <= buffer_size:
+            raise ValueError(f"The frame pool size ({frame_pool_size}) must be larger than "
+                             f"the buffer size ({buffer_size}), the buffer holds {buffer_size} frames at all times")
+        if frame_pool_size and mjpeg_decode_workers:
+            raise ValueError("A frame pool can not be used with MJPEG decoding, decoded images are always allocated")
+        self.decoder = MjpegDecoder(mjpeg_decode_workers, mjpeg_reduction,
+                                    on_decoded=self._publish) if mjpeg_decode_workers else None
+
+        self.source = source
+        self.image_width = image_width
+        self.image_height = image_height
+        self.configuration = None
+        self.profiles = dict(profiles or {})
+        self.active_profile = None
+        self.applied_properties = {}
+        self._profile_switch = None
+        self._profile_lock = Lock()
+        self.profile_switch_latency = None
+        self.stream = self._open_stream()
+        self.stall_timeout = stall_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._health = CameraHealth.HEALTHY
+        self.last_frame_time = time.perf_counter()
+        self.stall_started = None
+        self.stall_count = 0
+        self.total_stall_duration = 0
+        self.reconnect_attempts = 0
+        self._stop_event = Event()
+        self.frames = FrameRingBuffer(buffer_size)
+        self.consumed_sequence_number = 0
+        self.dropped_frames = 0
+        self.repeated_frames = 0
+        self.captured_frames = 0
+        self.delivered_frames = 0
+        self.skipped_frames = 0
+        self.governor = governor
+        self.recorder = None
+        self.frame_pool_size = frame_pool_size
+        self.frame_pool = None
+        self._held_frame = None
+        self._read_frame()
         self.stopped = False
         self.camera_thread: Union[None, Thread] = None
         self.start_immediately = start_immediately
@@ -77,16 +183,342 @@ class Camera:
         if self.stopped:
             return self
         self.stopped = False
-        self.camera_thread = Thread(target=self._update).start()
+        self.camera_thread = Thread(target=self._update)
+        self.camera_thread.start()
         return self
 
+    def _open_stream(self) -> cv2.VideoCapture:
+        """
+        Opens the camera source and sets the image dimensions
+
+        """
+        stream = cv2.VideoCapture(self.source)
+        if self.decoder is not None:
+            stream.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            stream.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        if self.image_width:
+            stream.set(cv2.CAP_PROP_FRAME_WIDTH, self.image_width)
+        if self.image_height:
+            stream.set(cv2.CAP_PROP_FRAME_HEIGHT, self.image_height)
+        return stream
+
     def _update(self) -> None:
         """
-        Takes a new image while not stopped
+        Takes a new image while not stopped, reopens the camera if it stalls
 
         """
         while not self.stopped:
-            self.grabbed, self.frame = self.stream.read()
+            self._read_frame()
+            if self.grabbed:
+                continue
+            if time.perf_counter() - self.last_frame_time > self.stall_timeout:
+                self._reconnect()
+            else:
+                self._stop_event.wait(FAILED_READ_DELAY)
+
+    def _reconnect(self) -> None:
+        """
+        Releases and reopens the camera until an image is taken successfully or the camera is stopped,
+        waiting exponentially longer between attempts.
+
+        """
+        self.stall_started = self.last_frame_time + self.stall_timeout
+        self.stall_count += 1
+        self._health = CameraHealth.STALLED
+        logger.warning("Camera %s stalled, no image was taken for %.2f seconds, reconnecting",
+                       self.source, time.perf_counter() - self.last_frame_time)
+        delay = self.reconnect_delay
+        while not self.stopped:
+            self._health = CameraHealth.RECONNECTING
+            self.stream.release()
+            if self._stop_event.wait(delay):
+                return
+            self.reconnect_attempts += 1
+            self.stream = self._open_stream()
+            if self.configuration is not None:
+                configure_camera(self.stream, self.configuration)
+            stall_duration = self.stall_duration
+            self._read_frame()
+            if self.grabbed:
+                logger.info("Camera %s reconnected after %.2f seconds", self.source, stall_duration)
+                return
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    @property
+    def health(self) -> CameraHealth:
+        """
+        The state of the camera, see `CameraHealth`,
+        the camera is stalled if no image was taken successfully for longer than `Camera.stall_timeout`
+        """
+        if self._health is CameraHealth.HEALTHY and time.perf_counter() - self.last_frame_time > self.stall_timeout:
+            return CameraHealth.STALLED
+        return self._health
+
+    @property
+    def stall_duration(self) -> float:
+        """
+        The time in seconds since the camera stalled, 0 if it is healthy
+        """
+        if self.stall_started is not None:
+            return time.perf_counter() - self.stall_started
+        if self.health is CameraHealth.STALLED:
+            return time.perf_counter() - self.last_frame_time - self.stall_timeout
+        return 0
+
+    def _read_frame(self) -> None:
+        """
+        Reads a single image from the stream and publishes it,
+        the image is read into a buffer from the frame pool if one is free.
+        When using a governor, images that are not needed are grabbed but not retrieved (decoded).
+        When decoding MJPEG images the compressed image is passed to the decoder,
+        which publishes it (in order) as soon as it finished decoding.
+
+        """
+        self.grabbed = self.stream.grab()
+        if not self.grabbed:
+            return
+        self.captured_frames += 1
+        timestamp = time.perf_counter()
+        if self.governor is not None:
+            if not self.governor.should_retrieve(timestamp):
+                self.skipped_frames += 1
+                self._mark_successful(timestamp)
+                return
+            camera_fps = self.governor.camera_fps_update()
+            if camera_fps is not None:
+                self.stream.set(cv2.CAP_PROP_FPS, camera_fps)
+        if self.decoder is not None:
+            self._retrieve_compressed(timestamp)
+            return
+        buffer = self.frame_pool.acquire_buffer() if self.frame_pool else None
+        if buffer is None:
+            self.grabbed, image = self.stream.retrieve()
+        else:
+            self.grabbed, image = self.stream.retrieve(image=buffer)
+            if image is not buffer:
+                self.frame_pool.return_buffer(buffer)
+                buffer = None
+        if not self.grabbed:
+            return
+        self._mark_successful(timestamp)
+        if self.frame_pool_size and self.frame_pool is None:
+            self.frame_pool = FramePool(self.frame_pool_size, image.shape, image.dtype)
+        self._publish(image, timestamp, pool=None if buffer is None else self.frame_pool)
+
+    def _retrieve_compressed(self, timestamp: float) -> None:
+        """
+        Retrieves a compressed image and passes it to the decoder, the decoder publishes it from the decoding thread
+        as soon as it (and the images grabbed before it) finished decoding
+
+        :param timestamp: the time the image was grabbed
+        """
+        self.grabbed, image = self.stream.retrieve()
+        if not self.grabbed:
+            return
+        self._mark_successful(timestamp)
+        if image.ndim == 3:
+            # the backend does not support turning off conversion, the image is already decoded
+            self._publish(image, timestamp)
+        else:
+            self.decoder.submit(image.reshape(-1), timestamp)
+
+    def _publish(self, image: np.ndarray, timestamp: float, pool: FramePool = None) -> None:
+        """
+        Publishes an image to the frame buffer and records it if recording,
+        the image is tagged with the active configuration profile
+
+        """
+        with self._profile_lock:
+            profile = self.active_profile
+            if self._profile_switch is not None:
+                if self._profile_switch.update(image, timestamp):
+                    self._settle_profile(timestamp)
+                else:
+                    profile = None
+        frame = self.frames.publish(image, timestamp, pool=pool, profile=profile)
+        if self.recorder is not None:
+            self.recorder.append_frame(frame)
+
+    def _mark_successful(self, timestamp: float) -> None:
+        """
+        Marks that an image was taken successfully, ending a stall if there was one
+
+        :param timestamp: the time the image was taken
+        """
+        self.last_frame_time = timestamp
+        if self.stall_started is not None:
+            self.total_stall_duration += timestamp - self.stall_started
+            self.stall_started = None
+        self._health = CameraHealth.HEALTHY
+
+    def _settle_profile(self, timestamp: float) -> None:
+        """
+        Marks that the camera settled on the profile it switched to,
+        frames taken from now on can be returned by `Camera.get_next_frame` again.
+        Must be called by the camera thread while holding the profile lock.
+
+        :param timestamp: the time the first image of the profile was taken
+        """
+        profile_switch, self._profile_switch = self._profile_switch, None
+        self.profile_switch_latency = timestamp - profile_switch.started
+        if profile_switch.timed_out:
+            logger.warning("Camera %s did not settle on profile %s in %.2f seconds", self.source,
+                           profile_switch.profile, profile_switch.settle_timeout)
+        else:
+            logger.debug("Camera %s settled on profile %s after %.3f seconds", self.source,
+                         profile_switch.profile, self.profile_switch_latency)
+        self.frames.minimal_sequence_number = self.frames.sequence_number + 1
+
+    def add_profile(self, name: str, configuration: CameraConfiguration) -> None:
+        """
+        Adds a named configuration profile that can be switched to using `Camera.switch_profile`
+
+        :param name: the name of the profile
+        :param configuration: the `CameraConfiguration` of the profile
+        """
+        self.profiles[name] = configuration
+
+    def switch_profile(self, name: str, settle_frames: int = DEFAULT_PROFILE_SETTLE_FRAMES,
+                       settle_timeout: float = DEFAULT_PROFILE_SETTLE_TIMEOUT) -> Dict[int, Any]:
+        """
+        Switches the camera to a named configuration profile.
+
+        Only the properties whose value differs from the currently applied value are set.
+        Frames taken until the camera settles on the new profile (the images changed from the previous settings
+        and the brightness of settle_frames images in a row is stable, or settle_timeout expired, see `ProfileSwitch`)
+        are tagged with no profile and are never returned by
+        `Camera.get_next_frame` and `Camera.get_next_image`, so the images taken with the previous settings
+        never reach the vision that needs the new settings.
+
+        .. code-block:: python
+
+            camera = ovl.Camera(0, profiles={"targets": dark_configuration, "game_pieces": bright_configuration})
+
+            camera.switch_profile("targets")
+            image = camera.get_next_image()  # waits until the images are dark
+
+        :param name: the name of the profile, added using the profiles parameter or `Camera.add_profile`
+        :param settle_frames: the amount of images in a row with a stable brightness needed to settle
+        :param settle_timeout: the maximum time in seconds to wait for the camera to settle
+        :return: the properties that were set and their new values
+        """
+        if name not in self.profiles:
+            raise ValueError(f"Unknown camera profile {name}, known profiles: {list(self.profiles)}")
+        configuration = self.profiles[name]
+        with self._profile_lock:
+            changed_properties = {camera_property: value
+                                  for camera_property, value in configuration.camera_properties.items()
+                                  if self.applied_properties.get(camera_property) != value}
+            self.active_profile = name
+            self.configuration = configuration
+            for camera_property, value in changed_properties.items():
+                self.set(camera_property, value)
+            if changed_properties:
+                self._profile_switch = ProfileSwitch(name, settle_frames, settle_timeout,
+                                                     previous_brightness=self._latest_brightness(),
+                                                     driver_buffer_frames=self._driver_buffer_frames())
+                self.frames.minimal_sequence_number = sys.maxsize
+            elif self._profile_switch is not None:
+                self._profile_switch.profile = name
+        return changed_properties
+
+    def _latest_brightness(self) -> Union[float, None]:
+        """
+        The brightness of the latest image taken, None if no image was taken yet
+        """
+        frame = self.frames.latest(acquire=True)
+        if frame is None:
+            return None
+        with frame:
+            return image_brightness(frame.image)
+
+    def _driver_buffer_frames(self) -> int:
+        """
+        The amount of images the driver buffers (that were possibly taken before a profile switch)
+        """
+        buffer_size = self.stream.get(cv2.CAP_PROP_BUFFERSIZE) if self.stream is not None else 0
+        return int(buffer_size) if buffer_size and buffer_size > 0 else DEFAULT_DRIVER_BUFFER_FRAMES
+
+    @property
+    def is_settling(self) -> bool:
+        """
+        True while the camera is switching to a new profile and its images do not reflect it yet
+        """
+        return self._profile_switch is not None
+
+    def record(self, recorder: FrameLogWriter) -> FrameLogWriter:
+        """
+        Records every image taken by the camera into a frame log,
+        recording happens in the background and never stalls the camera thread.
+
+        :param recorder: the `FrameLogWriter` to record to
+        :return: the recorder
+        """
+        self.recorder = recorder
+        return recorder
+
+    def stop_recording(self) -> None:
+        """
+        Stops recording images, the frame log should be closed (`FrameLogWriter.close`) by the user.
+        """
+        self.recorder = None
+
+    @property
+    def frame(self) -> Union[np.ndarray, None]:
+        """
+        The latest image taken by the camera, None if no image was taken
+        """
+        frame = self.frames.latest()
+        return None if frame is None else frame.image
+
+    @property
+    def statistics(self) -> CaptureStatistics:
+        """
+        A snapshot of the camera's frame counters (captured, delivered, discarded frames etc.)
+        """
+        return CaptureStatistics(captured_frames=self.captured_frames, delivered_frames=self.delivered_frames,
+                                 skipped_frames=self.skipped_frames, dropped_frames=self.dropped_frames,
+                                 repeated_frames=self.repeated_frames)
+
+    def _request(self) -> None:
+        """
+        Marks that the user asked for an image, used to measure the user's processing rate
+        """
+        if self.governor is not None:
+            self.governor.record_request()
+
+    def _consume(self, frame: Union[Frame, None]) -> Union[Frame, None]:
+        """
+        Marks the given frame as returned to the user and updates the dropped and repeated frame counters
+
+        :param frame: the frame that is returned
+        :return: the frame
+        """
+        if frame is None:
+            return frame
+        if frame.sequence_number == self.consumed_sequence_number:
+            self.repeated_frames += 1
+        elif frame.sequence_number > self.consumed_sequence_number:
+            if self.consumed_sequence_number:
+                self.dropped_frames += frame.sequence_number - self.consumed_sequence_number - 1
+            self.consumed_sequence_number = frame.sequence_number
+            self.delivered_frames += 1
+        if self.governor is not None:
+            self.governor.record_delivery()
+        return frame
+
+    def _hold(self, frame: Union[Frame, None]) -> Union[np.ndarray, None]:
+        """
+        Keeps a reference to an acquired frame that was returned to the user as an image,
+        the previously held frame is released.
+
+        :param frame: an acquired frame
+        :return: the image of the frame
+        """
+        previous_frame, self._held_frame = self._held_frame, frame
+        if previous_frame is not None:
+            previous_frame.release()
+        return None if frame is None else frame.image
 
     def read(self) -> [bool, np.ndarray]:
         """
@@ -98,15 +530,108 @@ class Camera:
         :return: if the image was taken successfully, the image
         :rtype: bool, `numpy.array`
         """
-        return self.grabbed, self.frame
+        self._request()
+        frame = self._consume(self.frames.latest(acquire=True))
+        return self.grabbed, self._hold(frame)
 
     def get_image(self) -> np.ndarray:
         """
         Returns the current image
 
+        Note: the same image can be returned multiple times if no new image was taken since the last call,
+        use `Camera.get_next_image` to wait for a new image.
+
+        :return: numpy array of the image
+        """
+        self._request()
+        return self._hold(self._consume(self.frames.latest(acquire=True)))
+
+    def get_next_frame(self, timeout: Union[float, None] = None) -> Frame:
+        """
+        Waits for a frame that is newer than the last frame returned by the camera and returns it.
+
+        If multiple frames were taken since the last returned frame only the latest is returned,
+        the skipped frames are counted in `Camera.dropped_frames`
+
+        The returned frame is acquired, when using a frame pool it must be released
+        (`Frame.release`, `Camera.release_frame` or using the frame as a context manager)
+        so its buffer can be reused.
+
+        :param timeout: the maximum time to wait for a new frame in seconds, None to wait until a frame is taken
+        :return: the new frame, containing the image its sequence number and capture timestamp
+        :raises: ImageError if no new frame was taken before the timeout expired or the camera was stopped
+        """
+        self._request()
+        frame = self.frames.wait_for_frame(self.consumed_sequence_number, timeout, acquire=True)
+        if frame is None:
+            if self.health is not CameraHealth.HEALTHY:
+                raise ImageError(f"No new image was taken by the camera, the camera is {self.health.value} "
+                                 f"for {self.stall_duration:.2f} seconds")
+            raise ImageError("No new image was taken by the camera (has it been stopped or disconnected?)")
+        return self._consume(frame)
+
+    def get_next_image(self, timeout: Union[float, None] = None) -> np.ndarray:
+        """
+        Waits for an image that is newer than the last image returned by the camera and returns it.
+
+        See `Camera.get_next_frame` for more information
+
+        :param timeout: the maximum time to wait for a new image in seconds, None to wait until an image is taken
         :return: numpy array of the image
+        :raises: ImageError if no new image was taken before the timeout expired or the camera was stopped
+        """
+        return self._hold(self.get_next_frame(timeout))
+
+    async def get_next_frame_async(self, timeout: Union[float, None] = None) -> Frame:
         """
-        return self.frame
+        Waits for a frame that is newer than the last frame returned by the camera and returns it,
+        without blocking the running event loop, the loop is woken by the camera thread as soon as
+        a new frame is taken.
+
+        See `Camera.get_next_frame` for more information
+
+        :param timeout: the maximum time to wait for a new frame in seconds, None to wait until a frame is taken
+        :return: the new frame, containing the image its sequence number and capture timestamp
+        :raises: ImageError if no new frame was taken before the timeout expired or the camera was stopped
+        """
+        self._request()
+        try:
+            frame = await asyncio.wait_for(
+                self.frames.wait_for_frame_async(self.consumed_sequence_number, acquire=True), timeout)
+        except asyncio.TimeoutError:
+            frame = None
+        if frame is None:
+            if self.health is not CameraHealth.HEALTHY:
+                raise ImageError(f"No new image was taken by the camera, the camera is {self.health.value} "
+                                 f"for {self.stall_duration:.2f} seconds")
+            raise ImageError("No new image was taken by the camera (has it been stopped or disconnected?)")
+        return self._consume(frame)
+
+    async def get_next_image_async(self, timeout: Union[float, None] = None) -> np.ndarray:
+        """
+        Waits for an image that is newer than the last image returned by the camera and returns it,
+        without blocking the running event loop.
+
+        .. code-block:: python
+
+            async def main():
+                camera = ovl.Camera(0)
+                while True:
+                    image = await camera.get_next_image_async()
+                    ...
+
+        See `Camera.get_next_frame_async` for more information
+        """
+        return self._hold(await self.get_next_frame_async(timeout))
+
+    @staticmethod
+    def release_frame(frame: Frame) -> None:
+        """
+        Releases a frame returned by `Camera.get_next_frame`, allowing its buffer to be reused.
+
+        :param frame: the frame to release
+        """
+        frame.release()
 
     def stop(self) -> None:
         """
@@ -114,6 +639,8 @@ class Camera:
 
         """
         self.stopped = True
+        self._stop_event.set()
+        self.frames.close()
 
     def release(self) -> None:
         """
@@ -122,6 +649,11 @@ class Camera:
         :return: None
         """
         self.stop()
+        self._hold(None)
+        if self.camera_thread is not None:
+            self.camera_thread.join(self.stall_timeout)
+        if self.decoder is not None:
+            self.decoder.close()
         self.stream.release()
 
     def set(self, property_id: int, value: Union[float, bool, str, Any]) -> None:
@@ -143,6 +675,7 @@ class Camera:
         :param value: the value to be set, a number
         :return: None
         """
+        self.applied_properties[property_id] = value
         self.stream.set(property_id, value)
 
     def get(self, property_id) -> Any:
@@ -164,9 +697,12 @@ class Camera:
     def is_opened(self) -> bool:
         """
         Returns true_shape if the camera is opened, false otherwise
+        A camera that is reconnecting is considered open.
 
         :return: if the camera is open
         """
+        if self._health is not CameraHealth.HEALTHY and not self.stopped:
+            return True
         return self.stream.isOpened()
 
     def isOpened(self) -> bool:
@@ -176,7 +712,7 @@ class Camera:
 
         :return: if the camera is open
         """
-        return self.stream.isOpened()
+        return self.is_opened()
 
     def get_backend_name(self) -> str:
         """
@@ -203,4 +739,7 @@ class Camera:
         :param delay:  some properties can have a time configuration_delay in order to take effect,
          a configuration_delay in seconds can be added to wait after each configuration.
         """
+        self.configuration = configuration
+        self.active_profile = None
+        self.applied_properties.update(configuration.camera_properties)
         configure_camera(self.stream, configuration=configuration, delay=delay)
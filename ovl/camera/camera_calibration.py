@@ -1,9 +1,80 @@
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
 import cv2
+import numpy as np
+
+UNDISTORTION_MAP_TYPE = cv2.CV_16SC2
+MAX_CACHED_UNDISTORTION_MAPS = 8
+_undistortion_maps_cache: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def build_undistortion_maps(camera_matrix: np.ndarray, distortion_coefficients: np.ndarray,
+                            new_camera_matrix: Union[np.ndarray, None],
+                            image_dimensions: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the maps used to undistort images of the given dimensions using `cv2.remap`,
+    the maps are in the fixed point form (CV_16SC2) which is the fastest to remap with.
+
+    :param camera_matrix: the camera matrix that was calculated from the camera calibration
+    :param distortion_coefficients: the distortion coefficients that were calculated from the camera calibration
+    :param new_camera_matrix: the camera matrix of the undistorted image, None to use camera_matrix
+    :param image_dimensions: the (width, height) of the images
+    :return: the 2 undistortion maps
+    """
+    new_camera_matrix = camera_matrix if new_camera_matrix is None else new_camera_matrix
+    return cv2.initUndistortRectifyMap(camera_matrix, distortion_coefficients, None, new_camera_matrix,
+                                       tuple(image_dimensions), UNDISTORTION_MAP_TYPE)
+
+
+def cached_undistortion_maps(camera_matrix: np.ndarray, distortion_coefficients: np.ndarray,
+                             new_camera_matrix: Union[np.ndarray, None],
+                             image_dimensions: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the undistortion maps for the given calibration and image dimensions,
+    the maps are built once and reused for every later call with the same arguments.
+
+    See `build_undistortion_maps` for more information
+    """
+    key = (np.asarray(camera_matrix).tobytes(), np.asarray(distortion_coefficients).tobytes(),
+           None if new_camera_matrix is None else np.asarray(new_camera_matrix).tobytes(), tuple(image_dimensions))
+    maps = _undistortion_maps_cache.get(key)
+    if maps is None:
+        if len(_undistortion_maps_cache) >= MAX_CACHED_UNDISTORTION_MAPS:
+            _undistortion_maps_cache.pop(next(iter(_undistortion_maps_cache)))
+        maps = build_undistortion_maps(camera_matrix, distortion_coefficients, new_camera_matrix, image_dimensions)
+        _undistortion_maps_cache[key] = maps
+    return maps
 
 
 class CameraCalibration:
+    """
+    The result of calibrating a camera (usually using images of a chessboard),
+    used to remove the distortion caused by the camera's lens and manufacturing flaws.
+
+    Undistortion maps are built once (on the first undistorted image) and every image is undistorted
+    using `cv2.remap`, which is several times faster than `cv2.undistort`.
+
+    Calibrating takes a while, a calibration can be saved once and loaded on startup instead:
+
+    .. code-block:: python
+
+        calibration = ovl.CameraCalibration(object_points, image_points, image_dimensions=(640, 480))
+        calibration.save("camera_calibration.npz")
+
+        calibration = ovl.CameraCalibration.load("camera_calibration.npz")
+        undistorted_image = calibration.undistort_image(image)
+
+    """
+
     def __init__(self, object_points, image_points, image_dimensions, alpha=0, save_raw=False):
-        self.image_dimensions = image_dimensions
+        """
+        :param object_points: the 3d points of the calibration pattern, for every calibration image
+        :param image_points: the 2d points of the calibration pattern in every calibration image
+        :param image_dimensions: the (width, height) of the calibration images
+        :param alpha: the scaling of the undistorted image, 0 keeps only valid pixels and 1 keeps all pixels
+        :param save_raw: if the object points and image points should be kept
+        """
         if save_raw:
             self.image_points = image_points
             self.object_points = object_points
@@ -13,21 +84,89 @@ class CameraCalibration:
         calibration = cv2.calibrateCamera(object_points, image_points, image_dimensions, None, None)
         (_, camera_matrix, distortion_coefficients,
          rotation_vectors, translation_vectors) = calibration
-        optimal_matrix, region_of_image = cv2.getOptimalNewCameraMatrix(camera_matrix,
-                                                                        distortion_coefficients,
-                                                                        image_dimensions,
-                                                                        alpha)
+        self._set_calibration(image_dimensions, alpha, camera_matrix, distortion_coefficients,
+                              rotation_vectors, translation_vectors)
+
+    def _set_calibration(self, image_dimensions, alpha, camera_matrix, distortion_coefficients,
+                         rotation_vectors, translation_vectors, optimal_matrix=None, region_of_image=None,
+                         undistortion_maps=None):
+        self.image_dimensions = tuple(int(dimension) for dimension in image_dimensions)
+        self.alpha = alpha
+        if optimal_matrix is None:
+            optimal_matrix, region_of_image = cv2.getOptimalNewCameraMatrix(camera_matrix,
+                                                                            distortion_coefficients,
+                                                                            self.image_dimensions,
+                                                                            alpha)
         self.optimal_matrix = optimal_matrix
-        self.region_of_image = region_of_image
+        self.region_of_image = tuple(int(value) for value in region_of_image)
         self.camera_matrix = camera_matrix
         self.rotation_vectors = rotation_vectors
         self.translation_vectors = translation_vectors
         self.distortion_coefficients = distortion_coefficients
+        self._undistortion_maps = undistortion_maps
+
+    @property
+    def undistortion_maps(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The maps used to undistort images of the calibration's dimensions (see `build_undistortion_maps`),
+        built on first use
+        """
+        if self._undistortion_maps is None:
+            self._undistortion_maps = build_undistortion_maps(self.camera_matrix, self.distortion_coefficients,
+                                                              self.optimal_matrix, self.image_dimensions)
+        return self._undistortion_maps
 
-    def undistort_image(self, image):
+    def undistort_image(self, image, destination=None, interpolation=cv2.INTER_LINEAR):
         """
          Removes distortion created by imperfections in the camera.
+         Images of the calibration's dimensions are undistorted using the precomputed undistortion maps.
+
         :param image: The image (numpy array) that should be undistorted
+        :param destination: the image the result should be saved in, None to allocate a new image
+        :param interpolation: the interpolation used when remapping the image
         :return: an undistorted copy of the image
         """
-        return cv2.undistort(image, self.camera_matrix, self.distortion_coefficients, None, self.optimal_matrix)
+        height, width = image.shape[:2]
+        if (width, height) != self.image_dimensions:
+            return cv2.undistort(image, self.camera_matrix, self.distortion_coefficients, destination,
+                                 self.optimal_matrix)
+        map1, map2 = self.undistortion_maps
+        return cv2.remap(image, map1, map2, interpolation, dst=destination)
+
+    def save(self, path: Union[str, Path], save_maps: bool = True) -> None:
+        """
+        Saves the calibration to a compressed numpy archive (.npz) that can be loaded using `CameraCalibration.load`
+
+        Note: the raw object points and image points are not saved.
+
+        :param path: the path of the file
+        :param save_maps: if the undistortion maps should be saved as well,
+         this makes the file larger but saves building the maps on startup
+        """
+        arrays = dict(image_dimensions=np.array(self.image_dimensions), alpha=np.array(self.alpha),
+                      camera_matrix=self.camera_matrix, distortion_coefficients=self.distortion_coefficients,
+                      optimal_matrix=self.optimal_matrix, region_of_image=np.array(self.region_of_image),
+                      rotation_vectors=np.array(self.rotation_vectors),
+                      translation_vectors=np.array(self.translation_vectors))
+        if save_maps:
+            arrays["map1"], arrays["map2"] = self.undistortion_maps
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CameraCalibration":
+        """
+        Loads a calibration saved using `CameraCalibration.save`, without calibrating the camera again
+
+        :param path: the path of the file
+        :return: the loaded calibration
+        """
+        with np.load(path) as arrays:
+            undistortion_maps = (arrays["map1"], arrays["map2"]) if "map1" in arrays else None
+            calibration = cls.__new__(cls)
+            calibration.image_points = None
+            calibration.object_points = None
+            calibration._set_calibration(arrays["image_dimensions"], float(arrays["alpha"]), arrays["camera_matrix"],
+                                         arrays["distortion_coefficients"], tuple(arrays["rotation_vectors"]),
+                                         tuple(arrays["translation_vectors"]), arrays["optimal_matrix"],
+                                         arrays["region_of_image"], undistortion_maps)
+        return calibration
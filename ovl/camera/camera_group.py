@@ -0,0 +1,341 @@
+import asyncio
+import time
+from threading import Event, Thread
+from typing import List, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .camera import configure_camera
+from .camera_configuration import CameraConfiguration
+from .frame import Frame
+from .frame_ring_buffer import FrameRingBuffer
+from ..exceptions.exceptions import ImageError
+from ..utils.constants import DEFAULT_IMAGE_HEIGHT, DEFAULT_IMAGE_WIDTH, DEFAULT_FRAME_BUFFER_SIZE, \
+    DEFAULT_STALL_TIMEOUT, FAILED_READ_DELAY
+
+
+class CameraGroup:
+    """
+    CameraGroup takes synchronized images from multiple cameras using a single thread.
+
+    Instead of reading every camera in its own thread, the group grabs an image from all cameras back-to-back
+    (`cv2.VideoCapture.grab`) and only then decodes them (`cv2.VideoCapture.retrieve`),
+    this keeps the images of every set as close in time as possible.
+    Every set of images shares a sequence number and each image keeps its own capture timestamp.
+
+    .. code-block:: python
+
+        cameras = ovl.CameraGroup([0, 1])
+
+        left_frame, right_frame = cameras.get_next_frames()
+        print(right_frame.timestamp - left_frame.timestamp)
+
+    Each camera of the group can be passed to a `Vision` (and so to a `MultiVision`) as its camera:
+
+    .. code-block:: python
+
+        cameras = ovl.CameraGroup([0, 1])
+
+        front_vision = ovl.Vision(threshold=ovl.HSV.yellow, camera=cameras.camera(0))
+        back_vision = ovl.Vision(threshold=ovl.HSV.yellow, camera=cameras.camera(1))
+
+    """
+
+    def __init__(self, sources: List[Union[str, int, cv2.VideoCapture]],
+                 image_width: int = DEFAULT_IMAGE_WIDTH, image_height: int = DEFAULT_IMAGE_HEIGHT,
+                 start_immediately=True, buffer_size: int = DEFAULT_FRAME_BUFFER_SIZE):
+        """
+        :param sources: the sources of the cameras, each can be a number, a device name, any other valid source
+         for the cv2.VideoCapture object or an opened cv2.VideoCapture
+        :param image_width: The width of images to be captured in pixels
+        :param image_height: The height of images to be captured in pixels
+        :param start_immediately: if the inner thread that reads images should start immediately
+         or be started by `CameraGroup.start` manually.
+        :param buffer_size: the amount of latest image sets kept by the group, must be at least 2
+        """
+        if len(sources) == 0:
+            raise ValueError("No camera sources were given to the CameraGroup")
+        if buffer_size < 2:
+            raise ValueError(f"CameraGroup buffer size must be at least 2, got {buffer_size}")
+        self.streams = [source if isinstance(source, cv2.VideoCapture) else cv2.VideoCapture(source)
+                        for source in sources]
+        for stream in self.streams:
+            if image_width:
+                stream.set(cv2.CAP_PROP_FRAME_WIDTH, image_width)
+            if image_height:
+                stream.set(cv2.CAP_PROP_FRAME_HEIGHT, image_height)
+        self.frames = [FrameRingBuffer(buffer_size) for _ in self.streams]
+        self.consumed_sequence_number = 0
+        self.dropped_frames = 0
+        self.grabbed = False
+        self.stopped = False
+        self.camera_thread: Union[None, Thread] = None
+        self._stop_event = Event()
+        self._read_frames()
+        if start_immediately:
+            self.start()
+
+    def __len__(self):
+        return len(self.streams)
+
+    def start(self) -> "CameraGroup":
+        """
+        Starts the image taking thread
+
+        :return: self
+        """
+        if self.stopped:
+            return self
+        self.camera_thread = Thread(target=self._update)
+        self.camera_thread.start()
+        return self
+
+    def _update(self) -> None:
+        """
+        Takes a new set of images while not stopped, waits a little after a camera fails to take an image
+
+        """
+        while not self.stopped:
+            self._read_frames()
+            if not self.grabbed:
+                self._stop_event.wait(FAILED_READ_DELAY)
+
+    def _read_frames(self) -> None:
+        """
+        Grabs an image from every camera and then retrieves them,
+        the set is published only if all cameras were successful.
+
+        """
+        timestamps = []
+        for stream in self.streams:
+            if not stream.grab():
+                self.grabbed = False
+                return
+            timestamps.append(time.perf_counter())
+        images = []
+        for stream in self.streams:
+            retrieved, image = stream.retrieve()
+            if not retrieved:
+                self.grabbed = False
+                return
+            images.append(image)
+        self.grabbed = True
+        for frames, image, timestamp in zip(self.frames, images, timestamps):
+            frames.publish(image, timestamp)
+
+    @property
+    def sequence_number(self) -> int:
+        """
+        The sequence number of the latest set of images, every camera in the group shares it
+        """
+        return self.frames[-1].sequence_number
+
+    def _frames_at(self, sequence_number: int) -> Union[Tuple[Frame, ...], None]:
+        """
+        Returns the frames of all cameras with the given sequence number, None if they were overwritten
+
+        :param sequence_number: the sequence number of the wanted set
+        """
+        frames = tuple(camera_frames.get(sequence_number) for camera_frames in self.frames)
+        if any(frame is None for frame in frames):
+            return None
+        return frames
+
+    def latest_frames(self) -> Union[Tuple[Frame, ...], None]:
+        """
+        Returns the latest set of frames (one frame for each camera), None if no set was taken yet
+        """
+        return self._frames_at(self.sequence_number)
+
+    def get_next_frames(self, timeout: Union[float, None] = None) -> Tuple[Frame, ...]:
+        """
+        Waits for a set of frames that is newer than the last set returned and returns it.
+
+        :param timeout: the maximum time to wait for new frames in seconds, None to wait until a set is taken
+        :return: a tuple of frames, one for each camera, in the order of the sources
+        :raises: ImageError if no new set was taken before the timeout expired or the group was stopped
+        """
+        frames = None
+        while frames is None:
+            last_frame = self.frames[-1].wait_for_frame(self.consumed_sequence_number, timeout)
+            if last_frame is None:
+                raise ImageError("No new images were taken by the camera group "
+                                 "(has it been stopped or a camera disconnected?)")
+            frames = self._frames_at(last_frame.sequence_number)
+        if self.consumed_sequence_number:
+            self.dropped_frames += frames[0].sequence_number - self.consumed_sequence_number - 1
+        self.consumed_sequence_number = frames[0].sequence_number
+        return frames
+
+    def get_next_images(self, timeout: Union[float, None] = None) -> Tuple[np.ndarray, ...]:
+        """
+        Waits for a set of images that is newer than the last set returned and returns it.
+
+        See `CameraGroup.get_next_frames` for more information
+        """
+        return tuple(frame.image for frame in self.get_next_frames(timeout))
+
+    def read(self) -> Tuple[bool, Union[Tuple[np.ndarray, ...], None]]:
+        """
+        Returns if the last set of images was taken successfully and the latest set of images
+
+        :return: if the images were taken successfully, a tuple of the images (one for each camera)
+        """
+        frames = self.latest_frames()
+        return self.grabbed, None if frames is None else tuple(frame.image for frame in frames)
+
+    def camera(self, index: int) -> "GroupCamera":
+        """
+        Returns a camera like object for a single camera in the group,
+        it can be passed to a `Vision` like an `ovl.Camera`
+
+        :param index: the index of the camera in the sources list
+        """
+        if not 0 <= index < len(self.streams):
+            raise IndexError(f"Invalid camera index {index}, the group has {len(self.streams)} cameras")
+        return GroupCamera(self, index)
+
+    def is_opened(self) -> bool:
+        """
+        Returns true if all the cameras are opened, false otherwise
+        """
+        return all(stream.isOpened() for stream in self.streams)
+
+    def isOpened(self) -> bool:
+        """
+        Returns true if all the cameras are opened, false otherwise
+        This function is left to allow it to be used wherever cv2.VideoCapture can be used
+        """
+        return self.is_opened()
+
+    def configure_camera(self, index: int, configuration: CameraConfiguration, delay=0):
+        """
+        Uses a camera configuration object to configure one of the cameras in the group
+
+        :param index: the index of the camera in the sources list
+        :param configuration: a `CameraConfiguration` allows to configure a camera
+        :param delay: a delay in seconds to wait after each configuration.
+        """
+        configure_camera(self.streams[index], configuration=configuration, delay=delay)
+
+    def stop(self) -> None:
+        """
+        Stops the camera thread.
+
+        """
+        self.stopped = True
+        self._stop_event.set()
+        for frames in self.frames:
+            frames.close()
+
+    def release(self) -> None:
+        """
+        Stops the camera thread and releases all the cameras
+
+        """
+        self.stop()
+        if self.camera_thread is not None:
+            self.camera_thread.join(DEFAULT_STALL_TIMEOUT)
+        for stream in self.streams:
+            stream.release()
+
+
+class GroupCamera:
+    """
+    A single camera in a `CameraGroup`, implements the reading interface of `ovl.Camera`
+    so it can be used as the camera of a `Vision`.
+
+    Each GroupCamera keeps track of the frames it returned, so visions using different cameras of the same group
+    do not affect each other.
+    """
+
+    def __init__(self, group: CameraGroup, index: int):
+        self.group = group
+        self.index = index
+        self.consumed_sequence_number = 0
+        self.dropped_frames = 0
+
+    @property
+    def stream(self) -> cv2.VideoCapture:
+        return self.group.streams[self.index]
+
+    def _consume(self, frame: Union[Frame, None]) -> Union[Frame, None]:
+        if frame is not None and frame.sequence_number > self.consumed_sequence_number:
+            if self.consumed_sequence_number:
+                self.dropped_frames += frame.sequence_number - self.consumed_sequence_number - 1
+            self.consumed_sequence_number = frame.sequence_number
+        return frame
+
+    def read(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        """
+        Returns if the last set was taken successfully and the latest image of this camera
+
+        :return: if the image was taken successfully, the image
+        """
+        frame = self._consume(self.group.frames[self.index].latest())
+        return self.group.grabbed, None if frame is None else frame.image
+
+    def get_image(self) -> np.ndarray:
+        """
+        Returns the latest image of this camera
+        """
+        return self.read()[1]
+
+    def get_next_frame(self, timeout: Union[float, None] = None) -> Frame:
+        """
+        Waits for a frame of this camera that is newer than the last frame it returned
+
+        :param timeout: the maximum time to wait for a new frame in seconds, None to wait until a frame is taken
+        :return: the new frame
+        :raises: ImageError if no new frame was taken before the timeout expired or the group was stopped
+        """
+        frame = self.group.frames[self.index].wait_for_frame(self.consumed_sequence_number, timeout)
+        if frame is None:
+            raise ImageError(f"No new image was taken by camera {self.index} of the camera group "
+                             f"(has it been stopped or disconnected?)")
+        return self._consume(frame)
+
+    def get_next_image(self, timeout: Union[float, None] = None) -> np.ndarray:
+        """
+        Waits for an image of this camera that is newer than the last image it returned
+
+        See `GroupCamera.get_next_frame` for more information
+        """
+        return self.get_next_frame(timeout).image
+
+    async def get_next_frame_async(self, timeout: Union[float, None] = None) -> Frame:
+        """
+        Waits for a frame of this camera that is newer than the last frame it returned,
+        without blocking the running event loop.
+
+        See `GroupCamera.get_next_frame` for more information
+        """
+        try:
+            frame = await asyncio.wait_for(
+                self.group.frames[self.index].wait_for_frame_async(self.consumed_sequence_number), timeout)
+        except asyncio.TimeoutError:
+            frame = None
+        if frame is None:
+            raise ImageError(f"No new image was taken by camera {self.index} of the camera group "
+                             f"(has it been stopped or disconnected?)")
+        return self._consume(frame)
+
+    async def get_next_image_async(self, timeout: Union[float, None] = None) -> np.ndarray:
+        """
+        Waits for an image of this camera that is newer than the last image it returned,
+        without blocking the running event loop.
+        """
+        return (await self.get_next_frame_async(timeout)).image
+
+    def is_opened(self) -> bool:
+        return self.stream.isOpened()
+
+    def isOpened(self) -> bool:
+        return self.stream.isOpened()
+
+    def set(self, property_id: int, value) -> None:
+        self.stream.set(property_id, value)
+
+    def get(self, property_id: int):
+        return self.stream.get(property_id)
@@ -0,0 +1,14 @@
+import enum
+
+
+class CameraHealth(enum.Enum):
+    """
+    The state of an `ovl.Camera`'s image capturing:
+
+    HEALTHY - images are taken successfully
+    STALLED - no image was taken successfully for longer than the camera's stall timeout
+    RECONNECTING - the camera is being reopened after a stall
+    """
+    HEALTHY = "healthy"
+    STALLED = "stalled"
+    RECONNECTING = "reconnecting"
@@ -0,0 +1,124 @@
+import time
+from typing import Union
+
+from ..utils.constants import DEFAULT_GOVERNOR_HEADROOM, DEFAULT_GOVERNOR_SMOOTHING, DEFAULT_GOVERNOR_MINIMAL_FPS
+
+
+class CaptureGovernor:
+    """
+    CaptureGovernor throttles a camera's capture rate to just above the rate in which its images are processed.
+
+    The governor measures how long the consumer spends between receiving an image and asking for the next one
+    (the processing time, not including the time spent waiting for an image),
+    and allows the camera to decode (retrieve) images only at headroom times the consumer's processing rate.
+
+    The camera keeps grabbing images so the driver's queue is drained and the image decoded is always
+    the latest one taken ("latest frame wins"), images that are grabbed but not needed are never decoded,
+    which is where most of the cpu time of taking an image is spent.
+    The camera's fps property (`cv2.CAP_PROP_FPS`) can also be lowered to the target fps, when the camera supports it.
+
+    .. code-block:: python
+
+        camera = ovl.Camera(0, governor=ovl.CaptureGovernor(headroom=1.25))
+
+        while True:
+            image = camera.get_next_image()
+            ...
+
+        print(camera.statistics)
+
+    """
+
+    def __init__(self, headroom: float = DEFAULT_GOVERNOR_HEADROOM, smoothing: float = DEFAULT_GOVERNOR_SMOOTHING,
+                 minimal_fps: float = DEFAULT_GOVERNOR_MINIMAL_FPS, set_camera_fps: bool = False,
+                 fps_update_ratio: float = 0.2):
+        """
+        :param headroom: how much faster than the consumer images are captured, 1.2 is 20% faster
+        :param smoothing: the weight of the newest measurement in the processing time moving average (0 to 1)
+        :param minimal_fps: the capture rate will never be throttled below this rate
+        :param set_camera_fps: if the camera fps property (cv2.CAP_PROP_FPS) should be set to the target fps
+        :param fps_update_ratio: the minimal relative change in target fps before the camera fps is set again
+        """
+        if headroom < 1:
+            raise ValueError(f"Governor headroom must be at least 1, got {headroom}")
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Governor smoothing must be between 0 and 1, got {smoothing}")
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.minimal_fps = minimal_fps
+        self.set_camera_fps = set_camera_fps
+        self.fps_update_ratio = fps_update_ratio
+        self.processing_time: Union[float, None] = None
+        self.camera_fps: Union[float, None] = None
+        self._last_delivery: Union[float, None] = None
+        self._last_retrieve = 0
+
+    @property
+    def consumer_fps(self) -> Union[float, None]:
+        """
+        The measured processing rate of the consumer, None if it was not measured yet
+        """
+        if not self.processing_time:
+            return None
+        return 1 / self.processing_time
+
+    @property
+    def target_fps(self) -> Union[float, None]:
+        """
+        The rate images should be captured in, None if the consumer was not measured yet (no throttling)
+        """
+        consumer_fps = self.consumer_fps
+        if consumer_fps is None:
+            return None
+        return max(consumer_fps * self.headroom, self.minimal_fps)
+
+    def record_request(self, timestamp: float = None) -> None:
+        """
+        Records that the consumer asked for an image, the time since the last delivered image is
+        the time the consumer spent processing it.
+
+        :param timestamp: the time of the request (time.perf_counter)
+        """
+        if self._last_delivery is None:
+            return
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        processing_time = timestamp - self._last_delivery
+        if self.processing_time is None:
+            self.processing_time = processing_time
+        else:
+            self.processing_time += self.smoothing * (processing_time - self.processing_time)
+
+    def record_delivery(self, timestamp: float = None) -> None:
+        """
+        Records that an image was given to the consumer
+
+        :param timestamp: the time of the delivery (time.perf_counter)
+        """
+        self._last_delivery = time.perf_counter() if timestamp is None else timestamp
+
+    def should_retrieve(self, timestamp: float = None) -> bool:
+        """
+        Decides if the image that was just grabbed should be retrieved (decoded) or discarded.
+
+        :param timestamp: the time the image was grabbed (time.perf_counter)
+        :return: True if the image should be retrieved
+        """
+        target_fps = self.target_fps
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        if target_fps is not None and timestamp - self._last_retrieve < 1 / target_fps:
+            return False
+        self._last_retrieve = timestamp
+        return True
+
+    def camera_fps_update(self) -> Union[float, None]:
+        """
+        Returns a new fps that should be set on the camera, None if the camera fps should not change.
+        Always None if set_camera_fps is False.
+        """
+        target_fps = self.target_fps
+        if not self.set_camera_fps or target_fps is None:
+            return None
+        if self.camera_fps is not None and abs(target_fps - self.camera_fps) < self.camera_fps * self.fps_update_ratio:
+            return None
+        self.camera_fps = target_fps
+        return target_fps
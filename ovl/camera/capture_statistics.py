@@ -0,0 +1,24 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class CaptureStatistics:
+    """
+    A snapshot of a camera's frame counters
+
+    captured_frames - images grabbed from the camera
+    delivered_frames - different images returned to the consumer
+    skipped_frames - images grabbed but never decoded (skipped by the `CaptureGovernor`)
+    dropped_frames - images decoded but overwritten by newer images before they were returned
+    repeated_frames - times an image that was already returned was returned again
+    discarded_frames - images that were captured but never returned (skipped_frames + dropped_frames)
+    """
+    captured_frames: int
+    delivered_frames: int
+    skipped_frames: int
+    dropped_frames: int
+    repeated_frames: int
+
+    @property
+    def discarded_frames(self) -> int:
+        return self.skipped_frames + self.dropped_frames
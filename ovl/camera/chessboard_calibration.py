@@ -0,0 +1,110 @@
+import functools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .camera_calibration import CameraCalibration
+from ..utils.constants import DEFAULT_CHESSBOARD_DETECTION_SIZE, CHESSBOARD_REFINEMENT_WINDOW, \
+    MINIMAL_CALIBRATION_IMAGES, IMAGE_FILE_EXTENSIONS, BASE_LOGGER, CAMERA_LOGGER
+
+logger = logging.getLogger(f"{BASE_LOGGER}.{CAMERA_LOGGER}")
+
+DETECTION_FLAGS = cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_FAST_CHECK
+REFINEMENT_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+
+CalibrationImage = Union[str, Path, np.ndarray]
+
+
+def find_chessboard_corners(image: CalibrationImage, pattern_size: Tuple[int, int],
+                            detection_size: int = DEFAULT_CHESSBOARD_DETECTION_SIZE
+                            ) -> Union[Tuple[np.ndarray, Tuple[int, int]], None]:
+    """
+    Finds the inner corners of a chessboard in an image.
+
+    The chessboard is first found in a downscaled copy of the image (which is much faster for large images)
+    and the corners are then refined to sub-pixel accuracy in the full resolution image.
+
+    :param image: the image or the path of the image
+    :param pattern_size: the amount of inner corners of the chessboard (columns, rows)
+    :param detection_size: the maximum width or height of the downscaled image the chessboard is found in
+    :return: the corners and the (width, height) of the image, None if the chessboard was not found
+    """
+    if isinstance(image, (str, Path)):
+        image = cv2.imread(str(image), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return None
+    elif image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = image.shape[:2]
+    scale = min(detection_size / max(width, height), 1)
+    if scale < 1:
+        detection_image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    else:
+        detection_image = image
+    found, corners = cv2.findChessboardCorners(detection_image, pattern_size, flags=DETECTION_FLAGS)
+    if not found:
+        return None
+    if scale < 1:
+        corners = (corners + 0.5) / scale - 0.5
+    window = tuple(max(int(size / scale) // 2, 1) for size in CHESSBOARD_REFINEMENT_WINDOW)
+    corners = cv2.cornerSubPix(image, corners.astype(np.float32), window, (-1, -1), REFINEMENT_CRITERIA)
+    return corners, (width, height)
+
+
+def _calibration_images(images: Union[str, Path, Iterable[CalibrationImage]]) -> List[CalibrationImage]:
+    if isinstance(images, (str, Path)):
+        return sorted(path for path in Path(images).iterdir() if path.suffix.lower() in IMAGE_FILE_EXTENSIONS)
+    return list(images)
+
+
+def calibrate_chessboard(images: Union[str, Path, Iterable[CalibrationImage]], pattern_size: Tuple[int, int],
+                         square_size: float = 1, workers: int = None,
+                         detection_size: int = DEFAULT_CHESSBOARD_DETECTION_SIZE,
+                         alpha=0, save_raw=False) -> CameraCalibration:
+    """
+    Calibrates a camera using images of a chessboard.
+    The chessboard corners are found in all the images in parallel, using a pool of processes.
+
+    .. code-block:: python
+
+        calibration = ovl.calibrate_chessboard("calibration_images/", pattern_size=(9, 6), square_size=0.025)
+        calibration.save("camera_calibration.npz")
+
+    :param images: a directory of images, or an iterable of images and image paths
+    :param pattern_size: the amount of inner corners of the chessboard (columns, rows)
+    :param square_size: the length of a chessboard square, sets the unit of the calibration's translation vectors
+    :param workers: the amount of processes detecting corners, None uses the amount of cpus, 1 uses no processes
+    :param detection_size: the maximum width or height of the downscaled images the chessboard is found in
+    :param alpha: the scaling of the undistorted image, see `CameraCalibration`
+    :param save_raw: if the object points and image points should be kept, see `CameraCalibration`
+    :return: the camera calibration
+    """
+    images = _calibration_images(images)
+    find_corners = functools.partial(find_chessboard_corners, pattern_size=pattern_size,
+                                     detection_size=detection_size)
+    if workers == 1:
+        detections = list(map(find_corners, images))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            detections = list(executor.map(find_corners, images))
+
+    found_detections = [detection for detection in detections if detection is not None]
+    if len(found_detections) < len(images):
+        logger.warning("The chessboard was not found in %d of %d calibration images",
+                       len(images) - len(found_detections), len(images))
+    if len(found_detections) < MINIMAL_CALIBRATION_IMAGES:
+        raise ValueError(f"The chessboard was found in {len(found_detections)} images, "
+                         f"at least {MINIMAL_CALIBRATION_IMAGES} are needed to calibrate")
+    image_dimensions = found_detections[0][1]
+    if any(dimensions != image_dimensions for _, dimensions in found_detections):
+        raise ValueError("All the calibration images must have the same dimensions")
+
+    pattern_points = np.zeros((pattern_size[0] * pattern_size[1], 3), np.float32)
+    pattern_points[:, :2] = np.mgrid[0:pattern_size[0], 0:pattern_size[1]].T.reshape(-1, 2) * square_size
+    object_points = [pattern_points] * len(found_detections)
+    image_points = [corners for corners, _ in found_detections]
+    return CameraCalibration(object_points, image_points, image_dimensions, alpha=alpha, save_raw=save_raw)
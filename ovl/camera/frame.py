@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class Frame:
+    """
+    A single image taken by a camera along with the information about when it was taken.
+
+    Frames are numbered by the camera that took them using a monotonically increasing sequence number,
+    this allows consumers to know whether they already processed a frame and how many frames were skipped.
+
+    .. code-block:: python
+
+        camera = ovl.Camera(0)
+
+        with camera.get_next_frame() as frame:
+            print(frame.sequence_number, frame.timestamp)
+            targets, image = vision.detect(frame.image)
+
+    Frames whose image is a buffer of a `FramePool` are reference counted,
+    the buffer is returned to the pool (and overwritten by a later image) once every reference was released.
+    Use the frame as a context manager or call `Frame.release` when you are done with the image.
+    For frames that are not pooled acquiring and releasing does nothing.
+
+    Frames taken by a camera using configuration profiles are tagged with the profile they were taken with,
+    frames taken while the camera was settling on a new profile have no profile (None).
+    """
+    __slots__ = ("image", "sequence_number", "timestamp", "profile", "_pool", "_references")
+
+    def __init__(self, image: np.ndarray, sequence_number: int, timestamp: float, pool=None, profile: str = None):
+        """
+        :param image: the image (numpy array)
+        :param sequence_number: the number of the frame, starts at 1 and increases by 1 for every new frame
+        :param timestamp: the time the frame was captured, in seconds (time.perf_counter)
+        :param pool: the `FramePool` the image buffer belongs to, None if the image is not pooled
+        :param profile: the name of the camera configuration profile the frame was taken with
+        """
+        self.image = image
+        self.sequence_number = sequence_number
+        self.timestamp = timestamp
+        self.profile = profile
+        self._pool = pool
+        self._references = 1
+
+    @property
+    def is_pooled(self) -> bool:
+        return self._pool is not None
+
+    @property
+    def references(self) -> int:
+        return self._references
+
+    def acquire(self) -> "Frame":
+        """
+        Adds a reference to the frame, its image will not be reused until the reference is released.
+
+        :return: self
+        """
+        if self._pool is None:
+            return self
+        with self._pool.lock:
+            if self._references == 0:
+                raise ValueError(f"{self} was already released and its buffer was returned to the pool")
+            self._references += 1
+        return self
+
+    def release(self) -> None:
+        """
+        Removes a reference to the frame, returns the image buffer to its pool once no references are left.
+        """
+        if self._pool is None:
+            return
+        with self._pool.lock:
+            if self._references == 0:
+                return
+            self._references -= 1
+            is_free = self._references == 0
+        if is_free:
+            self._pool.return_buffer(self.image)
+
+    def __enter__(self) -> "Frame":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def __repr__(self):
+        return f"Frame(sequence_number={self.sequence_number}, timestamp={self.timestamp})"
@@ -0,0 +1,256 @@
+import logging
+import os
+import queue
+import time
+from pathlib import Path
+from threading import Thread
+from typing import Iterator, Union
+
+import numpy as np
+
+from .frame import Frame
+from ..utils.constants import DEFAULT_FRAME_LOG_QUEUE_SIZE, BASE_LOGGER, CAMERA_LOGGER
+
+logger = logging.getLogger(f"{BASE_LOGGER}.{CAMERA_LOGGER}")
+
+FRAME_LOG_MAGIC = b"OVLFRLOG"
+FRAME_LOG_VERSION = 1
+FRAME_ALIGNMENT = 64
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u8"), ("max_frames", "<u8"),
+                         ("data_offset", "<u8"), ("data_capacity", "<u8"), ("frame_count", "<u8"),
+                         ("reserved", "<u8", 2)])
+INDEX_DTYPE = np.dtype([("sequence_number", "<i8"), ("timestamp", "<f8"), ("offset", "<u8"), ("nbytes", "<u8"),
+                        ("shape", "<u4", 3), ("dimensions", "<u4"), ("dtype", "S8")])
+_STOP_WRITING = None
+
+
+def _align(offset: int) -> int:
+    return (offset + FRAME_ALIGNMENT - 1) // FRAME_ALIGNMENT * FRAME_ALIGNMENT
+
+
+class FrameLogWriter:
+    """
+    Records raw (not encoded) images into a preallocated memory mapped file, a frame log.
+
+    Encoding images (`cv2.imwrite`) is too slow to record a whole match at the camera's full rate,
+    a frame log only copies the raw image bytes into the file along with a compact index
+    (sequence number, timestamp, shape, data type and offset of every frame).
+
+    Frames are copied by a background thread, appending a frame never blocks, if the thread falls behind
+    frames are dropped (and counted in `FrameLogWriter.dropped_frames`).
+
+    .. code-block:: python
+
+        camera = ovl.Camera(0)
+
+        with ovl.FrameLogWriter("match_12.frames", max_frames=10000, capacity=4 * 1024 ** 3) as frame_log:
+            camera.record(frame_log)
+            ...
+
+    Use `FrameLogReader` to read the recorded frames.
+    """
+
+    def __init__(self, path: Union[str, Path], max_frames: int, capacity: int,
+                 queue_size: int = DEFAULT_FRAME_LOG_QUEUE_SIZE):
+        """
+        :param path: the path of the frame log file, overwritten if it exists
+        :param max_frames: the maximum amount of frames in the log (the size of the index)
+        :param capacity: the maximum size of all the recorded images in bytes
+        :param queue_size: the maximum amount of frames waiting to be written before frames are dropped
+        """
+        self.path = Path(path)
+        self.max_frames = max_frames
+        data_offset = _align(HEADER_DTYPE.itemsize + INDEX_DTYPE.itemsize * max_frames)
+        self._memory_map = np.memmap(self.path, dtype=np.uint8, mode="w+", shape=(data_offset + capacity,))
+        self._header = self._memory_map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)
+        self._index = self._memory_map[HEADER_DTYPE.itemsize:
+                                       HEADER_DTYPE.itemsize + INDEX_DTYPE.itemsize * max_frames].view(INDEX_DTYPE)
+        self._header[0] = (FRAME_LOG_MAGIC, FRAME_LOG_VERSION, max_frames, data_offset, capacity, 0, (0, 0))
+        self._write_offset = data_offset
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self.overflowed_frames = 0
+        self._frames = queue.Queue(maxsize=queue_size)
+        self._writing_thread = Thread(target=self._write_frames, daemon=True)
+        self._writing_thread.start()
+
+    def __enter__(self) -> "FrameLogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._memory_map is None
+
+    def append(self, image: np.ndarray, sequence_number: int = None, timestamp: float = None) -> bool:
+        """
+        Queues an image to be written to the log, never blocks.
+
+        :param image: the image to record
+        :param sequence_number: the sequence number of the image, defaults to its position in the log
+        :param timestamp: the time the image was taken, defaults to the current time (time.perf_counter)
+        :return: True if the image was queued, False if it was dropped
+        """
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        return self.append_frame(Frame(image, sequence_number, timestamp))
+
+    def append_frame(self, frame: Frame) -> bool:
+        """
+        Queues a frame to be written to the log, never blocks.
+        Pooled frames are acquired until they are written.
+
+        :param frame: the frame to record
+        :return: True if the frame was queued, False if it was dropped
+        """
+        if self.closed:
+            return False
+        frame.acquire()
+        try:
+            self._frames.put_nowait(frame)
+            return True
+        except queue.Full:
+            frame.release()
+            self.dropped_frames += 1
+            return False
+
+    def _write_frames(self) -> None:
+        while True:
+            frame = self._frames.get()
+            if frame is _STOP_WRITING:
+                return
+            try:
+                self._write(frame)
+            finally:
+                frame.release()
+
+    def _write(self, frame: Frame) -> None:
+        """
+        Copies a frame to the memory mapped file and adds it to the index
+
+        """
+        image = frame.image
+        if self.frame_count >= self.max_frames or \
+                self._write_offset + image.nbytes > self._memory_map.size:
+            self.overflowed_frames += 1
+            return
+        data = self._memory_map[self._write_offset:self._write_offset + image.nbytes]
+        np.copyto(data.view(image.dtype).reshape(image.shape), image)
+        shape = tuple(image.shape) + (1,) * (3 - image.ndim)
+        sequence_number = self.frame_count + 1 if frame.sequence_number is None else frame.sequence_number
+        self._index[self.frame_count] = (sequence_number, frame.timestamp, self._write_offset, image.nbytes,
+                                         shape, image.ndim, image.dtype.str)
+        self._write_offset = _align(self._write_offset + image.nbytes)
+        self.frame_count += 1
+        self._header["frame_count"] = self.frame_count
+
+    def close(self) -> None:
+        """
+        Writes all the queued frames, and truncates the file to the size of the recorded frames.
+
+        """
+        if self.closed:
+            return
+        self._frames.put(_STOP_WRITING)
+        self._writing_thread.join()
+        while not self._frames.empty():
+            self._frames.get_nowait().release()
+        self._memory_map.flush()
+        if self.dropped_frames or self.overflowed_frames:
+            logger.warning("Frame log %s dropped %d frames and had no room for %d frames",
+                           self.path, self.dropped_frames, self.overflowed_frames)
+        self._header = self._index = self._memory_map = None
+        os.truncate(self.path, self._write_offset)
+
+
+class FrameLogReader:
+    """
+    Reads frames from a frame log recorded by `FrameLogWriter`.
+
+    Images are returned as read-only numpy arrays that point directly into the memory mapped file,
+    no copy or decoding is performed, they can be passed directly to `Vision.detect`.
+
+    .. code-block:: python
+
+        frame_log = ovl.FrameLogReader("match_12.frames")
+
+        for image in frame_log:
+            targets, filtered_image = vision.detect(image)
+
+        frame = frame_log.at_time(frame_log.timestamps[0] + 30)
+
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        :param path: the path of the frame log file
+        """
+        self.path = Path(path)
+        self._memory_map = np.memmap(self.path, dtype=np.uint8, mode="r")
+        header = self._memory_map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if header["magic"] != FRAME_LOG_MAGIC:
+            raise ValueError(f"{self.path} is not a frame log file")
+        if header["version"] != FRAME_LOG_VERSION:
+            raise ValueError(f"Unsupported frame log version {header['version']} in {self.path}")
+        self.frame_count = int(header["frame_count"])
+        self.index = self._memory_map[HEADER_DTYPE.itemsize:
+                                      HEADER_DTYPE.itemsize + INDEX_DTYPE.itemsize * self.frame_count
+                                      ].view(INDEX_DTYPE)
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.index["timestamp"]
+
+    @property
+    def sequence_numbers(self) -> np.ndarray:
+        return self.index["sequence_number"]
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        """
+        Returns the image at the given position in the log (a read-only view of the file)
+
+        :param index: the position of the image in the log
+        """
+        if index < 0:
+            index += self.frame_count
+        if not 0 <= index < self.frame_count:
+            raise IndexError(f"Frame index {index} is out of range, the log has {self.frame_count} frames")
+        entry = self.index[index]
+        offset = int(entry["offset"])
+        shape = tuple(int(dimension) for dimension in entry["shape"][:entry["dimensions"]])
+        data = self._memory_map[offset:offset + int(entry["nbytes"])]
+        return data.view(np.dtype(entry["dtype"].decode())).reshape(shape)
+
+    def frame(self, index: int) -> Frame:
+        """
+        Returns the frame at the given position in the log, with its recorded sequence number and timestamp
+
+        :param index: the position of the frame in the log
+        """
+        image = self[index]
+        entry = self.index[index]
+        return Frame(image, int(entry["sequence_number"]), float(entry["timestamp"]))
+
+    def index_at_time(self, timestamp: float) -> int:
+        """
+        Returns the position of the latest frame taken at or before the given time
+
+        :param timestamp: the time in the same clock the frames were recorded with
+        """
+        return max(int(np.searchsorted(self.timestamps, timestamp, side="right")) - 1, 0)
+
+    def at_time(self, timestamp: float) -> Frame:
+        """
+        Returns the latest frame taken at or before the given time
+
+        :param timestamp: the time in the same clock the frames were recorded with
+        """
+        return self.frame(self.index_at_time(timestamp))
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for index in range(self.frame_count):
+            yield self[index]
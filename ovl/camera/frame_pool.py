@@ -0,0 +1,69 @@
+import threading
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class FramePool:
+    """
+    A fixed pool of preallocated image buffers that a camera reads images into.
+
+    Reading into preallocated buffers (`cv2.VideoCapture.read(image=buffer)`) stops the camera
+    from allocating a new numpy array for every image taken.
+    Buffers are wrapped by reference counted `Frame` objects, once all references to a frame are released
+    its buffer is returned to the pool and can be reused.
+
+    .. code-block:: python
+
+        pool = FramePool(size=8, shape=(480, 640, 3))
+
+        buffer = pool.acquire_buffer()
+        if buffer is not None:
+            grabbed, image = capture.read(image=buffer)
+
+    """
+
+    def __init__(self, size: int, shape: Tuple[int, ...], dtype=np.uint8):
+        """
+        :param size: the amount of buffers to preallocate
+        :param shape: the shape of every buffer, the shape of the images taken by the camera
+        :param dtype: the data type of every buffer
+        """
+        if size < 1:
+            raise ValueError(f"Frame pool size must be at least 1, got {size}")
+        self.size = size
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.lock = threading.Lock()
+        self._free_buffers = deque(np.empty(self.shape, dtype=self.dtype) for _ in range(size))
+        self.exhausted_count = 0
+
+    @property
+    def free_buffers(self) -> int:
+        """
+        The amount of buffers that are not held by any frame
+        """
+        return len(self._free_buffers)
+
+    def acquire_buffer(self) -> Optional[np.ndarray]:
+        """
+        Takes a free buffer out of the pool
+
+        :return: a free buffer, None if all buffers are currently held
+        """
+        with self.lock:
+            if not self._free_buffers:
+                self.exhausted_count += 1
+                return None
+            return self._free_buffers.popleft()
+
+    def return_buffer(self, buffer: np.ndarray) -> None:
+        """
+        Returns a buffer to the pool, must only be called on buffers acquired from this pool
+        that are no longer used.
+
+        :param buffer: the buffer to return
+        """
+        with self.lock:
+            self._free_buffers.append(buffer)
@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .frame import Frame
+from ..utils.constants import DEFAULT_FRAME_BUFFER_SIZE
+
+
+class FrameRingBuffer:
+    """
+    A small, lock protected, circular buffer of the latest frames taken by a camera.
+
+    The capture thread publishes frames into the buffer and every published frame gets the next
+    sequence number, old frames are overwritten once the buffer is full.
+    Consumers can get the latest frame or wait for a frame newer than the last one they processed,
+    either blocking (`wait_for_frame`) or from an asyncio event loop (`wait_for_frame_async`),
+    async consumers are woken by the publishing thread through `loop.call_soon_threadsafe`.
+
+    Frames older than `FrameRingBuffer.minimal_sequence_number` are never returned to waiting consumers,
+    this is used to hide the frames taken before a camera settled on a new configuration.
+
+    The buffer holds a reference to every frame in it, and releases it once the frame is overwritten,
+    consumers that need a pooled frame to stay valid should ask for an acquired frame (`acquire=True`)
+    and release it when they are done.
+
+    .. code-block:: python
+
+        frames = FrameRingBuffer(capacity=4)
+
+        # capture thread
+        frames.publish(image)
+
+        # consumer thread
+        frame = frames.wait_for_frame(after_sequence_number=last_frame.sequence_number, timeout=1)
+
+    """
+
+    def __init__(self, capacity: int = DEFAULT_FRAME_BUFFER_SIZE):
+        """
+        :param capacity: the amount of frames kept in the buffer
+        """
+        if capacity < 1:
+            raise ValueError(f"Frame buffer capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._frames: List[Optional[Frame]] = [None] * capacity
+        self._sequence_number = 0
+        self._minimal_sequence_number = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._async_waiters = []
+
+    @property
+    def sequence_number(self) -> int:
+        """
+        The sequence number of the latest published frame (0 if no frame was published)
+        """
+        return self._sequence_number
+
+    @property
+    def minimal_sequence_number(self) -> int:
+        """
+        The sequence number of the oldest frame that can be returned by `wait_for_frame`
+        """
+        return self._minimal_sequence_number
+
+    @minimal_sequence_number.setter
+    def minimal_sequence_number(self, sequence_number: int) -> None:
+        with self._condition:
+            self._minimal_sequence_number = sequence_number
+            self._condition.notify_all()
+            self._wake_async_waiters()
+
+    def _has_frame_after(self, sequence_number: int) -> bool:
+        return self._sequence_number > max(sequence_number, self._minimal_sequence_number - 1)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def publish(self, image: np.ndarray, timestamp: float = None, pool=None, profile: str = None) -> Frame:
+        """
+        Adds a new frame to the buffer, overwriting the oldest frame if the buffer is full,
+        and wakes up all consumers waiting for a new frame.
+
+        :param image: the image to publish
+        :param timestamp: the time the image was captured, defaults to the current time.perf_counter
+        :param pool: the `FramePool` the image buffer was taken from, None if the image is not pooled
+        :param profile: the name of the configuration profile the image was taken with
+        :return: the published frame
+        """
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        with self._condition:
+            self._sequence_number += 1
+            frame = Frame(image, self._sequence_number, timestamp, pool, profile)
+            index = self._sequence_number % self.capacity
+            overwritten_frame = self._frames[index]
+            self._frames[index] = frame
+            if overwritten_frame is not None:
+                overwritten_frame.release()
+            self._condition.notify_all()
+            self._wake_async_waiters()
+        return frame
+
+    def _wake_async_waiters(self) -> None:
+        """
+        Wakes all the coroutines waiting for a new frame, must be called while holding the condition
+        """
+        async_waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in async_waiters:
+            try:
+                loop.call_soon_threadsafe(_set_waiter_done, waiter)
+            except RuntimeError:
+                # the waiting event loop was closed
+                pass
+
+    def latest(self, acquire: bool = False) -> Optional[Frame]:
+        """
+        Returns the latest frame published, None if no frame was published yet.
+
+        :param acquire: if a reference to the frame should be acquired for the caller
+        """
+        with self._condition:
+            frame = self._frames[self._sequence_number % self.capacity]
+            return frame.acquire() if acquire and frame is not None else frame
+
+    def get(self, sequence_number: int, acquire: bool = False) -> Optional[Frame]:
+        """
+        Returns the frame with the given sequence number if it is still in the buffer, None otherwise.
+
+        :param sequence_number: the sequence number of the wanted frame
+        :param acquire: if a reference to the frame should be acquired for the caller
+        """
+        with self._condition:
+            frame = self._frames[sequence_number % self.capacity]
+            if frame is None or frame.sequence_number != sequence_number:
+                return None
+            return frame.acquire() if acquire else frame
+
+    def wait_for_frame(self, after_sequence_number: int = 0, timeout: Union[float, None] = None,
+                       acquire: bool = False) -> Optional[Frame]:
+        """
+        Waits until a frame newer than the given sequence number (and not older than
+        `FrameRingBuffer.minimal_sequence_number`) is published and returns the latest frame.
+
+        :param after_sequence_number: the sequence number of the last frame that was consumed
+        :param timeout: the maximum time to wait in seconds, None waits until a frame arrives
+        :param acquire: if a reference to the frame should be acquired for the caller
+        :return: the latest frame or None if the timeout expired or the buffer was closed
+        """
+        with self._condition:
+            has_new_frame = self._condition.wait_for(
+                lambda: self._has_frame_after(after_sequence_number) or self._closed, timeout)
+            if not has_new_frame or not self._has_frame_after(after_sequence_number):
+                return None
+            frame = self._frames[self._sequence_number % self.capacity]
+            return frame.acquire() if acquire else frame
+
+    async def wait_for_frame_async(self, after_sequence_number: int = 0, acquire: bool = False) -> Optional[Frame]:
+        """
+        Waits, without blocking the running event loop, until a frame newer than the given sequence number
+        is published and returns the latest frame.
+        Use `asyncio.wait_for` to wait with a timeout.
+
+        :param after_sequence_number: the sequence number of the last frame that was consumed
+        :param acquire: if a reference to the frame should be acquired for the caller
+        :return: the latest frame or None if the buffer was closed
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._has_frame_after(after_sequence_number):
+                    frame = self._frames[self._sequence_number % self.capacity]
+                    return frame.acquire() if acquire else frame
+                if self._closed:
+                    return None
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def close(self) -> None:
+        """
+        Closes the buffer, waking up all waiting consumers.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            self._wake_async_waiters()
+
+
+def _set_waiter_done(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
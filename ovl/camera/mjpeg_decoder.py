@@ -0,0 +1,175 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition
+from typing import Callable, Iterable, Iterator, Tuple, Union
+
+import cv2
+import numpy as np
+
+from ..utils.constants import DEFAULT_MJPEG_DECODE_WORKERS
+
+JPEG_START_OF_IMAGE = b"\xff\xd8"
+JPEG_END_OF_IMAGE = b"\xff\xd9"
+REDUCED_DECODE_FLAGS = {1: cv2.IMREAD_COLOR,
+                        2: cv2.IMREAD_REDUCED_COLOR_2,
+                        4: cv2.IMREAD_REDUCED_COLOR_4,
+                        8: cv2.IMREAD_REDUCED_COLOR_8}
+
+
+def iterate_jpeg_frames(stream: bytes) -> Iterator[np.ndarray]:
+    """
+    Splits a recorded MJPEG stream (JPEG images one after the other) into the encoded JPEG images
+
+    :param stream: the bytes of the recorded stream
+    :return: an iterator of the encoded images (uint8 numpy arrays)
+    """
+    position = 0
+    while True:
+        start = stream.find(JPEG_START_OF_IMAGE, position)
+        if start == -1:
+            return
+        end = stream.find(JPEG_END_OF_IMAGE, start + len(JPEG_START_OF_IMAGE))
+        if end == -1:
+            return
+        position = end + len(JPEG_END_OF_IMAGE)
+        yield np.frombuffer(stream, dtype=np.uint8, count=position - start, offset=start)
+
+
+class MjpegDecoder:
+    """
+    Decodes JPEG compressed images (the images of an MJPEG camera) using a pool of threads,
+    decoded images are returned in the order they were submitted.
+
+    `cv2.imdecode` releases the GIL, so decoding in multiple threads uses multiple cores.
+    Images can also be decoded at a reduced size (1/2, 1/4 or 1/8 of each dimension),
+    which skips most of the decoding work for pipelines that don't need the full resolution.
+
+    .. code-block:: python
+
+        decoder = MjpegDecoder(workers=3, reduction=2)
+
+        with open("match_12.mjpeg", "rb") as recording:
+            for image in decoder.decode_all(iterate_jpeg_frames(recording.read())):
+                targets, filtered_image = vision.detect(image)
+
+    Instead of polling `MjpegDecoder.decoded`, a callback can be given that is called with every image
+    as soon as it (and every image submitted before it) finished decoding, from the decoding threads:
+
+    .. code-block:: python
+
+        decoder = MjpegDecoder(workers=2, on_decoded=lambda image, timestamp: frames.publish(image, timestamp))
+
+    """
+
+    def __init__(self, workers: int = DEFAULT_MJPEG_DECODE_WORKERS, reduction: int = 1, max_pending: int = None,
+                 on_decoded: Callable[[np.ndarray, float], None] = None):
+        """
+        :param workers: the amount of decoding threads
+        :param reduction: decode images at 1 / reduction of their size, can be 1, 2, 4 or 8
+        :param max_pending: the maximum amount of images being decoded at once, defaults to twice the workers
+        :param on_decoded: a function called with (image, timestamp) of every decoded image, in order,
+         images are then passed only to it and not returned by `MjpegDecoder.decoded` or `MjpegDecoder.flush`
+        """
+        if reduction not in REDUCED_DECODE_FLAGS:
+            raise ValueError(f"Invalid reduction {reduction}, must be one of {tuple(REDUCED_DECODE_FLAGS)}")
+        self.workers = workers
+        self.reduction = reduction
+        self.decode_flags = REDUCED_DECODE_FLAGS[reduction]
+        self.max_pending = max_pending or workers * 2
+        self.failed_decodes = 0
+        self.on_decoded = on_decoded
+        self._decoded_condition = Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ovl-mjpeg-decoder")
+        self._pending: deque = deque()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _decode(self, encoded_image: np.ndarray) -> Union[np.ndarray, None]:
+        return cv2.imdecode(encoded_image, self.decode_flags)
+
+    def submit(self, encoded_image: np.ndarray, timestamp: float = None) -> None:
+        """
+        Starts decoding an encoded image, if too many images are being decoded
+        waits for the oldest one to finish first.
+
+        :param encoded_image: the encoded JPEG image, a 1 dimensional uint8 numpy array
+        :param timestamp: the time the image was taken, returned with the decoded image
+        """
+        if self.on_decoded is None:
+            if len(self._pending) >= self.max_pending:
+                self._pending[0][0].result()
+            self._pending.append((self._executor.submit(self._decode, encoded_image), timestamp))
+            return
+        with self._decoded_condition:
+            self._decoded_condition.wait_for(lambda: len(self._pending) < self.max_pending)
+            future = self._executor.submit(self._decode, encoded_image)
+            self._pending.append((future, timestamp))
+        # added outside the lock, the callback is called immediately if the image already finished decoding
+        future.add_done_callback(self._deliver_decoded)
+
+    def _deliver_decoded(self, _: Future) -> None:
+        """
+        Passes the images that finished decoding to `MjpegDecoder.on_decoded`, in order,
+        called whenever an image finishes decoding
+        """
+        with self._decoded_condition:
+            while self._pending and self._pending[0][0].done():
+                decoded = self._pop_decoded()
+                if decoded is not None:
+                    self.on_decoded(*decoded)
+            self._decoded_condition.notify_all()
+
+    def _pop_decoded(self) -> Union[Tuple[np.ndarray, float], None]:
+        future, timestamp = self._pending.popleft()
+        image = future.result()
+        if image is None:
+            self.failed_decodes += 1
+            return None
+        return image, timestamp
+
+    def decoded(self) -> Iterator[Tuple[np.ndarray, float]]:
+        """
+        Returns the images that finished decoding, in order, without waiting for images that are still decoding
+
+        :return: an iterator of (image, timestamp)
+        """
+        while self._pending and self._pending[0][0].done():
+            decoded = self._pop_decoded()
+            if decoded is not None:
+                yield decoded
+
+    def flush(self) -> Iterator[Tuple[np.ndarray, float]]:
+        """
+        Waits for all the submitted images to finish decoding and returns them in order
+
+        :return: an iterator of (image, timestamp)
+        """
+        while self._pending:
+            decoded = self._pop_decoded()
+            if decoded is not None:
+                yield decoded
+
+    def decode_all(self, encoded_images: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Decodes a sequence of encoded images (like a recorded MJPEG stream) in parallel
+
+        :param encoded_images: the encoded JPEG images
+        :return: an iterator of the decoded images, in order
+        """
+        for encoded_image in encoded_images:
+            self.submit(encoded_image)
+            for image, _ in self.decoded():
+                yield image
+        for image, _ in self.flush():
+            yield image
+
+    def close(self) -> None:
+        """
+        Waits for all the submitted images and stops the decoding threads
+        """
+        with self._decoded_condition:
+            self._pending.clear()
+            self._decoded_condition.notify_all()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,98 @@
+import time
+from typing import Union
+
+import cv2
+import numpy as np
+
+from ..utils.constants import DEFAULT_PROFILE_SETTLE_FRAMES, DEFAULT_PROFILE_SETTLE_TIMEOUT, \
+    DEFAULT_PROFILE_BRIGHTNESS_TOLERANCE, DEFAULT_DRIVER_BUFFER_FRAMES
+
+BRIGHTNESS_SAMPLE_STEP = 8
+
+
+def image_brightness(image: np.ndarray) -> float:
+    """
+    Returns the mean brightness of an image, sampled on a sparse grid of pixels
+
+    :param image: the image
+    :return: the mean value of the sampled pixels over all channels
+    """
+    return float(np.mean(cv2.mean(image[::BRIGHTNESS_SAMPLE_STEP, ::BRIGHTNESS_SAMPLE_STEP])[:_channels(image)]))
+
+
+def _channels(image: np.ndarray) -> int:
+    return 1 if image.ndim == 2 else image.shape[2]
+
+
+class ProfileSwitch:
+    """
+    Detects when the images of a camera reflect a newly applied configuration profile.
+
+    Properties like exposure and gain take a few frames to take effect, and the driver may still hold images
+    taken with the previous settings, so instead of waiting a fixed time the switch first waits for
+    the images to change: for the brightness to move away from the brightness before the switch,
+    or for the driver's buffer (driver_buffer_frames images) to be skipped when the brightness didn't change.
+    The brightness of every later image is then compared to the previous one, the camera is settled once
+    the brightness stayed stable for settle_frames images in a row (or once the settle timeout expired).
+    """
+
+    def __init__(self, profile: str, settle_frames: int = DEFAULT_PROFILE_SETTLE_FRAMES,
+                 settle_timeout: float = DEFAULT_PROFILE_SETTLE_TIMEOUT,
+                 brightness_tolerance: float = DEFAULT_PROFILE_BRIGHTNESS_TOLERANCE,
+                 previous_brightness: Union[float, None] = None,
+                 driver_buffer_frames: int = DEFAULT_DRIVER_BUFFER_FRAMES):
+        """
+        :param profile: the name of the profile that is being switched to
+        :param settle_frames: the amount of images in a row with a stable brightness needed to settle
+        :param settle_timeout: the maximum time in seconds to wait for the camera to settle
+        :param brightness_tolerance: the maximum relative brightness change between images considered stable
+        :param previous_brightness: the brightness of the last image taken before the switch,
+         None if it is unknown (the driver's buffer is then skipped)
+        :param driver_buffer_frames: the amount of images taken before the switch the driver might still return
+        """
+        self.profile = profile
+        self.settle_frames = settle_frames
+        self.settle_timeout = settle_timeout
+        self.brightness_tolerance = brightness_tolerance
+        self.previous_brightness = previous_brightness
+        self.driver_buffer_frames = driver_buffer_frames
+        self.started = time.perf_counter()
+        self.images_since_switch = 0
+        self.changed = False
+        self.stable_frames = 0
+        self.timed_out = False
+        self._last_brightness = None
+
+    def _is_stable(self, brightness: float, reference_brightness: float) -> bool:
+        return abs(brightness - reference_brightness) <= self.brightness_tolerance * max(reference_brightness, 1)
+
+    def update(self, image: np.ndarray, timestamp: float) -> bool:
+        """
+        Checks an image taken after the switch
+
+        :param image: the image taken
+        :param timestamp: the time the image was taken
+        :return: True if the camera settled on the new profile, this image is the first image of the profile
+        """
+        if timestamp < self.started:
+            # grabbed before the profile was applied
+            return False
+        self.images_since_switch += 1
+        brightness = image_brightness(image)
+        if not self.changed:
+            # images with the brightness from before the switch might still be buffered images of the previous profile
+            moved = self.previous_brightness is not None and \
+                not self._is_stable(brightness, self.previous_brightness)
+            self.changed = moved or self.images_since_switch > self.driver_buffer_frames
+        if self.changed:
+            if self._last_brightness is not None and self._is_stable(brightness, self._last_brightness):
+                self.stable_frames += 1
+            else:
+                self.stable_frames = 0
+            self._last_brightness = brightness
+        if self.stable_frames >= self.settle_frames:
+            return True
+        if timestamp - self.started > self.settle_timeout:
+            self.timed_out = True
+            return True
+        return False
@@ -0,0 +1,257 @@
+import enum
+import logging
+import queue
+import time
+from pathlib import Path
+from threading import Thread
+from typing import Iterator, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .frame import Frame
+from ..exceptions.exceptions import CameraError, ImageError
+from ..utils.constants import DEFAULT_REPLAY_PREFETCH, IMAGE_FILE_EXTENSIONS, BASE_LOGGER, CAMERA_LOGGER, \
+    REPLAY_POLL_INTERVAL
+
+logger = logging.getLogger(f"{BASE_LOGGER}.{CAMERA_LOGGER}")
+_END_OF_REPLAY = None
+
+
+class ReplayMode(enum.Enum):
+    """
+    The pacing of a `ReplayCamera`:
+
+    AS_FAST_AS_POSSIBLE - every image is returned as soon as it is asked for, used to measure throughput
+    REAL_TIME - images are returned at the time they were recorded (relative to the first image),
+     like a live camera images that are late are dropped
+    FIXED_FPS - images are returned no faster than the given fps, no image is dropped
+    """
+    AS_FAST_AS_POSSIBLE = "as_fast_as_possible"
+    REAL_TIME = "real_time"
+    FIXED_FPS = "fixed_fps"
+
+
+class ReplayCamera:
+    """
+    ReplayCamera replays a recording (a video file or a directory of images) as if it was a camera.
+
+    It implements the reading interface of `ovl.Camera` (read, get_image, get_next_image, isOpened)
+    so it can be passed to a `Vision` instead of a live camera in order to run pipelines on recorded matches.
+    Images are decoded ahead of time by a background thread, so decoding does not affect the measured
+    pipeline throughput.
+
+    Unlike `ovl.Camera`, every image is returned exactly once and in order (except for late images in
+    `ReplayMode.REAL_TIME`), once all images were returned the camera is closed (isOpened returns False).
+
+    .. code-block:: python
+
+        replay = ovl.ReplayCamera("match_12.avi", mode=ovl.ReplayMode.AS_FAST_AS_POSSIBLE)
+
+        for image in replay:
+            targets, filtered_image = vision.detect(image)
+
+    Directories of images are replayed in the sorted order of their file names,
+    the fps of a directory must be given to replay it in real time or at a fixed fps.
+    """
+
+    def __init__(self, source: Union[str, Path], mode: ReplayMode = ReplayMode.AS_FAST_AS_POSSIBLE,
+                 fps: float = None, prefetch: int = DEFAULT_REPLAY_PREFETCH, start_immediately=True):
+        """
+        :param source: the path of a video file or of a directory of images
+        :param mode: the pacing of the replay, see `ReplayMode`
+        :param fps: the fps to replay in when using `ReplayMode.FIXED_FPS`,
+         the recorded fps of a directory of images when using `ReplayMode.REAL_TIME`
+        :param prefetch: the maximum amount of images decoded ahead of time
+        :param start_immediately: if the decoding thread should start immediately or by calling `ReplayCamera.start`
+        """
+        self.source = Path(source)
+        self.mode = ReplayMode(mode)
+        self.image_paths = None
+        self.stream = None
+        if self.source.is_dir():
+            self.image_paths = sorted(path for path in self.source.iterdir()
+                                      if path.suffix.lower() in IMAGE_FILE_EXTENSIONS)
+            self.source_fps = fps
+        else:
+            self.stream = cv2.VideoCapture(str(self.source))
+            if not self.stream.isOpened():
+                raise CameraError(f"Failed to open the recording at {self.source}")
+            self.source_fps = self.stream.get(cv2.CAP_PROP_FPS) or fps
+        if self.mode is ReplayMode.FIXED_FPS and not fps:
+            raise ValueError("An fps must be given to replay at a fixed fps")
+        if self.mode is ReplayMode.REAL_TIME and not self.source_fps:
+            raise ValueError(f"The fps of {self.source} is unknown, an fps must be given to replay it in real time")
+        self.fps = fps
+        self.delivered_frames = 0
+        self.dropped_frames = 0
+        self.exhausted = False
+        self.stopped = False
+        self._frames = queue.Queue(maxsize=prefetch)
+        self._start_time = None
+        self.decoding_thread: Union[None, Thread] = None
+        if start_immediately:
+            self.start()
+
+    def start(self) -> "ReplayCamera":
+        """
+        Starts the decoding thread
+
+        :return: self
+        """
+        if self.decoding_thread is not None:
+            return self
+        self.decoding_thread = Thread(target=self._decode, daemon=True)
+        self.decoding_thread.start()
+        return self
+
+    def _decoded_images(self) -> Iterator[np.ndarray]:
+        if self.image_paths is not None:
+            for image_path in self.image_paths:
+                image = cv2.imread(str(image_path))
+                if image is None:
+                    logger.warning("Failed to read the recorded image %s, skipping it", image_path)
+                    continue
+                yield image
+        else:
+            while True:
+                grabbed, image = self.stream.read()
+                if not grabbed:
+                    return
+                yield image
+
+    def _put(self, item) -> bool:
+        while not self.stopped:
+            try:
+                self._frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode(self) -> None:
+        """
+        Decodes the recording into the prefetch queue until it ends or the camera is stopped
+
+        """
+        frame_interval = 1 / self.source_fps if self.source_fps else 0
+        try:
+            for index, image in enumerate(self._decoded_images()):
+                if not self._put(Frame(image, index + 1, index * frame_interval)):
+                    return
+        finally:
+            self._put(_END_OF_REPLAY)
+
+    def _due_time(self, frame: Frame) -> Union[float, None]:
+        """
+        The time (time.perf_counter) the given frame should be returned at, None if it should be returned immediately
+        """
+        if self.mode is ReplayMode.REAL_TIME:
+            return self._start_time + frame.timestamp
+        if self.mode is ReplayMode.FIXED_FPS:
+            return self._start_time + self.delivered_frames / self.fps
+        return None
+
+    def get_next_frame(self, timeout: Union[float, None] = None) -> Frame:
+        """
+        Returns the next frame of the recording, waiting according to the replay mode.
+        The frame's sequence number is its position in the recording (starting at 1)
+        and its timestamp is its time in the recording in seconds.
+
+        :param timeout: the maximum time to wait for the frame to be decoded, None to wait until it is decoded
+        :return: the next frame
+        :raises: ImageError if the recording ended, the camera was stopped
+         or the frame was not decoded before the timeout expired
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            if self.stopped:
+                raise ImageError(f"The replay of {self.source} was stopped")
+            if self.exhausted:
+                raise ImageError(f"The recording {self.source} ended")
+            # waits in short intervals, so readers that are waiting notice when the camera is stopped
+            wait = REPLAY_POLL_INTERVAL if deadline is None else \
+                min(REPLAY_POLL_INTERVAL, max(deadline - time.perf_counter(), 0))
+            try:
+                frame = self._frames.get(timeout=wait)
+            except queue.Empty:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    raise ImageError(f"No image was decoded from {self.source} in {timeout} seconds")
+                continue
+            if frame is _END_OF_REPLAY:
+                self.exhausted = True
+                continue
+            if self._start_time is None:
+                self._start_time = time.perf_counter() - frame.timestamp
+            due_time = self._due_time(frame)
+            if due_time is not None:
+                delay = due_time - time.perf_counter()
+                if self.mode is ReplayMode.REAL_TIME and -delay > 1 / self.source_fps:
+                    self.dropped_frames += 1
+                    continue
+                if delay > 0:
+                    time.sleep(delay)
+            self.delivered_frames += 1
+            return frame
+
+    def get_next_image(self, timeout: Union[float, None] = None) -> np.ndarray:
+        """
+        Returns the next image of the recording, see `ReplayCamera.get_next_frame`
+        """
+        return self.get_next_frame(timeout).image
+
+    def read(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        """
+        Returns the next image of the recording, like cv2.VideoCapture.read
+
+        :return: if an image was read (False once the recording ended), the image
+        """
+        try:
+            return True, self.get_next_image()
+        except ImageError:
+            return False, None
+
+    def get_image(self) -> Union[np.ndarray, None]:
+        """
+        Returns the next image of the recording, None once the recording ended
+        """
+        return self.read()[1]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        while True:
+            grabbed, image = self.read()
+            if not grabbed:
+                return
+            yield image
+
+    def is_opened(self) -> bool:
+        """
+        Returns true if the recording still has images to return, false otherwise
+        """
+        return not (self.exhausted or self.stopped)
+
+    def isOpened(self) -> bool:
+        """
+        Returns true if the recording still has images to return, false otherwise
+        This function is left to allow it to be used wherever cv2.VideoCapture can be used
+        """
+        return self.is_opened()
+
+    def stop(self) -> None:
+        """
+        Stops the decoding thread,
+        readers that are waiting for an image (and later reads) fail with an ImageError (read returns False)
+
+        """
+        self.stopped = True
+
+    def release(self) -> None:
+        """
+        Stops the decoding thread and closes the recording
+
+        """
+        self.stop()
+        if self.decoding_thread is not None:
+            self.decoding_thread.join()
+        if self.stream is not None:
+            self.stream.release()
@@ -1,5 +1,7 @@
 from typing import List, Any
 
+from ..utils.frame_context import FrameContext
+
 
 class Detector:
     """
@@ -7,6 +9,26 @@ class Detector:
 
     The only required function is detect which should get an image and return
 
+    Detectors can time their internal stages using `Detector.profiler`,
+    a `PipelineProfiler` set by a `Vision` that collects timings (None when timings are not collected)
     """
+    profiler = None
+
+    def __getstate__(self):
+        # timings are not copied along with the detector (for example to the processes of `Vision.detect_batch`)
+        state = self.__dict__.copy()
+        state.pop("profiler", None)
+        return state
+
     def detect(self, image, *args, **kwargs) -> List[Any]:
         raise NotImplemented()
+
+    def detect_context(self, context: FrameContext, *args, **kwargs) -> List[Any]:
+        """
+        Detects in the image of a `FrameContext`, detectors that need a derived image (like a greyscale image)
+        should request it from the context so it is computed once for every consumer of the image
+
+        :param context: the context of the image
+        :return: the detected targets
+        """
+        return self.detect(context.bgr, *args, **kwargs)
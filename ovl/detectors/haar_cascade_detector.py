@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 
 from .detector import Detector
+from ..utils.frame_context import FrameContext
 
 
 class HaarCascadeDetector(Detector):
@@ -21,3 +22,6 @@ class HaarCascadeDetector(Detector):
     def detect(self, image: np.ndarray, *args, **kwargs):
         greyscale = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         return self.classifier.detectMultiScale(greyscale)
+
+    def detect_context(self, context: FrameContext, *args, **kwargs):
+        return self.classifier.detectMultiScale(context.gray)
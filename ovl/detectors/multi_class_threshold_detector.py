@@ -0,0 +1,83 @@
+from typing import Dict, Hashable, List, Sequence, Union
+
+import cv2
+import numpy as np
+
+from .threshold_detector import ThresholdDetector
+from ..thresholds.label_threshold import LabelThreshold
+from ..thresholds.threshold import Threshold
+from ..utils.color_space import ColorSpace
+from ..utils.frame_context import FrameContext
+
+
+class MultiClassThresholdDetector(ThresholdDetector):
+    """
+    MultiClassThresholdDetector finds the contours of several classes of colors at once,
+    the image is segmented into a label image in a single pass (see `LabelThreshold`)
+    and the contours of every class are found in it, instead of using a `Vision` (and thresholding the image)
+    for every class.
+
+    The targets are returned grouped by class, as a dictionary of class name to the contours of the class,
+    `Vision` applies its target filters to the contours of every class separately:
+
+    .. code-block:: python
+
+        detector = ovl.MultiClassThresholdDetector({"cone": ovl.HSV.yellow, "cube": ovl.HSV.purple})
+        vision = ovl.Vision(detector=detector, target_filters=[ovl.area_filter(min_area=200)])
+
+        targets, image = vision.detect(image)
+        cones, cubes = targets["cone"], targets["cube"]
+
+    The image is thresholded once regardless of the amount of classes,
+    only the (much cheaper) contour finding is done for every class.
+    """
+
+    def __init__(self, classes: Union[LabelThreshold, Dict[Hashable, Threshold], Sequence[Threshold]],
+                 morphological_functions=()):
+        """
+        :param classes: a LabelThreshold or the thresholds of the classes (see `LabelThreshold`)
+        :param morphological_functions: a list of morphological functions applied to the mask of every class
+        """
+        if not isinstance(classes, LabelThreshold):
+            classes = LabelThreshold(classes)
+        super().__init__(threshold=classes, morphological_functions=morphological_functions)
+
+    @property
+    def class_names(self) -> List[Hashable]:
+        return self.threshold.class_names
+
+    def detect(self, image: np.ndarray, return_hierarchy=False, *args, color_space: ColorSpace = None,
+               **kwargs) -> Dict[Hashable, List[np.ndarray]]:
+        """
+        Gets the contours of every class
+
+        :param image: image from which to get the contours
+        :param return_hierarchy: if the hierarchy of the contours of every class should be returned as well
+        :param color_space: the color space of the image, see `ThresholdDetector.apply_threshold`
+        :return: a dictionary of class name to its list of contours (or contours and hierarchy)
+        """
+        return self.detect_context(FrameContext(image, color_space or ColorSpace.BGR), return_hierarchy)
+
+    def detect_context(self, context: FrameContext, return_hierarchy=False, *args,
+                       **kwargs) -> Dict[Hashable, List[np.ndarray]]:
+        """
+        Gets the contours of every class in the image of a `FrameContext`, see `MultiClassThresholdDetector.detect`
+        """
+        if self.profiler is None:
+            return self.find_class_contours(self.apply_threshold_context(context), return_hierarchy)
+        labels = self.profiler.time("threshold", self.apply_threshold_context, context)
+        return self.profiler.time("find_contours", self.find_class_contours, labels, return_hierarchy)
+
+    def find_class_contours(self, labels: np.ndarray, return_hierarchy=False) -> Dict[Hashable, List[np.ndarray]]:
+        """
+        Finds the contours of every class in a label image
+
+        :param labels: a label image created by `LabelThreshold.convert`
+        :param return_hierarchy: if the hierarchy of the contours of every class should be returned as well
+        :return: a dictionary of class name to its list of contours (or contours and hierarchy)
+        """
+        class_contours = {}
+        for label, class_name in enumerate(self.threshold.class_names, start=1):
+            mask = cv2.compare(labels, label, cv2.CMP_EQ)
+            class_contours[class_name] = self.find_contours_in_mask(mask, return_hierarchy=return_hierarchy)
+        return class_contours
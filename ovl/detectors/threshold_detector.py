@@ -1,5 +1,5 @@
 from functools import reduce
-from typing import List
+from typing import List, Tuple
 
 import cv2
 import numpy as np
@@ -7,6 +7,12 @@ import numpy as np
 from .detector import Detector
 from ..partials.filter_applier import apply
 from ..thresholds.threshold import Threshold
+from ..utils.color_space import ColorSpace, convert_color_space
+from ..utils.constants import DEFAULT_PYRAMID_MINIMAL_TARGET_SIZE, DEFAULT_MINIMAL_CANDIDATE_PIXELS
+from ..utils.frame_context import FrameContext
+
+# nearest neighbour sampling is much faster than area averaging, and keeps the colors of the pixels unmixed
+PYRAMID_INTERPOLATION = cv2.INTER_NEAREST
 
 
 class ThresholdDetector(Detector):
@@ -34,28 +40,113 @@ class ThresholdDetector(Detector):
 
     For more information on morphological functions:
     https://docs.opencv.org/3.4/d9/d61/tutorial_py_morphological_ops.html
+
+    Large targets can be found in a downscaled copy of the image (pyramid detection),
+    the contours found in the small image are either scaled back to the full resolution
+    or used as candidate regions that are thresholded again in the full resolution image (refine=True).
+    The thresholded regions are merged into a single full resolution mask and the morphological functions
+    are applied to it, so targets found in the downscaled image get the same contours as when detecting
+    in the full resolution image, pixels outside the candidate regions are ignored (including ones
+    a morphological function would otherwise connect to a target).
+    The downscaling factor adapts to the size of the targets, so the largest target stays at least
+    `minimal_target_size` pixels wide and high in the downscaled image:
+
+    .. code-block:: python
+
+        detector = ovl.ThresholdDetector(threshold=ovl.HSV.yellow, max_downscale=4)
+        vision = ovl.Vision(detector=detector, target_filters=[ovl.area_filter(min_area=2000)])
+
+    When no contours are found in the downscaled image the full resolution image is searched.
+
+    Images where the target isn't visible can be skipped using a presence check, the threshold is first applied
+    to a tiny thumbnail of the image (1 / presence_check_scale of each dimension) and if it has less than
+    `minimal_candidate_pixels` matching pixels no contours are returned without processing the image:
+
+    .. code-block:: python
+
+        detector = ovl.ThresholdDetector(threshold=ovl.HSV.yellow, presence_check_scale=8)
+
+    The thumbnail samples every presence_check_scale-th pixel, targets smaller than that might be skipped.
     """
 
-    def __init__(self, threshold: Threshold = None, morphological_functions=()):
+    def __init__(self, threshold: Threshold = None, morphological_functions=(), max_downscale: int = 1,
+                 refine: bool = True, minimal_target_size: int = DEFAULT_PYRAMID_MINIMAL_TARGET_SIZE,
+                 presence_check_scale: int = 1, minimal_candidate_pixels: int = DEFAULT_MINIMAL_CANDIDATE_PIXELS):
         """
         :param threshold: a Threshold object used to create binary images
         :param morphological_functions: a list of morphological functions
+        :param max_downscale: the maximal factor the image is downscaled by before detecting, 1 disables pyramid
+         detection
+        :param refine: if contours found in the downscaled image should be found again in the full resolution
+         image (precise), otherwise the contours are only scaled to the full resolution (faster)
+        :param minimal_target_size: the minimal width and height (in pixels) of the largest target
+         in the downscaled image, used to choose the downscaling factor
+        :param presence_check_scale: the factor the thumbnail used to check if any target might be in the image
+         is downscaled by, 1 disables the presence check
+        :param minimal_candidate_pixels: the minimal amount of pixels of the thumbnail that must match the threshold
+         for the image to be processed
         """
+        if max_downscale < 1:
+            raise ValueError(f"The maximal downscale must be at least 1, got {max_downscale}")
+        if presence_check_scale < 1:
+            raise ValueError(f"The presence check scale must be at least 1, got {presence_check_scale}")
         self.morphological_functions = morphological_functions
         self.threshold = threshold
+        self.max_downscale = int(max_downscale)
+        self.refine = refine
+        self.minimal_target_size = minimal_target_size
+        self.downscale = self.max_downscale
+        self.presence_check_scale = int(presence_check_scale)
+        self.minimal_candidate_pixels = minimal_candidate_pixels
+        self.skipped_images = 0
 
-    def apply_threshold(self, image: np.ndarray, threshold=None) -> np.ndarray:
+    def __getstate__(self):
+        # copies (for example in the processes of `Vision.detect_batch`) adapt the pyramid downscale from the start
+        state = super().__getstate__()
+        state["downscale"] = state["max_downscale"]
+        return state
+
+    def apply_threshold(self, image: np.ndarray, threshold=None, color_space: ColorSpace = None) -> np.ndarray:
         """
         Gets a mask (binary image) for a given image and `Threshold` object
         (uses `self.threshold` if given threshold was none)
 
         :param image: the numpy array of the image
         :param threshold: the `Threshold` used to create the binary mask
+        :param color_space: the color space of the image, None for the threshold's default (BGR for color thresholds)
         :return: the binary mask
 
         """
         threshold = threshold or self.threshold
-        return threshold.convert(image)
+        if color_space is None:
+            return threshold.convert(image)
+        if not isinstance(threshold, Threshold):
+            # thresholds that only implement convert receive BGR images
+            return threshold.convert(convert_color_space(image, color_space, ColorSpace.BGR))
+        return threshold.convert_from(image, color_space)
+
+    def _thresholds_context(self, threshold=None) -> bool:
+        """
+        Checks if the threshold can take its image from a `FrameContext` (using `Threshold.convert_context`),
+        thresholds that are not `Threshold` objects and subclasses that override `ThresholdDetector.apply_threshold`
+        are given the BGR image through `ThresholdDetector.apply_threshold` instead
+        """
+        return isinstance(threshold or self.threshold, Threshold) and \
+            type(self).apply_threshold is ThresholdDetector.apply_threshold
+
+    def apply_threshold_context(self, context: FrameContext, threshold=None) -> np.ndarray:
+        """
+        Gets a mask (binary image) for the image of a `FrameContext`,
+        the image is converted to the threshold's color space only if it wasn't converted already
+
+        :param context: the context of the image
+        :param threshold: the `Threshold` used to create the binary mask, `self.threshold` if None
+        :return: the binary mask
+        """
+        threshold = threshold or self.threshold
+        if not self._thresholds_context(threshold):
+            return self.apply_threshold(context.bgr, threshold)
+        return threshold.convert_context(context)
 
     def find_contours_in_mask(self, mask: np.ndarray, return_hierarchy=False, apply_morphs=True) -> List[np.ndarray]:
         """
@@ -77,18 +168,149 @@ class ThresholdDetector(Detector):
             raise ValueError("Invalid output from cv2.findContours, check that your cv2 (OpenCV) version is supported")
         return (contours, hierarchy) if return_hierarchy else contours
 
-    def detect(self, image: np.ndarray, return_hierarchy=False, *args, **kwargs) -> List[np.ndarray]:
+    def detect(self, image: np.ndarray, return_hierarchy=False, *args, color_space: ColorSpace = None,
+               **kwargs) -> List[np.ndarray]:
         """
         Gets a list of all the contours within the threshold that was given
 
         :param image: image from which to get the contours
         :param return_hierarchy: if the hierarchy should be returned
+        :param color_space: the color space of the image, see `ThresholdDetector.apply_threshold`
         :return: list of all contours matching the range of hsv colours
 
         """
-        image_mask = self.apply_threshold(image)
+        return self.detect_context(FrameContext(image, color_space or ColorSpace.BGR), return_hierarchy)
+
+    def detect_context(self, context: FrameContext, return_hierarchy=False, *args, **kwargs) -> List[np.ndarray]:
+        """
+        Gets a list of all the contours within the threshold in the image of a `FrameContext`,
+        the color space conversions and downscaled copies of the image are taken from the context
+
+        :param context: the context of the image
+        :param return_hierarchy: if the hierarchy should be returned
+        :return: list of all contours matching the threshold
+        """
+        if self.presence_check_scale > 1 and not self._candidates_present(context):
+            self.skipped_images += 1
+            return ((), None) if return_hierarchy else ()
+        if self.max_downscale > 1:
+            return self._detect_pyramid(context, return_hierarchy)
+        if self.profiler is not None:
+            return self._detect_profiled(context, return_hierarchy)
+        image_mask = self.apply_threshold_context(context)
         return self.find_contours_in_mask(image_mask, return_hierarchy=return_hierarchy)
 
+    def _detect_profiled(self, context: FrameContext, return_hierarchy: bool):
+        """
+        Detects like `ThresholdDetector.detect`, timing the threshold, the morphological functions
+        and the contour finding using `self.profiler`
+        """
+        image_mask = self.profiler.time("threshold", self.apply_threshold_context, context)
+        image_mask = self.profiler.time("morphological_functions", self.apply_morphological_functions, image_mask)
+        return self.profiler.time("find_contours", self.find_contours_in_mask, image_mask,
+                                  return_hierarchy=return_hierarchy, apply_morphs=False)
+
+    def _candidates_present(self, context: FrameContext) -> bool:
+        """
+        Checks if enough pixels of a thumbnail of the image match the threshold, see the presence check
+        in `ThresholdDetector`
+        """
+        if self.profiler is not None:
+            return self.profiler.time("presence_check", self._count_candidate_pixels,
+                                      context) >= self.minimal_candidate_pixels
+        return self._count_candidate_pixels(context) >= self.minimal_candidate_pixels
+
+    def _count_candidate_pixels(self, context: FrameContext) -> int:
+        thumbnail = context.downscaled(self.presence_check_scale, PYRAMID_INTERPOLATION)
+        return cv2.countNonZero(self.apply_threshold_context(thumbnail))
+
+    def _detect_pyramid(self, context: FrameContext, return_hierarchy: bool):
+        """
+        Detects in a downscaled copy of the image, see pyramid detection in `ThresholdDetector`
+        """
+        scale = self.downscale
+        result = None
+        if scale > 1:
+            if self.profiler is None:
+                result = self._detect_downscaled(context, scale, return_hierarchy)
+            else:
+                result = self.profiler.time("pyramid", self._detect_downscaled, context, scale, return_hierarchy)
+        if result is None:
+            if self.profiler is None:
+                image_mask = self.apply_threshold_context(context)
+                result = self.find_contours_in_mask(image_mask, return_hierarchy=True)
+            else:
+                result = self._detect_profiled(context, True)
+        contours, hierarchy = result
+        self._adapt_downscale(contours)
+        return (contours, hierarchy) if return_hierarchy else contours
+
+    def _detect_downscaled(self, context: FrameContext, scale: int, return_hierarchy: bool):
+        """
+        Finds contours in the downscaled image and scales or refines them to the full resolution
+
+        :return: the contours and hierarchy, None if no contours were found
+        """
+        small_context = context.downscaled(scale, PYRAMID_INTERPOLATION)
+        # candidates are only a search region when refining, the morphological functions are applied in full resolution
+        small_contours, small_hierarchy = self.find_contours_in_mask(
+            self.apply_threshold_context(small_context), return_hierarchy=True, apply_morphs=not self.refine)
+        if len(small_contours) == 0:
+            return None
+        if not self.refine:
+            offset = scale // 2
+            return [contour * scale + offset for contour in small_contours], small_hierarchy
+        # regions of an image that was already converted (by another consumer of the context) are not converted again
+        thresholds_context = self._thresholds_context()
+        if thresholds_context:
+            threshold_color_space = self.threshold.color_space
+            converted_image = None if threshold_color_space is None else context.cached(threshold_color_space)
+            image = context.image if converted_image is None else converted_image
+        else:
+            converted_image = None
+            image = context.bgr
+        height, width = image.shape[:2]
+        mask = np.zeros((height, width), dtype=np.uint8)
+        for region in self._candidate_regions(small_contours, scale, (width, height)):
+            x, y, region_width, region_height = region
+            region_slice = (slice(y, y + region_height), slice(x, x + region_width))
+            if not thresholds_context:
+                region_mask = self.apply_threshold(image[region_slice])
+            elif converted_image is None:
+                region_mask = self.threshold.convert_from(image[region_slice], context.color_space)
+            else:
+                region_mask = self.threshold.convert_native(image[region_slice])
+            mask[region_slice] = region_mask
+        # the morphological functions are applied once to the merged mask, like when detecting in full resolution
+        return self.find_contours_in_mask(mask, return_hierarchy=True)
+
+    @staticmethod
+    def _candidate_regions(small_contours, scale: int, image_dimensions: Tuple[int, int]):
+        """
+        Yields the regions (x, y, width, height) of the full resolution image around contours
+        found in the downscaled image, padded so the full contour (and the morphological functions) fit in them
+        """
+        image_width, image_height = image_dimensions
+        padding = 2 * scale
+        for contour in small_contours:
+            x, y, width, height = cv2.boundingRect(contour)
+            left = max(x * scale - padding, 0)
+            top = max(y * scale - padding, 0)
+            right = min((x + width) * scale + padding, image_width)
+            bottom = min((y + height) * scale + padding, image_height)
+            yield left, top, right - left, bottom - top
+
+    def _adapt_downscale(self, contours: List[np.ndarray]) -> None:
+        """
+        Chooses the downscaling factor for the next image,
+        so the largest target is at least `minimal_target_size` wide and high in the downscaled image
+        """
+        if len(contours) == 0:
+            self.downscale = self.max_downscale
+            return
+        largest_size = max(min(cv2.boundingRect(contour)[2:]) for contour in contours)
+        self.downscale = min(max(largest_size // self.minimal_target_size, 1), self.max_downscale)
+
     def apply_morphological_functions(self, mask, morphological_functions=None):
         """
         Applies all morphological functions on the mask (binary images) created using the threshold,
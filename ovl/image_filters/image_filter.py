@@ -1,9 +1,15 @@
+import functools
+from typing import Collection, Dict, Union
+
 from ..partials.keyword_partial import keyword_partial
+from ..utils.color_space import ColorSpace
 
 IMAGE_FILTERS = set()
 
 
-def image_filter(image_filter_function):
+def image_filter(image_filter_function=None, *,
+                 color_spaces: Union[Collection[ColorSpace], Dict[ColorSpace, dict]] = None,
+                 output_color_space: ColorSpace = None, native_color_space: ColorSpace = None):
     """
     A decorator used to pass parameters in two stages,
     run in a python console `help(ovl.target_filter)`
@@ -43,7 +49,39 @@ def image_filter(image_filter_function):
     .. code-block:: python
 
         pipeline = Vision(image_filters=[rotate_by_angle(angle=180)]
+
+    Image filters can declare the color spaces (`ColorSpace`) they can be applied on,
+    which lets a `Vision` that tracks color spaces (track_color_space=True) skip needless color conversions.
+    color_spaces maps every color space the filter accepts to the keyword arguments
+    that tell the filter its image is in that color space (or is a list of color spaces that need no arguments),
+    filters that declare no color spaces are applied on BGR images,
+    filters that convert the image to another color space declare it as output_color_space,
+    and filters that convert the image internally (and back) declare the color space they work in
+    as native_color_space.
+
+    .. code-block:: python
+
+        @image_filter(color_spaces={ovl.ColorSpace.BGR: {}, ovl.ColorSpace.HSV: {"hsv": True}},
+                      native_color_space=ovl.ColorSpace.HSV)
+        def brighten(image, hsv=False):
+            ...
+
+        @image_filter(color_spaces=ovl.ALL_COLOR_SPACES)
+        def flip(image):
+            return cv2.flip(image, 1)
+
     """
+    if image_filter_function is None:
+        return functools.partial(image_filter, color_spaces=color_spaces, output_color_space=output_color_space,
+                                 native_color_space=native_color_space)
+    if color_spaces is not None:
+        if not isinstance(color_spaces, dict):
+            color_spaces = {color_space: {} for color_space in color_spaces}
+        image_filter_function.color_spaces = color_spaces
+    if output_color_space is not None:
+        image_filter_function.output_color_space = output_color_space
+    if native_color_space is not None:
+        image_filter_function.native_color_space = native_color_space
     filter_partial = keyword_partial(image_filter_function)
     IMAGE_FILTERS.add(filter_partial)
     return filter_partial
@@ -5,6 +5,8 @@ import numpy as np
 
 from .image_filter import image_filter
 from .kernels import sharpening_kernel
+from ..camera.camera_calibration import cached_undistortion_maps
+from ..utils.color_space import ColorSpace, ALL_COLOR_SPACES
 from ..utils.constants import DEFAULT_KERNEL_SIZE
 from ..utils.types import RangedNumber
 
@@ -19,7 +21,7 @@ def convert_to_hsv(image: np.ndarray) -> np.ndarray:
     return cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
 
 
-@image_filter
+@image_filter(color_spaces=(ColorSpace.BGR, ColorSpace.GRAY))
 def sharpen_image(image: np.ndarray, size: tuple = DEFAULT_KERNEL_SIZE) -> np.ndarray:
     """
     Sharpens an image by preforming convolution it with a sharpening matrix
@@ -33,7 +35,8 @@ def sharpen_image(image: np.ndarray, size: tuple = DEFAULT_KERNEL_SIZE) -> np.nd
     return cv2.filter2D(image, -1, kernel)
 
 
-@image_filter
+@image_filter(color_spaces={ColorSpace.BGR: {}, ColorSpace.HSV: {"hsv": True}},
+              native_color_space=ColorSpace.HSV)
 def adaptive_brightness(image: np.ndarray, brightness: RangedNumber(0, 100) = 50, hsv: bool = False) -> np.ndarray:
     """
     Changes the brightness of every pixel so that the average brightness of the image is the target brightness
@@ -57,7 +60,8 @@ def adaptive_brightness(image: np.ndarray, brightness: RangedNumber(0, 100) = 50
     return image
 
 
-@image_filter
+@image_filter(color_spaces={ColorSpace.BGR: {}, ColorSpace.HSV: {"hsv_image": True}},
+              native_color_space=ColorSpace.HSV)
 def change_brightness(image: np.ndarray, change: float = 25, hsv_image: bool = False) -> np.ndarray:
     """
     Changes the brightness of every pixel of a BGR image by the given amount
@@ -93,7 +97,7 @@ def _rotate_shortcut(image, shortcut_angle):
     return cv2.warpAffine(image, rotation_matrix, (height, width))
 
 
-@image_filter
+@image_filter(color_spaces=(ColorSpace.BGR, ColorSpace.GRAY))
 def rotate_image(image: np.ndarray, angle: int = 180) -> np.ndarray:
     """
     Rotates an image by a given amount of degrees.
@@ -168,7 +172,7 @@ def non_local_mean_denoising(image, h=10, hColor=None, template_window_size=None
                                            searchWindowSize=search_window_size)
 
 
-@image_filter
+@image_filter(color_spaces=(ColorSpace.BGR, ColorSpace.GRAY))
 def gaussian_blur(image, kernel_size=DEFAULT_KERNEL_SIZE, sigma_x=5, sigma_y=None, border_type=None, destination=None):
     """
     An image filter version of cv2.gaussianBlur.
@@ -201,7 +205,7 @@ def gaussian_blur(image, kernel_size=DEFAULT_KERNEL_SIZE, sigma_x=5, sigma_y=Non
                             borderType=border_type)
 
 
-@image_filter
+@image_filter(color_spaces=ALL_COLOR_SPACES)
 def crop_image(image, point: Tuple[int, int], dimensions: Tuple[int, int]):
     """
     Crops a given rectangle from a given image, this can be used to "cut out"
@@ -220,7 +224,7 @@ def crop_image(image, point: Tuple[int, int], dimensions: Tuple[int, int]):
     return image[x: x + width, y: y + height]
 
 
-@image_filter
+@image_filter(color_spaces=(ColorSpace.BGR, ColorSpace.GRAY))
 def undistort(image, camera_matrix, distortion_coefficients, destination=None, new_camera_matrix=None):
     """
     Using calculated camera matrix and distortion coefficients can be used to remove distortions caused
@@ -236,6 +240,10 @@ def undistort(image, camera_matrix, distortion_coefficients, destination=None, n
     :param destination: the image the result should be saved in, None if just return
     :param new_camera_matrix: the new optimal camera matrix .
     :return: the undistorted image
+
+    The undistortion maps are built once for every calibration and image size and reused for later images,
+    which makes undistorting several times faster than `cv2.undistort`.
     """
-    return cv2.undistort(image, camera_matrix, distortion_coefficients, dst=destination,
-                         newCameraMatrix=new_camera_matrix)
+    height, width = image.shape[:2]
+    map1, map2 = cached_undistortion_maps(camera_matrix, distortion_coefficients, new_camera_matrix, (width, height))
+    return cv2.remap(image, map1, map2, cv2.INTER_LINEAR, dst=destination)
@@ -1,9 +1,32 @@
 import functools
+import importlib
+
+_MISSING = object()
+
+
+def _resolve_function(module_name: str, qualified_name: str, unwrap: bool):
+    """
+    Finds a function by its module and qualified name, used to unpickle partials of decorated functions
+    """
+    function = functools.reduce(getattr, qualified_name.split("."), importlib.import_module(module_name))
+    return function.__wrapped__ if unwrap else function
+
+
+def _rebuild_partial(partial_type, module_name, qualified_name, unwrap, args, keywords, wrapper, state):
+    function = _resolve_function(module_name, qualified_name, unwrap)
+    partial_function = partial_type(function, *args, **keywords)
+    if wrapper:
+        functools.update_wrapper(partial_function, function)
+    partial_function.__dict__.update(state)
+    return partial_function
 
 
 class ReversePartial(functools.partial):
     """
      A keyword_partial that passes the call arguments before the loaded (passed in constructor) arguments
+
+     Loaded filters can be pickled (in order to send a Vision to other processes) even though the name of
+     the loaded function refers to its decorated version (the argument loader).
     """
     def __call__(*args, **keywords):
         if not args:
@@ -12,3 +35,25 @@ class ReversePartial(functools.partial):
         new_keyword_arguments = self.keywords.copy()
         new_keyword_arguments.update(keywords)
         return self.func(*args, *self.args, **new_keyword_arguments)
+
+    def __reduce__(self):
+        function = self.func
+        module_name = getattr(function, "__module__", None)
+        qualified_name = getattr(function, "__qualname__", "")
+        try:
+            named_function = _resolve_function(module_name, qualified_name, unwrap=False)
+        except (ImportError, AttributeError, TypeError, ValueError):
+            return super().__reduce__()
+        if named_function is function:
+            unwrap = False
+        elif getattr(named_function, "__wrapped__", None) is function:
+            unwrap = True
+        else:
+            return super().__reduce__()
+        # partials created by keyword_partial copy the attributes of the function, they are copied again when unpickled
+        wrapper = self.__dict__.get("__wrapped__") is function
+        state = {key: value for key, value in self.__dict__.items()
+                 if not (wrapper and (key in functools.WRAPPER_ASSIGNMENTS or key == "__wrapped__" or
+                                      function.__dict__.get(key, _MISSING) is value))}
+        return _rebuild_partial, (type(self), module_name, qualified_name, unwrap, self.args, self.keywords,
+                                  wrapper, state)
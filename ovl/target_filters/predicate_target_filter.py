@@ -38,5 +38,8 @@ def predicate_target_filter(target_filter):
     def argument_loader(*args, **kwargs):
         condition = ReversePartial(target_filter, *args, **kwargs)
         argument_loader.condition = condition
-        return functools.partial(_loaded_condition, condition)
+        loaded_filter = functools.partial(_loaded_condition, condition)
+        # named after the contour filter instead of _loaded_condition, see get_function_name
+        loaded_filter.__name__ = target_filter.__name__
+        return loaded_filter
     return argument_loader
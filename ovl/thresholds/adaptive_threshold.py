@@ -0,0 +1,134 @@
+import cv2
+import numpy as np
+
+from .threshold import Threshold
+from ..utils.color_space import ColorSpace
+from ..utils.constants import DEFAULT_ADAPTIVE_WINDOW_SIZE, DEFAULT_ADAPTIVE_OFFSET
+
+
+def _window_lengths(length: int, window_size: int) -> np.ndarray:
+    """
+    Returns the length of the window around every position, clipped to the image
+    """
+    positions = np.arange(length)
+    half_window = window_size // 2
+    return np.minimum(positions + (window_size - half_window), length) - np.maximum(positions - half_window, 0)
+
+
+def local_means(image: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Calculates the mean of the window around every pixel of a single channel image using an integral image,
+    so the cost per pixel doesn't depend on the size of the window.
+    Windows are clipped to the image, the mean of a pixel near the edge is the mean of the part inside the image.
+
+    :param image: a single channel image
+    :param window_size: the width and height of the window
+    :return: the mean of every pixel's window (float32)
+    """
+    height, width = image.shape[:2]
+    half_window = window_size // 2
+    # the integral image holds the sum of every rectangle starting at the top left corner, it is 1 larger than the image
+    integral = cv2.integral(image, sdepth=cv2.CV_32S if image.dtype == np.uint8 else cv2.CV_64F)
+    # repeating the edges of the integral image clips the windows to the image, so every window sum is a slice
+    integral = cv2.copyMakeBorder(integral, half_window, window_size - half_window, half_window,
+                                  window_size - half_window, cv2.BORDER_REPLICATE)
+    row_sums = cv2.subtract(integral[window_size:window_size + height], integral[:height])
+    means = cv2.subtract(row_sums[:, window_size:window_size + width], row_sums[:, :width], dtype=cv2.CV_32F)
+    # dividing by the area of every window, one axis at a time
+    means *= (1 / _window_lengths(height, window_size)).astype(np.float32)[:, np.newaxis]
+    means *= (1 / _window_lengths(width, window_size)).astype(np.float32)
+    return means
+
+
+class AdaptiveThreshold(Threshold):
+    """
+    AdaptiveThreshold creates a binary image (mask) of the pixels that are brighter than the area around them,
+    instead of comparing every pixel to one global value like `BinaryThreshold`,
+    which makes it work under uneven lighting (shadows, spotlights, vignetting).
+
+    A pixel matches if it is brighter than the mean of the window around it minus the offset
+    (or not brighter, when inverted). The means are calculated using an integral image,
+    so the cost doesn't depend on the size of the window.
+
+    .. code-block:: python
+
+        threshold = ovl.AdaptiveThreshold(window_size=51, offset=10)
+        vision = ovl.Vision(threshold=threshold, target_filters=[ovl.area_filter(min_area=200)])
+
+    The means change slowly across the image, so they can be calculated in an image downscaled by a factor
+    and scaled back to the full resolution, while the pixels are still compared in the full resolution:
+
+    .. code-block:: python
+
+        threshold = ovl.AdaptiveThreshold(window_size=51, offset=10, downscale=4)
+
+    AdaptiveThreshold works on greyscale images, BGR images are converted to greyscale.
+    """
+
+    color_space = ColorSpace.GRAY
+
+    def __init__(self, window_size: int = DEFAULT_ADAPTIVE_WINDOW_SIZE, offset: float = DEFAULT_ADAPTIVE_OFFSET,
+                 inverted: bool = False, downscale: int = 1):
+        """
+        :param window_size: the width and height (in pixels of the full resolution image) of the area
+         every pixel is compared to
+        :param offset: the amount a pixel can be darker than the mean of its window and still match,
+         negative values require pixels to be brighter than the mean by the offset
+        :param inverted: if the pixels that are not brighter than the mean (minus the offset) should match instead
+        :param downscale: the factor the image is downscaled by before calculating the means, 1 to calculate them
+         in the full resolution
+        """
+        if window_size < 1:
+            raise ValueError(f"The window size must be at least 1, got {window_size}")
+        if downscale < 1:
+            raise ValueError(f"The downscale must be at least 1, got {downscale}")
+        self.window_size = int(window_size)
+        self.offset = offset
+        self.inverted = inverted
+        self.downscale = int(downscale)
+
+    def means(self, image: np.ndarray) -> np.ndarray:
+        """
+        Calculates the mean of the window around every pixel of a greyscale image,
+        in a downscaled copy of the image if downscale is larger than 1
+
+        :param image: a greyscale image
+        :return: the mean of every pixel's window (float32), in the size of the image
+        """
+        if self.downscale == 1:
+            return local_means(image, self.window_size)
+        height, width = image.shape[:2]
+        small_image = cv2.resize(image, (max(width // self.downscale, 1), max(height // self.downscale, 1)),
+                                 interpolation=cv2.INTER_AREA)
+        small_means = local_means(small_image, max(self.window_size // self.downscale, 1))
+        return cv2.resize(small_means, (width, height), interpolation=cv2.INTER_LINEAR)
+
+    def convert_native(self, image: np.ndarray) -> np.ndarray:
+        """
+        Thresholds a greyscale image
+
+        :param image: a greyscale image
+        :return: binary mask
+        """
+        thresholds = self.means(image)
+        thresholds -= self.offset
+        comparison = cv2.CMP_LE if self.inverted else cv2.CMP_GT
+        return cv2.compare(image.astype(np.float32), thresholds, comparison)
+
+    def convert(self, image: np.ndarray) -> np.ndarray:
+        """
+        Thresholds a BGR (or greyscale) image
+
+        :param image: a BGR or greyscale image
+        :return: binary mask
+        """
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return self.convert_native(image)
+
+    def validate(self, *args, **kwargs) -> bool:
+        return self.window_size >= 1 and self.downscale >= 1
+
+    def __repr__(self):
+        return f"AdaptiveThreshold(window_size={self.window_size}, offset={self.offset}, inverted={self.inverted}, " \
+               f"downscale={self.downscale})"
@@ -32,6 +32,7 @@ class BinaryThreshold(Threshold):
     For more information about the algorithms used:
     https://docs.opencv.org/trunk/d7/d4d/tutorial_py_thresholding.html
     """
+    color_space = None
 
     def __init__(self, threshold: int = None, upper_bound: int = None,
                  threshold_type: Union[BinaryThresholdType, int] = BinaryThresholdType.Binary,
@@ -55,9 +56,14 @@ class BinaryThreshold(Threshold):
         """
         Converts a greyscale image to a binary image using Binary thresholding.
         :param image: an opened image (numpy ndarray)
-        :return:
+        :return: binary mask
         """
-        return cv2.threshold(image, self.threshold, self.upper_bound, self.threshold_type)
+        if self.otsu:
+            # the threshold is chosen by otsu binarization
+            _, mask = cv2.threshold(image, 0, self.upper_bound, self.threshold_type + cv2.THRESH_OTSU)
+        else:
+            _, mask = cv2.threshold(image, self.threshold, self.upper_bound, self.threshold_type)
+        return mask
 
     def validate(self, *args, **kwargs) -> bool:
         """
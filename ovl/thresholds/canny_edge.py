@@ -13,6 +13,7 @@ class CannyEdge(Threshold):
     See:
     https://opencv-python-tutroals.readthedocs.io/en/latest/py_tutorials/py_imgproc/py_canny/py_canny.html
     """
+    color_space = None
 
     def __init__(self, low: int, high: int, aperture_size: int = None, l2_gradient: bool = None):
         self.low = low
@@ -30,9 +30,20 @@ class HSV(Threshold, enum.Enum):
     def convert(self, image):
         return self.value.convert(image)
 
+    def convert_native(self, image):
+        return self.value.convert_native(image)
+
+    @property
+    def color_space(self):
+        return self.value.color_space
+
     def validate(self, *args, **kwargs) -> bool:
         return self.value.validate(*args, **kwargs)
 
+    def __reduce_ex__(self, protocol):
+        # colors are pickled by name, their values (Color objects) can't be used to look them up
+        return getattr, (self.__class__, self.name)
+
     red = MultiColor([RED_HIGH_HSV, RED_LOW_HSV])
     orange = Color([9, 50, 50], [21, 255, 255])
     yellow = Color([24, 50, 50], [34, 255, 255])
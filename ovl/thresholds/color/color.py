@@ -1,12 +1,29 @@
+import threading
 from typing import *
 
 import cv2
 import numpy as np
 
 from ..threshold import Threshold
+from ...utils.color_space import ColorSpace
 
 BaseForColor = NewType("BaseForColor", Union[int, Tuple[Tuple[int, int, int], Tuple[int, int, int]]])
 SERIALIZED_COLOR_KEYS = {"high", "low"}
+MAX_HUE = 179
+_scratch_masks = threading.local()
+
+
+def scratch_mask(shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Returns a mask of the given shape that is reused by every call in the current thread,
+    used to hold intermediate masks when combining color ranges
+
+    :param shape: the (height, width) of the mask
+    """
+    mask = getattr(_scratch_masks, "mask", None)
+    if mask is None or mask.shape != shape:
+        mask = _scratch_masks.mask = np.empty(shape, dtype=np.uint8)
+    return mask
 
 
 def validate(value, ceiling):
@@ -68,17 +85,27 @@ class Color(Threshold):
         high_range = [45, 255, 255]
         color = ovl.Color(low_range, high_range)
 
+    A low hue that is greater than the high hue is a range that wraps around from 179 to 0,
+    for example red:
+
+    .. code-block:: python
+
+        red = ovl.Color([170, 100, 100], [15, 255, 255])
+
 
 
     `Color` can be passed to a `Vision` to threshold binary images
     Threshold object can be used by themselves using the `color.convert()` method.
 
-    NOTE: Threshold objects automatically convert images to HSV (From the default BGR)
+    NOTE: Threshold objects automatically convert images to HSV (From the default BGR),
+    `Color.threshold` (and `Color.convert_native`) threshold images that are already in HSV
 
     There are multiple built-in "battery included" pre-made color object
     for instant use in testing and tuning look at the `HSV` or more information
     """
 
+    color_space = ColorSpace.HSV
+
     def validate(self, *args, **kwargs):
         return assert_hsv(self.low_bound) and assert_hsv(self.high_bound)
 
@@ -98,9 +125,49 @@ class Color(Threshold):
         high = _range_assemble(high, [255, 255])
         self.__low_bound = np.array(low)
         self.__high_bound = np.array(high)
+        if self.wraps:
+            # the range is split into [low hue, 179] and [0, high hue]
+            self._upper_hue_range = (self.__low_bound, np.array([MAX_HUE, *high[1:]]))
+            self._lower_hue_range = (np.array([0, *low[1:]]), self.__high_bound)
+
+    @property
+    def hsv_ranges(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        The (low, high) ranges thresholded by `cv2.inRange`, 2 ranges if the hue range wraps around
+        """
+        if self.wraps:
+            return [self._upper_hue_range, self._lower_hue_range]
+        return [(self.__low_bound, self.__high_bound)]
 
-    def threshold(self, image: np.ndarray) -> np.ndarray:
-        return cv2.inRange(image, self.low, self.high)
+    @property
+    def wraps(self) -> bool:
+        """
+        True if the hue range wraps around from 179 to 0 (the low hue is greater than the high hue)
+        """
+        return self.__low_bound[0] > self.__high_bound[0]
+
+    def threshold(self, image: np.ndarray, destination: np.ndarray = None) -> np.ndarray:
+        """
+        Thresholds an HSV image
+
+        :param image: an HSV image
+        :param destination: the mask the result should be saved in, None to allocate a new mask
+        :return: binary mask
+        """
+        if not self.wraps:
+            return cv2.inRange(image, self.low, self.high, dst=destination)
+        mask = cv2.inRange(image, *self._upper_hue_range, dst=destination)
+        lower_hue_mask = cv2.inRange(image, *self._lower_hue_range, dst=scratch_mask(mask.shape))
+        return cv2.bitwise_or(mask, lower_hue_mask, dst=mask)
+
+    def convert_native(self, image: np.ndarray) -> np.ndarray:
+        """
+        Thresholds an HSV image and returns the binary mask
+
+        :param image: an HSV image
+        :return: binary mask
+        """
+        return self.threshold(image)
 
     def convert(self, image: np.ndarray) -> np.ndarray:
         """
@@ -1,8 +1,93 @@
+from typing import List, Tuple, Union
+
 import cv2
 import numpy as np
 
-from .color import Color
+from .color import Color, MAX_HUE, scratch_mask
 from ..threshold import Threshold
+from ...utils.color_space import ColorSpace
+
+HUES = MAX_HUE + 1
+
+
+def _merge_hue_ranges(first: Tuple[int, int], second: Tuple[int, int]) -> Union[Tuple[int, int], None]:
+    """
+    Merges 2 hue ranges (that can wrap around from 179 to 0) if together they are a single range
+
+    :return: the merged (low, high) hue range, None if the ranges don't overlap and aren't adjacent
+    """
+    hues = np.zeros(HUES, dtype=bool)
+    for low, high in (first, second):
+        if low <= high:
+            hues[low:high + 1] = True
+        else:
+            hues[low:] = True
+            hues[:high + 1] = True
+    if hues.all():
+        return 0, MAX_HUE
+    # the merged range starts after a missing hue and must end at the next missing hue
+    starts = np.flatnonzero(hues & ~np.roll(hues, 1))
+    if len(starts) != 1:
+        return None
+    low = int(starts[0])
+    high = int(np.flatnonzero(hues & ~np.roll(hues, -1))[0])
+    return low, high
+
+
+def _merge_linear_ranges(first: Tuple[int, int], second: Tuple[int, int]) -> Union[Tuple[int, int], None]:
+    if max(first[0], second[0]) > min(first[1], second[1]) + 1:
+        return None
+    return min(first[0], second[0]), max(first[1], second[1])
+
+
+def _merge_colors(first: Color, second: Color) -> Union[Color, None]:
+    """
+    Merges 2 colors into a single color if they differ only in one of hue, saturation or value
+    and their ranges in it overlap or are adjacent
+
+    :return: the merged color, None if the colors can't be merged
+    """
+    first_ranges = list(zip(first.low_bound, first.high_bound))
+    second_ranges = list(zip(second.low_bound, second.high_bound))
+    different_channels = [channel for channel in range(3) if first_ranges[channel] != second_ranges[channel]]
+    if len(different_channels) == 0:
+        return first
+    if len(different_channels) > 1:
+        return None
+    channel, = different_channels
+    merge = _merge_hue_ranges if channel == 0 else _merge_linear_ranges
+    merged_range = merge(first_ranges[channel], second_ranges[channel])
+    if merged_range is None:
+        return None
+    merged_ranges = first_ranges
+    merged_ranges[channel] = merged_range
+    low, high = zip(*merged_ranges)
+    return Color(list(low), list(high))
+
+
+def merge_colors(colors: List[Color]) -> List[Color]:
+    """
+    Merges colors that overlap or are adjacent into single colors, so less ranges need to be thresholded.
+    Colors are merged only if the merged color contains exactly the same pixels as the original colors.
+
+    :param colors: the colors to merge
+    :return: the merged colors
+    """
+    merged_colors = list(colors)
+    merged = True
+    while merged:
+        merged = False
+        for first_index in range(len(merged_colors)):
+            for second_index in range(first_index + 1, len(merged_colors)):
+                merged_color = _merge_colors(merged_colors[first_index], merged_colors[second_index])
+                if merged_color is not None:
+                    merged_colors[first_index] = merged_color
+                    del merged_colors[second_index]
+                    merged = True
+                    break
+            if merged:
+                break
+    return merged_colors
 
 
 class MultiColor(Threshold):
@@ -36,8 +121,15 @@ class MultiColor(Threshold):
       White: [0, 0, 200], [179, 20, 255]
       Teal: [110, 100, 100], [130, 255, 255]
       Purple: [135, 100, 100], [165, 255, 255]
+
+    Colors that overlap or are adjacent are merged into a single range
+    (for example the low and high red ranges are merged into a single range that wraps around),
+    and all the ranges are thresholded into a single mask.
+    The colors are merged again whenever the list of colors changes (set or modified in place).
     """
 
+    color_space = ColorSpace.HSV
+
     def __init__(self, colors):
         """
         Example:
@@ -53,9 +145,28 @@ class MultiColor(Threshold):
 
          """
         self.colors = colors
-        for index, color in enumerate(colors):
-            if type(color) in (list, tuple):
-                self.colors[index] = Color(*color)
+
+    @property
+    def colors(self) -> List[Color]:
+        return self._colors
+
+    @colors.setter
+    def colors(self, colors):
+        if colors is not None:
+            colors = [Color(*color) if type(color) in (list, tuple) else color for color in colors]
+        self._colors = colors
+        self._ranges_key = None
+        self._ranges = None
+
+    def _color_ranges(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        The (low, high) HSV ranges of the merged colors, merged again only if the colors changed
+        """
+        ranges_key = tuple(self._colors)
+        if ranges_key != self._ranges_key:
+            self._ranges = [hsv_range for color in merge_colors(self._colors) for hsv_range in color.hsv_ranges]
+            self._ranges_key = ranges_key
+        return self._ranges
 
     def convert(self, image: np.ndarray):
         """
@@ -63,16 +174,24 @@ class MultiColor(Threshold):
         all pixels that are not in the color ranges defined are set to black (0, 0, 0)
         and all others to white (255, 255, 255)
         """
+        return self.convert_native(cv2.cvtColor(image, cv2.COLOR_BGR2HSV))
+
+    def convert_native(self, hsv_image: np.ndarray):
+        """
+        Thresholds an HSV image using the color ranges, see `MultiColor.convert`
+        """
         if self.colors is None:
             raise ValueError("Cannot convert an image to a binary, no colors given.")
         if len(self.colors) == 0:
             raise ValueError("Cannot convert an image to binary, no colors given.")
-        hsv_image = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        binary_image = self.colors[0].threshold(hsv_image)
-        if len(self.colors) < 1:
+        ranges = self._color_ranges()
+        binary_image = cv2.inRange(hsv_image, *ranges[0])
+        if len(ranges) == 1:
             return binary_image
-        for color in self.colors[1:]:
-            binary_image = cv2.bitwise_or(binary_image, color.threshold(hsv_image))
+        range_mask = scratch_mask(binary_image.shape)
+        for low, high in ranges[1:]:
+            cv2.inRange(hsv_image, low, high, dst=range_mask)
+            cv2.bitwise_or(binary_image, range_mask, dst=binary_image)
 
         return binary_image
 
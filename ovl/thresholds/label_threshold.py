@@ -0,0 +1,99 @@
+from typing import Dict, Hashable, List, Sequence, Union
+
+import cv2
+import numpy as np
+
+from .lookup_table_threshold import cached_label_lookup_table, lookup, supports_lookup, MAX_LABELS
+from .threshold import Threshold
+from ..utils.color_space import ColorSpace
+
+
+class LabelThreshold(Threshold):
+    """
+    LabelThreshold segments several classes of colors in a single pass over the image,
+    every pixel is mapped to the label of the class it matches using a lookup table of every BGR color,
+    instead of converting and thresholding the image once per class.
+
+    The result is a label image: 0 for pixels that match no class, 1 for the first class, 2 for the second etc.
+    (a pixel that matches several classes gets the label of the first of them).
+
+    .. code-block:: python
+
+        threshold = ovl.LabelThreshold({"cone": ovl.HSV.yellow, "cube": ovl.Color([120, 100, 100], [150, 255, 255])})
+        labels = threshold.convert(image)
+        cone_mask = threshold.class_mask(labels, "cone")
+
+    `MultiClassThresholdDetector` uses a LabelThreshold to find the contours of every class.
+    When used as the threshold of a `ThresholdDetector` the contours of pixels of any class are found.
+
+    The lookup table is created from the thresholds of the classes the first time an image is thresholded,
+    see `LookupTableThreshold` for more information.
+    """
+
+    color_space = ColorSpace.BGR
+
+    def __init__(self, classes: Union[Dict[Hashable, Threshold], Sequence[Threshold]]):
+        """
+        :param classes: the thresholds of the classes, either a dictionary of class name to threshold
+         or a list of thresholds (the class names are then their positions in the list)
+        """
+        if not isinstance(classes, dict):
+            classes = dict(enumerate(classes))
+        if not 0 < len(classes) <= MAX_LABELS:
+            raise ValueError(f"LabelThreshold supports 1 to {MAX_LABELS} classes, got {len(classes)}")
+        self.class_names: List[Hashable] = list(classes)
+        self.thresholds: List[Threshold] = list(classes.values())
+        self._lookup_table: Union[np.ndarray, None] = None
+
+    @property
+    def lookup_table(self) -> np.ndarray:
+        """
+        The label of every BGR color, built on first use (see `build_label_lookup_table`)
+        """
+        if self._lookup_table is None:
+            self._lookup_table = cached_label_lookup_table(self.thresholds)
+        return self._lookup_table
+
+    def label(self, class_name: Hashable) -> int:
+        """
+        Returns the label of a class in the label image
+        """
+        return self.class_names.index(class_name) + 1
+
+    def convert(self, image: np.ndarray) -> np.ndarray:
+        """
+        Creates the label image of a BGR image
+
+        :param image: a BGR image
+        :return: the label image, a uint8 image of the label of every pixel
+        """
+        if supports_lookup(image):
+            return lookup(self.lookup_table, image)
+        labels = np.zeros(image.shape[:2], dtype=np.uint8)
+        for label in range(len(self.thresholds), 0, -1):
+            labels[self.thresholds[label - 1].convert(image) != 0] = label
+        return labels
+
+    def class_mask(self, labels: np.ndarray, class_name: Hashable) -> np.ndarray:
+        """
+        Returns the binary mask of the pixels of a class
+
+        :param labels: a label image created by `LabelThreshold.convert`
+        :param class_name: the name of the class
+        :return: binary mask
+        """
+        return cv2.compare(labels, self.label(class_name), cv2.CMP_EQ)
+
+    def validate(self, *args, **kwargs) -> bool:
+        return all(threshold.validate(*args, **kwargs) for threshold in self.thresholds)
+
+    def __getstate__(self):
+        # the lookup table is built again instead of being copied (for example to other processes)
+        state = self.__dict__.copy()
+        state["_lookup_table"] = None
+        return state
+
+    def __repr__(self):
+        classes = ", ".join(f"{class_name!r}: {threshold!r}"
+                            for class_name, threshold in zip(self.class_names, self.thresholds))
+        return f"LabelThreshold({{{classes}}})"
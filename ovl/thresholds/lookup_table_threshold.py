@@ -0,0 +1,204 @@
+import sys
+import threading
+from typing import Callable, Dict, Hashable, Iterator, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .color.built_in_colors import HSV
+from .color.color import Color
+from .color.multi_color import MultiColor
+from .threshold import Threshold
+from ..utils.color_space import ColorSpace
+
+BGR_COLORS = 1 << 24
+LOOKUP_TABLE_BUILD_CHUNK = 1 << 20
+MAX_CACHED_LOOKUP_TABLES = 4
+MAX_LABELS = 255
+_lookup_tables_cache: Dict[Hashable, np.ndarray] = {}
+_lookup_tables_lock = threading.Lock()
+
+
+def _threshold_key(threshold: Threshold) -> Union[Hashable, None]:
+    """
+    Returns a key that is equal for thresholds that create the same masks, None if it is unknown
+    """
+    if isinstance(threshold, HSV):
+        return _threshold_key(threshold.value)
+    if isinstance(threshold, Color):
+        return "color", tuple(threshold.low_bound), tuple(threshold.high_bound)
+    if isinstance(threshold, MultiColor):
+        color_keys = tuple(_threshold_key(color) for color in threshold.colors)
+        return None if None in color_keys else ("multi_color", color_keys)
+    return None
+
+
+def _bgr_color_chunks() -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yields all the BGR colors in chunks of images (a column of LOOKUP_TABLE_BUILD_CHUNK pixels),
+    along with the index of the first color of the chunk in a lookup table
+    """
+    for start in range(0, BGR_COLORS, LOOKUP_TABLE_BUILD_CHUNK):
+        colors = np.arange(start, start + LOOKUP_TABLE_BUILD_CHUNK, dtype=np.uint32)
+        bgr_colors = np.empty((LOOKUP_TABLE_BUILD_CHUNK, 1, 3), dtype=np.uint8)
+        bgr_colors[:, 0, 0] = colors & 0xFF
+        bgr_colors[:, 0, 1] = (colors >> 8) & 0xFF
+        bgr_colors[:, 0, 2] = colors >> 16
+        yield start, bgr_colors
+
+
+def build_lookup_table(threshold: Threshold) -> np.ndarray:
+    """
+    Creates the mask value of every BGR color for a threshold, by thresholding an image of all the BGR colors.
+    The value of the color (b, g, r) is at b | g << 8 | r << 16.
+
+    :param threshold: a threshold of BGR images (any threshold whose `Threshold.convert` receives BGR images)
+    :return: the lookup table, a uint8 array of 2 ** 24 mask values
+    """
+    lookup_table = np.empty(BGR_COLORS, dtype=np.uint8)
+    for start, bgr_colors in _bgr_color_chunks():
+        lookup_table[start:start + LOOKUP_TABLE_BUILD_CHUNK] = threshold.convert(bgr_colors).reshape(-1)
+    return lookup_table
+
+
+def build_label_lookup_table(thresholds: Sequence[Threshold]) -> np.ndarray:
+    """
+    Creates the label of every BGR color for a list of thresholds, the label of a color is the position
+    of the first threshold it matches plus 1, or 0 if it matches none of them.
+    The label of the color (b, g, r) is at b | g << 8 | r << 16.
+
+    :param thresholds: thresholds of BGR images, at most 255
+    :return: the lookup table, a uint8 array of 2 ** 24 labels
+    """
+    if len(thresholds) > MAX_LABELS:
+        raise ValueError(f"A label lookup table supports at most {MAX_LABELS} thresholds, got {len(thresholds)}")
+    lookup_table = np.empty(BGR_COLORS, dtype=np.uint8)
+    for start, bgr_colors in _bgr_color_chunks():
+        labels = np.zeros(LOOKUP_TABLE_BUILD_CHUNK, dtype=np.uint8)
+        # thresholds are applied from last to first, so the first matching threshold sets the label
+        for label, threshold in reversed(list(enumerate(thresholds, start=1))):
+            labels[threshold.convert(bgr_colors).reshape(-1) != 0] = label
+        lookup_table[start:start + LOOKUP_TABLE_BUILD_CHUNK] = labels
+    return lookup_table
+
+
+def _cached_table(key: Union[Hashable, None], build: Callable[..., np.ndarray], *args) -> np.ndarray:
+    """
+    Returns the lookup table cached by the key, building (and caching) it if it is not cached
+    """
+    if key is None:
+        return build(*args)
+    with _lookup_tables_lock:
+        lookup_table = _lookup_tables_cache.get(key)
+        if lookup_table is None:
+            if len(_lookup_tables_cache) >= MAX_CACHED_LOOKUP_TABLES:
+                _lookup_tables_cache.pop(next(iter(_lookup_tables_cache)))
+            lookup_table = build(*args)
+            _lookup_tables_cache[key] = lookup_table
+    return lookup_table
+
+
+def cached_lookup_table(threshold: Threshold) -> np.ndarray:
+    """
+    Returns the lookup table of a threshold, color thresholds with the same ranges
+    (like the built-in `HSV` colors) share their lookup table, which is built on first use.
+
+    See `build_lookup_table` for more information
+    """
+    return _cached_table(_threshold_key(threshold), build_lookup_table, threshold)
+
+
+def cached_label_lookup_table(thresholds: Sequence[Threshold]) -> np.ndarray:
+    """
+    Returns the label lookup table of a list of thresholds, built on first use.
+
+    See `build_label_lookup_table` for more information
+    """
+    threshold_keys = tuple(_threshold_key(threshold) for threshold in thresholds)
+    key = None if None in threshold_keys else ("labels", threshold_keys)
+    return _cached_table(key, build_label_lookup_table, thresholds)
+
+
+def supports_lookup(image: np.ndarray) -> bool:
+    """
+    Checks if the values of the pixels of an image can be read from a lookup table using `lookup`
+    """
+    return sys.byteorder == "little" and image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3
+
+
+def lookup(lookup_table: np.ndarray, image: np.ndarray) -> np.ndarray:
+    """
+    Reads the value of every pixel of a BGR image from a lookup table of every BGR color,
+    see `supports_lookup` for the supported images
+
+    :param lookup_table: the value of every BGR color, the value of (b, g, r) is at b | g << 8 | r << 16
+    :param image: a BGR image
+    :return: an image of the values of the pixels
+    """
+    # every pixel padded to 4 bytes is read as the little endian number b | g << 8 | r << 16 | a << 24
+    colors = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA).view(np.uint32)[..., 0]
+    colors &= 0xFFFFFF
+    return np.take(lookup_table, colors)
+
+
+class LookupTableThreshold(Threshold):
+    """
+    LookupTableThreshold thresholds BGR images using a precomputed lookup table of the mask value of every BGR color,
+    instead of converting the image to another color space (like HSV) and thresholding it.
+
+    The lookup table is created from another threshold (`Color`, `MultiColor`, the built-in `HSV` colors or any
+    threshold of BGR images) the first time an image is thresholded and the masks are identical to its masks.
+
+    .. code-block:: python
+
+        threshold = ovl.LookupTableThreshold(ovl.MultiColor([orange, green, blue]))
+        vision = ovl.Vision(threshold=threshold, ...)
+
+    The cost of thresholding does not depend on the amount of color ranges,
+    `cv2.cvtColor` and `cv2.inRange` are very fast for a single range, so the lookup table is usually faster only
+    for thresholds with several ranges (measure on the target hardware).
+    Building the lookup table takes a fraction of a second and it takes 16MB of memory.
+
+    Note: lookup tables are supported only on little endian machines, otherwise the original threshold is used.
+    """
+
+    color_space = ColorSpace.BGR
+
+    def __init__(self, threshold: Threshold):
+        """
+        :param threshold: the threshold the lookup table is created from, it must receive BGR images
+        """
+        self.threshold = threshold
+        self._lookup_table: Union[np.ndarray, None] = None
+
+    @property
+    def lookup_table(self) -> np.ndarray:
+        """
+        The mask value of every BGR color, built on first use (see `build_lookup_table`)
+        """
+        if self._lookup_table is None:
+            self._lookup_table = cached_lookup_table(self.threshold)
+        return self._lookup_table
+
+    def convert(self, image: np.ndarray) -> np.ndarray:
+        """
+        Thresholds a BGR image using the lookup table
+
+        :param image: a BGR image
+        :return: binary mask
+        """
+        if not supports_lookup(image):
+            return self.threshold.convert(image)
+        return lookup(self.lookup_table, image)
+
+    def validate(self, *args, **kwargs) -> bool:
+        return self.threshold.validate(*args, **kwargs)
+
+    def __getstate__(self):
+        # the lookup table is built again instead of being copied (for example to other processes)
+        state = self.__dict__.copy()
+        state["_lookup_table"] = None
+        return state
+
+    def __repr__(self):
+        return f"LookupTableThreshold({self.threshold!r})"
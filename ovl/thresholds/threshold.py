@@ -1,15 +1,61 @@
 from abc import abstractmethod
+from typing import Union
+
+import numpy as np
+
+from ..utils.color_space import ColorSpace, convert_color_space
+from ..utils.frame_context import FrameContext
 
 
 class Threshold:
     """
     Threshold is a base class for Threshold object that threshold an image
     (Color, binary or otherwise), threshold is then followed up
+
+    `Threshold.convert` receives BGR images, thresholds that work in a different color space
+    declare it as their color_space and implement `Threshold.convert_native`, which receives images that are
+    already in that color space, so a `Vision` that tracks color spaces can skip converting the image again.
+    Thresholds whose color_space is None are applied on the image as is.
     """
+    color_space: Union[ColorSpace, None] = ColorSpace.BGR
+
     @abstractmethod
     def convert(self, image):
         pass
 
+    def convert_native(self, image: np.ndarray) -> np.ndarray:
+        """
+        Thresholds an image that is in the threshold's color space (`Threshold.color_space`)
+
+        :param image: the image in the threshold's color space
+        :return: the binary mask
+        """
+        return self.convert(image)
+
+    def convert_from(self, image: np.ndarray, color_space: ColorSpace) -> np.ndarray:
+        """
+        Thresholds an image in the given color space, converting it only if it is not in the threshold's color space
+
+        :param image: the image
+        :param color_space: the color space of the image
+        :return: the binary mask
+        """
+        if self.color_space is None:
+            return self.convert(image)
+        return self.convert_native(convert_color_space(image, color_space, self.color_space))
+
+    def convert_context(self, context: FrameContext) -> np.ndarray:
+        """
+        Thresholds the image of a `FrameContext`, the image is converted to the threshold's color space
+        only if it wasn't converted already (by another threshold for example)
+
+        :param context: the context of the image
+        :return: the binary mask
+        """
+        if self.color_space is None:
+            return self.convert(context.image)
+        return self.convert_native(context.in_color_space(self.color_space))
+
     @abstractmethod
     def validate(self, *args, **kwargs) -> bool:
         pass
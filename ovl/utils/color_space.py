@@ -0,0 +1,90 @@
+import enum
+from typing import Collection, Dict, List, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+
+class ColorSpace(enum.Enum):
+    """
+    The color spaces images can be in while passing through a pipeline
+
+    BGR - the default color space of images taken by opencv cameras
+    HSV - hue, saturation and value, used by color thresholds (`Color`, `MultiColor`)
+    GRAY - single channel greyscale images
+    """
+    BGR = "bgr"
+    HSV = "hsv"
+    GRAY = "gray"
+
+
+ALL_COLOR_SPACES = tuple(ColorSpace)
+
+COLOR_SPACE_CONVERSIONS: Dict[Tuple[ColorSpace, ColorSpace], Tuple[int, ...]] = {
+    (ColorSpace.BGR, ColorSpace.HSV): (cv2.COLOR_BGR2HSV,),
+    (ColorSpace.HSV, ColorSpace.BGR): (cv2.COLOR_HSV2BGR,),
+    (ColorSpace.BGR, ColorSpace.GRAY): (cv2.COLOR_BGR2GRAY,),
+    (ColorSpace.GRAY, ColorSpace.BGR): (cv2.COLOR_GRAY2BGR,),
+    (ColorSpace.HSV, ColorSpace.GRAY): (cv2.COLOR_HSV2BGR, cv2.COLOR_BGR2GRAY),
+    (ColorSpace.GRAY, ColorSpace.HSV): (cv2.COLOR_GRAY2BGR, cv2.COLOR_BGR2HSV),
+}
+
+
+def conversion_cost(source: ColorSpace, target: ColorSpace) -> int:
+    """
+    Returns the amount of full image conversions (cv2.cvtColor calls) needed to convert between color spaces
+    """
+    return 0 if source is target else len(COLOR_SPACE_CONVERSIONS[source, target])
+
+
+def convert_color_space(image: np.ndarray, source: ColorSpace, target: ColorSpace) -> np.ndarray:
+    """
+    Converts an image between color spaces, returns the image itself if the color spaces are the same
+
+    :param image: the image to convert
+    :param source: the color space of the image
+    :param target: the wanted color space
+    :return: the converted image
+    """
+    if source is target:
+        return image
+    for conversion_code in COLOR_SPACE_CONVERSIONS[source, target]:
+        image = cv2.cvtColor(image, conversion_code)
+    return image
+
+
+def plan_color_spaces(initial_color_space: ColorSpace,
+                      stages: Sequence[Tuple[Collection[ColorSpace], Union[None, ColorSpace], Union[None, ColorSpace]]],
+                      final_color_space: Union[ColorSpace, None] = None) -> List[ColorSpace]:
+    """
+    Chooses the color space each stage of a pipeline receives its image in,
+    so that the pipeline performs the least amount of color space conversions.
+
+    :param initial_color_space: the color space of the image given to the pipeline
+    :param stages: for each stage, the color spaces it accepts, the color space of its output
+     (None if the output is in the color space the stage received) and the color space it works in internally
+     (None if it works in every color space it accepts, otherwise receiving another color space costs
+     converting the image to the internal color space and back)
+    :param final_color_space: the color space needed after the last stage, None if any color space can be used
+    :return: the color space of the input of each stage, and the color space the image should be in at the end
+    """
+    # costs maps the color space of the image to (amount of conversions, color space chosen for every stage)
+    costs = {initial_color_space: (0, [])}
+    for accepted_color_spaces, output_color_space, native_color_space in stages:
+        stage_costs = {}
+        for input_color_space in accepted_color_spaces:
+            cost, path = min(((cost + conversion_cost(color_space, input_color_space), path)
+                              for color_space, (cost, path) in costs.items()), key=lambda option: option[0])
+            if native_color_space is not None:
+                cost += conversion_cost(input_color_space, native_color_space) + \
+                        conversion_cost(native_color_space, input_color_space)
+            result_color_space = output_color_space or input_color_space
+            if result_color_space not in stage_costs or cost < stage_costs[result_color_space][0]:
+                stage_costs[result_color_space] = (cost, path + [input_color_space])
+        costs = stage_costs
+    if final_color_space is None:
+        color_space, (_, path) = min(costs.items(), key=lambda option: option[1][0])
+        return path + [color_space]
+    _, path = min(((cost + conversion_cost(color_space, final_color_space), path)
+                   for color_space, (cost, path) in costs.items()), key=lambda option: option[0])
+    return path + [final_color_space]
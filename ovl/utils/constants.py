@@ -10,3 +10,39 @@ VISION_LOGGER = "vision"
 MULTI_VISION_DELAY = 0.1
 BASE_LOGGER = "ovl"
 MULTIVISION_LOGGER = "multivision"
+DEFAULT_FRAME_BUFFER_SIZE = 4
+DEFAULT_NEXT_IMAGE_TIMEOUT = 1
+DEFAULT_GOVERNOR_HEADROOM = 1.2
+DEFAULT_GOVERNOR_SMOOTHING = 0.1
+DEFAULT_GOVERNOR_MINIMAL_FPS = 1
+DEFAULT_REPLAY_PREFETCH = 8
+IMAGE_FILE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+CAMERA_LOGGER = "camera"
+DEFAULT_FRAME_LOG_QUEUE_SIZE = 32
+DEFAULT_STALL_TIMEOUT = 1
+DEFAULT_RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 8
+FAILED_READ_DELAY = 0.01
+DEFAULT_MJPEG_DECODE_WORKERS = 2
+DEFAULT_PROFILE_SETTLE_FRAMES = 2
+DEFAULT_PROFILE_SETTLE_TIMEOUT = 0.5
+DEFAULT_PROFILE_BRIGHTNESS_TOLERANCE = 0.03
+DEFAULT_CHESSBOARD_DETECTION_SIZE = 640
+CHESSBOARD_REFINEMENT_WINDOW = (11, 11)
+MINIMAL_CALIBRATION_IMAGES = 3
+DEFAULT_TIMING_WINDOW = 1000
+DEFAULT_PIPELINE_QUEUE_SIZE = 2
+PIPELINE_POLL_INTERVAL = 0.1
+DEFAULT_BATCH_CHUNK_SIZE = 4
+DEFAULT_TRACKING_MARGIN = 0.5
+DEFAULT_FULL_SEARCH_INTERVAL = 30
+DEFAULT_TRACKING_MOTION_SMOOTHING = 0.5
+MINIMAL_TRACKING_REGION_SIZE = 32
+DEFAULT_PYRAMID_MINIMAL_TARGET_SIZE = 16
+DEFAULT_MINIMAL_CANDIDATE_PIXELS = 1
+DEFAULT_RESULT_CACHE_SIZE = 4
+DEFAULT_CONTENT_HASH_STEP = 4
+DEFAULT_ADAPTIVE_WINDOW_SIZE = 31
+DEFAULT_ADAPTIVE_OFFSET = 5
+REPLAY_POLL_INTERVAL = 0.1
+DEFAULT_DRIVER_BUFFER_FRAMES = 4
@@ -0,0 +1,169 @@
+from typing import Any, Callable, Dict, Hashable, List, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .color_space import ColorSpace, convert_color_space
+
+
+def _filter_key(image_filter: Callable) -> Hashable:
+    """
+    Returns a key that is equal for image filters that apply the same function with the same parameters
+    """
+    function = getattr(image_filter, "func", None)
+    if function is not None:
+        keywords = tuple(sorted(getattr(image_filter, "keywords", {}).items()))
+        key = (function, getattr(image_filter, "args", ()), keywords)
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            pass
+    return id(image_filter), image_filter
+
+
+class FrameContext:
+    """
+    FrameContext holds an image and the images derived from it (color space conversions, downscaled copies,
+    blurred copies, filtered copies etc.), every derived image is computed the first time it is requested
+    and reused by every later request.
+
+    Passing the same FrameContext to multiple visions (or multiple thresholds and detectors) makes every conversion
+    happen once per image regardless of how many of them need it:
+
+    .. code-block:: python
+
+        context = ovl.FrameContext(camera.get_next_image())
+
+        yellow_targets, _ = yellow_vision.detect(context)
+        blue_targets, _ = blue_vision.detect(context)  # reuses the HSV image created for the yellow vision
+
+    Thresholds request derived images using `Threshold.convert_context`,
+    detectors using `Detector.detect_context` and image filters are applied using `FrameContext.filtered`.
+
+    Note: derived images are shared, they must not be changed in place.
+    A FrameContext should be used by a single thread.
+    """
+
+    def __init__(self, image: np.ndarray, color_space: ColorSpace = ColorSpace.BGR):
+        """
+        :param image: the image
+        :param color_space: the color space of the image
+        """
+        self.image = image
+        self.color_space = color_space
+        self._derived: Dict[Hashable, Any] = {}
+
+    def derived(self, key: Hashable, function: Callable, *args, **kwargs) -> Any:
+        """
+        Returns a derived image (or any other value) computed from the image,
+        `function(image, *args, **kwargs)` is called only the first time the key is requested
+
+        :param key: the key the derived image is saved by, should include the parameters of the function
+        :param function: the function that computes the derived image from the image
+        :return: the derived image
+        """
+        if key not in self._derived:
+            self._derived[key] = function(self.image, *args, **kwargs)
+        return self._derived[key]
+
+    def cached(self, key: Hashable) -> Any:
+        """
+        Returns a derived image only if it was already computed, None otherwise
+        """
+        return self._derived.get(key)
+
+    def in_color_space(self, color_space: ColorSpace) -> np.ndarray:
+        """
+        Returns the image converted to the given color space
+
+        :param color_space: the wanted color space
+        """
+        if color_space is self.color_space:
+            return self.image
+        return self.derived(color_space, convert_color_space, self.color_space, color_space)
+
+    @property
+    def bgr(self) -> np.ndarray:
+        return self.in_color_space(ColorSpace.BGR)
+
+    @property
+    def hsv(self) -> np.ndarray:
+        return self.in_color_space(ColorSpace.HSV)
+
+    @property
+    def gray(self) -> np.ndarray:
+        return self.in_color_space(ColorSpace.GRAY)
+
+    @property
+    def yuv_planes(self) -> Tuple[np.ndarray, ...]:
+        """
+        The Y, U and V planes of the image
+        """
+        return self.derived("yuv_planes", lambda _: tuple(cv2.split(cv2.cvtColor(self.bgr, cv2.COLOR_BGR2YUV))))
+
+    def downscaled(self, scale: int, interpolation: int = cv2.INTER_NEAREST) -> "FrameContext":
+        """
+        Returns the context of the image downscaled by an integer factor,
+        its derived images are computed once as well
+
+        :param scale: the factor each dimension of the image is divided by
+        :param interpolation: the interpolation used to downscale the image
+        """
+        if scale == 1:
+            return self
+
+        def downscale(image):
+            height, width = image.shape[:2]
+            return FrameContext(cv2.resize(image, (max(width // scale, 1), max(height // scale, 1)),
+                                           interpolation=interpolation), self.color_space)
+
+        return self.derived(("downscaled", scale, interpolation), downscale)
+
+    def pyramid_level(self, level: int) -> "FrameContext":
+        """
+        Returns the context of a level of the image's gaussian pyramid (`cv2.pyrDown` applied level times)
+
+        :param level: the level of the pyramid, 0 is the image itself
+        """
+        if level == 0:
+            return self
+        return self.derived(("pyramid_level", level),
+                            lambda _: FrameContext(cv2.pyrDown(self.pyramid_level(level - 1).image), self.color_space))
+
+    def blurred(self, kernel_size: Tuple[int, int] = (5, 5), sigma: float = 0) -> np.ndarray:
+        """
+        Returns the image blurred using a gaussian blur (`cv2.GaussianBlur`)
+
+        :param kernel_size: the size of the gaussian kernel
+        :param sigma: the standard deviation of the gaussian kernel, 0 to calculate it from the kernel size
+        """
+        return self.derived(("blurred", tuple(kernel_size), sigma), cv2.GaussianBlur, tuple(kernel_size), sigma)
+
+    def filtered(self, image_filter: Callable, **kwargs) -> "FrameContext":
+        """
+        Returns the context of the image after applying an image filter,
+        image filters with the same function and parameters are applied once
+
+        :param image_filter: an image filter (see `image_filter`)
+        :param kwargs: additional arguments passed to the image filter
+        """
+        key = ("filtered", _filter_key(image_filter), tuple(sorted(kwargs.items())))
+        return self.derived(key, lambda image: FrameContext(image_filter(image, **kwargs), self.color_space))
+
+    def filtered_by(self, image_filters: List[Callable]) -> "FrameContext":
+        """
+        Returns the context of the image after applying a list of image filters in order,
+        see `FrameContext.filtered`
+        """
+        context = self
+        for image_filter in image_filters:
+            context = context.filtered(image_filter)
+        return context
+
+    def __repr__(self):
+        shape = None if self.image is None else self.image.shape
+        return f"FrameContext({shape}, {self.color_space}, derived={list(self._derived)})"
+
+
+ImageOrContext = Union[np.ndarray, FrameContext]
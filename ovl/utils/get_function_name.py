@@ -7,7 +7,8 @@ def get_function_name(func):
     """
     try:
         if isinstance(func, functools.partial):
-            return func.func.__name__
+            # partials that are named (like loaded predicate target filters) are named after the function they apply
+            return getattr(func, "__name__", None) or func.func.__name__
         return func.__name__
     except AttributeError:
         return repr(func)
@@ -29,5 +29,5 @@ def arguments_to_detector(mutually_exclusive_arguments):
     if existing_group_name != "detector":
         detector = _argument_group_to_detector_constructor(existing_group_name, *existing_group)
     else:
-        detector = existing_group
+        detector, = existing_group
     return detector
@@ -76,6 +76,22 @@ class AmbientVision:
         """
         return self.current_vision.get_image()
 
+    async def get_image_async(self) -> np.ndarray:
+        """
+        Take a picture using the current vision without blocking the running event loop
+
+        See `Vision.get_image_async` for more information
+        """
+        return await self.current_vision.get_image_async()
+
+    def activate_camera_profile(self) -> None:
+        """
+        Switches the camera to the camera profile of the current vision
+
+        See `Vision.activate_camera_profile` for more information
+        """
+        self.current_vision.activate_camera_profile()
+
     def apply_image_filters(self, image: np.ndarray) -> np.ndarray:
         """
         Applies all the image filters of the current vision on the given image
@@ -111,8 +127,10 @@ class AmbientVision:
         Increases the inner counter and swaps the ambient and the main vision
         after the set number of updates (self.main_amount)
 
-        This is used to switch between the main vision and ambient vision
+        This is used to switch between the main vision and ambient vision,
+        the camera profile of the new vision is activated when the visions are swapped
         """
+        previous_vision = self.current_vision
         if self.counter < self.main_amount:
             self.counter += 1
             self.current_vision = self.main_vision
@@ -121,3 +139,5 @@ class AmbientVision:
             self.counter = 0
             self.current_vision = self.ambient_vision
             self.is_ambient = True
+        if self.current_vision is not previous_vision:
+            self.current_vision.activate_camera_profile()
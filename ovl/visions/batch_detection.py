@@ -0,0 +1,131 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+import cv2
+import numpy as np
+
+from ..camera.frame_log import FrameLogReader
+from ..exceptions.exceptions import ImageError
+from ..utils.constants import DEFAULT_BATCH_CHUNK_SIZE, IMAGE_FILE_EXTENSIONS
+
+BatchImage = Union[np.ndarray, str, Path]
+BatchSource = Union[str, Path, FrameLogReader, Iterable[BatchImage]]
+BatchResult = Tuple[Any, Union[np.ndarray, None]]
+
+# the copy of the vision used by the current worker process, set once by _initialize_worker
+_worker_vision = None
+_worker_frame_log: Union[FrameLogReader, None] = None
+
+
+def _initialize_worker(vision, frame_log_path: Union[Path, None]) -> None:
+    global _worker_vision, _worker_frame_log
+    _worker_vision = vision
+    _worker_frame_log = None if frame_log_path is None else FrameLogReader(frame_log_path)
+
+
+def _load_image(image: Union[BatchImage, int]) -> np.ndarray:
+    """
+    Loads a batch image, image paths are read and frame log positions are read from the worker's frame log
+    """
+    if isinstance(image, (int, np.integer)):
+        return _worker_frame_log[image]
+    if isinstance(image, (str, Path)):
+        loaded_image = cv2.imread(str(image))
+        if loaded_image is None:
+            raise ImageError(f"Failed to read the image {image}")
+        return loaded_image
+    return image
+
+
+def _detect_chunk(images: List[Union[BatchImage, int]], return_images: bool) -> List[BatchResult]:
+    results = []
+    for image in images:
+        targets, filtered_image = _worker_vision.detect(_load_image(image))
+        results.append((targets, filtered_image if return_images else None))
+    return results
+
+
+def _video_images(path: Path) -> Iterator[np.ndarray]:
+    video = cv2.VideoCapture(str(path))
+    if not video.isOpened():
+        raise ImageError(f"Failed to open the video {path}")
+    try:
+        while True:
+            read, image = video.read()
+            if not read:
+                return
+            yield image
+    finally:
+        video.release()
+
+
+def _batch_images(source: BatchSource) -> Tuple[Iterable[Union[BatchImage, int]], Union[Path, None]]:
+    """
+    Turns a batch source into what is sent to the workers: images, image paths or frame log positions
+    (workers read image files and frame logs themselves, so only the path or position is sent)
+
+    :return: the items to send and the path of the frame log the workers should open (None if not a frame log)
+    """
+    if isinstance(source, FrameLogReader):
+        return range(len(source)), source.path
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.is_dir():
+            return sorted(image_path for image_path in path.iterdir()
+                          if image_path.suffix.lower() in IMAGE_FILE_EXTENSIONS), None
+        if path.suffix.lower() in IMAGE_FILE_EXTENSIONS:
+            return [path], None
+        return _video_images(path), None
+    return source, None
+
+
+def _chunks(items: Iterable, chunk_size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iterate_batch_detection(vision, source: BatchSource, workers: int = None,
+                            chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE, max_pending: int = None,
+                            return_images: bool = True) -> Iterator[BatchResult]:
+    """
+    Detects targets in every image of a source using a pool of processes, see `Vision.detect_batch`
+
+    :return: an iterator of the results (targets, filtered image) in the order of the images
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Batch chunk size must be at least 1, got {chunk_size}")
+    images, frame_log_path = _batch_images(source)
+    chunks = _chunks(images, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _initialize_worker(vision, frame_log_path)
+        try:
+            for chunk in chunks:
+                yield from _detect_chunk(chunk, return_images)
+        finally:
+            _initialize_worker(None, None)
+        return
+
+    max_pending = max_pending or workers * 2
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker,
+                             initargs=(vision, frame_log_path)) as executor:
+        try:
+            for chunk in chunks:
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(_detect_chunk, chunk, return_images))
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -135,7 +135,14 @@ class MultiVision:
             raise ValueError("No update task is running")
 
     def set_new_vision(self):
-        self.current_vision = self.upcoming_vision or self.current_vision
+        """
+        Switches to the upcoming vision (set by the vision updater),
+        the camera profile of the new vision is activated when the vision changes
+        """
+        upcoming_vision = self.upcoming_vision or self.current_vision
+        if upcoming_vision is not self.current_vision:
+            upcoming_vision.activate_camera_profile()
+        self.current_vision = upcoming_vision
 
     async def start(self) -> Generator[Tuple[Any, "ndarray", Any], None, None]:
         """
@@ -170,15 +177,16 @@ class MultiVision:
         :yields: targets, image and directions
         """
         self._update_task = asyncio.create_task(self._update_vision_func)
+        self.current_vision.activate_camera_profile()
         while True:
             self.set_new_vision()
 
             if self.pre_iteration_func:
                 self.pre_iteration_func()
 
-            image = await asyncio.get_running_loop().run_in_executor(None, self.current_vision.get_image)
+            image = await self.current_vision.get_image_async()
             targets, filtered_image = self.current_vision.detect(image)
-            directions = self.current_vision.director.direct(targets, filtered_image)
+            directions = self.current_vision.get_directions(targets, filtered_image)
             if self.is_ambient:
                 self.current_vision.update_vision()
             yield directions, targets, filtered_image
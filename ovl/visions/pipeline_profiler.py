@@ -0,0 +1,134 @@
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from .stage_statistics import StageStatistics
+from ..utils.constants import DEFAULT_TIMING_WINDOW
+
+NANOSECONDS_IN_MILLISECOND = 1e6
+
+
+class TimingHistogram:
+    """
+    Keeps the latest timings of a pipeline stage (in nanoseconds) in a fixed size rolling window
+    """
+
+    def __init__(self, window: int = DEFAULT_TIMING_WINDOW):
+        """
+        :param window: the amount of latest timings used to calculate the percentiles
+        """
+        self._durations = np.zeros(window, dtype=np.int64)
+        self.count = 0
+        self.max = 0
+
+    def record(self, duration: int) -> None:
+        """
+        Adds a timing to the window, overwriting the oldest timing if the window is full
+
+        :param duration: the duration in nanoseconds
+        """
+        self._durations[self.count % len(self._durations)] = duration
+        self.count += 1
+        if duration > self.max:
+            self.max = duration
+
+    def statistics(self) -> StageStatistics:
+        durations = self._durations[:min(self.count, len(self._durations))] / NANOSECONDS_IN_MILLISECOND
+        if len(durations) == 0:
+            return StageStatistics(count=0, mean=0, p50=0, p95=0, p99=0, max=0)
+        p50, p95, p99 = np.percentile(durations, (50, 95, 99))
+        return StageStatistics(count=self.count, mean=float(durations.mean()), p50=float(p50), p95=float(p95),
+                               p99=float(p99), max=self.max / NANOSECONDS_IN_MILLISECOND)
+
+
+class _StageMeasurement:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: TimingHistogram):
+        self.histogram = histogram
+        self.started = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.record(time.perf_counter_ns() - self.started)
+
+
+class PipelineProfiler:
+    """
+    Collects the timings of the stages of a pipeline (image filters, threshold, contour finding,
+    target filters, directing etc.) using time.perf_counter_ns.
+
+    The profiler is used by a `Vision` created with collect_timings=True, see `Vision.stats`
+
+    .. code-block:: python
+
+        profiler = PipelineProfiler()
+
+        with profiler.measure("blur"):
+            image = cv2.GaussianBlur(image, (5, 5), 0)
+
+        mask = profiler.time("threshold", color.convert, image)
+
+        print(profiler.statistics()["blur"].p95)
+
+    """
+
+    def __init__(self, window: int = DEFAULT_TIMING_WINDOW):
+        """
+        :param window: the amount of latest timings of every stage used to calculate the percentiles
+        """
+        self.window = window
+        self.histograms: Dict[str, TimingHistogram] = {}
+
+    def _histogram(self, stage: str) -> TimingHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = TimingHistogram(self.window)
+        return histogram
+
+    def record(self, stage: str, duration: int) -> None:
+        """
+        Records a timing of a stage
+
+        :param stage: the name of the stage
+        :param duration: the duration in nanoseconds
+        """
+        self._histogram(stage).record(duration)
+
+    def measure(self, stage: str) -> _StageMeasurement:
+        """
+        Returns a context manager that records the time its block took as a timing of the given stage
+
+        :param stage: the name of the stage
+        """
+        return _StageMeasurement(self._histogram(stage))
+
+    def time(self, stage: str, function: Callable, *args, **kwargs):
+        """
+        Calls a function and records the time it took as a timing of the given stage
+
+        :param stage: the name of the stage
+        :param function: the function to call
+        :return: the return value of the function
+        """
+        started = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self._histogram(stage).record(time.perf_counter_ns() - started)
+
+    def statistics(self) -> Dict[str, StageStatistics]:
+        """
+        Returns the statistics of every stage (count, mean, p50, p95, p99 and max in milliseconds)
+        """
+        return {stage: histogram.statistics() for stage, histogram in self.histograms.items()}
+
+    def reset(self) -> None:
+        """
+        Removes all the collected timings
+        """
+        self.histograms.clear()
@@ -0,0 +1,214 @@
+import queue
+from threading import Event, Thread
+from typing import Any, Callable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from ..camera.camera import Camera
+from ..camera.camera_group import GroupCamera
+from ..camera.frame import Frame
+from ..exceptions.exceptions import ImageError
+from ..utils.constants import DEFAULT_PIPELINE_QUEUE_SIZE, PIPELINE_POLL_INTERVAL
+
+_END_OF_STREAM = None
+
+
+class _StageFailure:
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+class _PipelineItem:
+    """
+    An image passing through the stages of the pipeline, along with the camera frame it came from
+    """
+    __slots__ = ("frame", "image", "color_space", "targets")
+
+    def __init__(self, frame: Union[Frame, None], image: np.ndarray):
+        self.frame = frame
+        self.image = image
+        self.color_space = None
+        self.targets = None
+
+    def release(self) -> None:
+        if self.frame is not None:
+            self.frame.release()
+            self.frame = None
+
+
+class PipelinedRunner:
+    """
+    Runs the stages of a `Vision` on separate threads connected by bounded queues:
+    capture -> image filters -> detection and target filters -> directing (in the iterating thread)
+
+    OpenCV releases the GIL during its heavy calls, so the stages run in parallel and the throughput
+    is bound by the slowest stage instead of the sum of all stages.
+    Results are returned in the order the images were taken.
+
+    When drop_oldest is True, a stage that has a full output queue drops the oldest image in the queue,
+    so results are always as fresh as possible (the dropped images are counted in `PipelinedRunner.dropped_frames`),
+    otherwise the stage waits for room in the queue and no image is dropped.
+
+    Created using `Vision.run_pipelined`:
+
+    .. code-block:: python
+
+        vision = ovl.Vision(threshold=ovl.HSV.yellow, camera=ovl.Camera(0), ...)
+
+        for directions, targets, image in vision.run_pipelined(queue_size=2):
+            connection.send(directions)
+
+    """
+
+    def __init__(self, vision, queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE, drop_oldest: bool = True):
+        """
+        :param vision: the `Vision` whose stages are run
+        :param queue_size: the maximum amount of images waiting between every 2 stages
+        :param drop_oldest: if stages should drop the oldest waiting image when their output queue is full
+         instead of waiting
+        """
+        self.vision = vision
+        self.queue_size = queue_size
+        self.drop_oldest = drop_oldest
+        self.dropped_frames = 0
+        self._stopped = Event()
+        self._threads: List[Thread] = []
+        self._queues: List[queue.Queue] = []
+
+    def stop(self) -> None:
+        """
+        Stops all the stage threads, waiting for them to finish
+        """
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for stage_queue in self._queues:
+            while not stage_queue.empty():
+                item = stage_queue.get_nowait()
+                if isinstance(item, _PipelineItem):
+                    item.release()
+        self._queues = []
+
+    def _put(self, output_queue: queue.Queue, item) -> None:
+        """
+        Puts an item in the next stage's queue, when the queue is full either waits for room
+        or drops the oldest image in the queue.
+        Every queue has a single producing stage and the end of the stream (or a failure) is the last item it puts,
+        so only images are ever dropped.
+        """
+        if self.drop_oldest and isinstance(item, _PipelineItem):
+            while True:
+                try:
+                    output_queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    pass
+                try:
+                    dropped_item = output_queue.get_nowait()
+                except queue.Empty:
+                    continue
+                dropped_item.release()
+                self.dropped_frames += 1
+        while not self._stopped.is_set():
+            try:
+                output_queue.put(item, timeout=PIPELINE_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+        if isinstance(item, _PipelineItem):
+            item.release()
+
+    def _get(self, input_queue: queue.Queue):
+        while not self._stopped.is_set():
+            try:
+                return input_queue.get(timeout=PIPELINE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _END_OF_STREAM
+
+    def _capture(self) -> Union[_PipelineItem, None]:
+        """
+        Takes the next image from the vision's camera, None once the camera is closed
+        """
+        camera = self.vision.camera
+        while not self._stopped.is_set():
+            if not camera.isOpened():
+                return None
+            try:
+                if isinstance(camera, Camera):
+                    # the frame is acquired until its results are returned, so a pooled image is not reused
+                    frame = camera.get_next_frame(timeout=PIPELINE_POLL_INTERVAL)
+                    return _PipelineItem(frame, frame.image)
+                return _PipelineItem(None, self.vision.get_image())
+            except ImageError:
+                if not isinstance(camera, (Camera, GroupCamera)):
+                    # recordings and cv2.VideoCapture fail to read once the stream ended
+                    return None
+        return None
+
+    def _run_capture_stage(self, output_queue: queue.Queue) -> None:
+        try:
+            while not self._stopped.is_set():
+                item = self._capture()
+                if item is None:
+                    break
+                self._put(output_queue, item)
+        except BaseException as exception:
+            self._put(output_queue, _StageFailure(exception))
+            return
+        self._put(output_queue, _END_OF_STREAM)
+
+    def _run_stage(self, process: Callable[[_PipelineItem], None], input_queue: queue.Queue,
+                   output_queue: queue.Queue) -> None:
+        while True:
+            item = self._get(input_queue)
+            if not isinstance(item, _PipelineItem):
+                self._put(output_queue, item)
+                return
+            try:
+                process(item)
+            except BaseException as exception:
+                item.release()
+                self._put(output_queue, _StageFailure(exception))
+                return
+            self._put(output_queue, item)
+
+    def _filter(self, item: _PipelineItem) -> None:
+        item.image, item.color_space = self.vision._filter_image(item.image)
+
+    def _detect(self, item: _PipelineItem) -> None:
+        item.targets = self.vision._detect_targets(item.image, item.color_space)
+
+    def __iter__(self) -> Iterator[Tuple[Any, List, np.ndarray]]:
+        if self.vision.camera is None:
+            raise ValueError("A Vision needs a camera to run pipelined")
+        self._stopped.clear()
+        self._queues = [queue.Queue(maxsize=self.queue_size) for _ in range(3)]
+        captured_images, filtered_images, results = self._queues
+        self._threads = [Thread(target=self._run_capture_stage, args=(captured_images,), daemon=True),
+                         Thread(target=self._run_stage, args=(self._filter, captured_images, filtered_images),
+                                daemon=True),
+                         Thread(target=self._run_stage, args=(self._detect, filtered_images, results), daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        previous_item = None
+        try:
+            while True:
+                item = self._get(results)
+                if previous_item is not None:
+                    previous_item.release()
+                    previous_item = None
+                if isinstance(item, _StageFailure):
+                    raise item.exception
+                if item is _END_OF_STREAM:
+                    return
+                directions = self.vision.get_directions(item.targets, item.image)
+                previous_item = item
+                yield directions, item.targets, item.image
+        finally:
+            if previous_item is not None:
+                previous_item.release()
+            self.stop()
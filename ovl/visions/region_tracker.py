@@ -0,0 +1,215 @@
+import math
+import numbers
+from typing import Any, Iterable, Tuple, Union
+
+import cv2
+import numpy as np
+
+from ..utils.constants import DEFAULT_TRACKING_MARGIN, DEFAULT_FULL_SEARCH_INTERVAL, \
+    DEFAULT_TRACKING_MOTION_SMOOTHING, MINIMAL_TRACKING_REGION_SIZE
+
+Region = Tuple[int, int, int, int]
+
+
+def _is_coordinates(target: Any) -> bool:
+    """
+    Checks if a target is a point (x, y) or a rectangle (x, y, width, height) given as a list or tuple of numbers
+    """
+    return isinstance(target, (list, tuple)) and len(target) in (2, 4) and \
+        all(isinstance(value, numbers.Real) for value in target)
+
+
+def _target_points(targets: Any) -> Iterable[np.ndarray]:
+    """
+    Yields the points of targets, contours (arrays of points), points (x, y)
+    and rectangles (x, y, width, height) are supported
+    """
+    if _is_coordinates(targets):
+        targets = np.asarray(targets)
+    if isinstance(targets, np.ndarray):
+        if targets.shape[-1] == 2:
+            yield targets.reshape(-1, 2)
+            return
+        if targets.ndim <= 2 and targets.shape[-1] == 4:
+            rectangles = targets.reshape(-1, 4)
+            yield rectangles[:, :2]
+            yield rectangles[:, :2] + rectangles[:, 2:]
+            return
+        if targets.dtype != object:
+            raise TypeError(f"Targets of shape {targets.shape} can't be tracked, "
+                            f"only contours and rectangles (x, y, width, height) are supported")
+    if isinstance(targets, dict):
+        targets = targets.values()
+    for target in targets:
+        yield from _target_points(target)
+
+
+def targets_bounding_box(targets: Any) -> Union[Region, None]:
+    """
+    Calculates the bounding box of all the targets
+
+    :param targets: contours, points (x, y) or rectangles (x, y, width, height),
+     can be nested in lists, tuples and dictionaries
+    :return: the bounding box (x, y, width, height), None if there are no targets
+    """
+    points = [target_points for target_points in _target_points(targets) if len(target_points)]
+    if not points:
+        return None
+    return cv2.boundingRect(np.concatenate(points).astype(np.int32))
+
+
+def translate_targets(targets: Any, offset: Tuple[int, int]) -> Any:
+    """
+    Moves targets found inside a region of an image to the coordinates of the whole image,
+    numpy arrays, lists and dictionaries are moved in place, tuples are replaced by moved copies
+    (so the returned targets should be used).
+
+    :param targets: contours, points (x, y) or rectangles (x, y, width, height),
+     can be nested in lists, tuples and dictionaries
+    :param offset: the (x, y) of the top left corner of the region
+    :return: the moved targets
+    """
+    if _is_coordinates(targets):
+        x, y = offset
+        moved = (targets[0] + x, targets[1] + y, *targets[2:])
+        return list(moved) if isinstance(targets, list) else tuple(moved)
+    if isinstance(targets, np.ndarray) and targets.dtype != object:
+        if targets.shape[-1] == 2:
+            targets += np.array(offset, dtype=targets.dtype)
+        elif targets.ndim <= 2 and targets.shape[-1] == 4:
+            targets[..., :2] += np.array(offset, dtype=targets.dtype)
+        else:
+            raise TypeError(f"Targets of shape {targets.shape} can't be tracked, "
+                            f"only contours and rectangles (x, y, width, height) are supported")
+        return targets
+    if isinstance(targets, dict):
+        for key, target in targets.items():
+            targets[key] = translate_targets(target, offset)
+        return targets
+    moved = [translate_targets(target, offset) for target in targets]
+    if isinstance(targets, list):
+        targets[:] = moved
+        return targets
+    return tuple(moved)
+
+
+class RegionTracker:
+    """
+    RegionTracker chooses the region of the next image targets should be searched in,
+    based on where the targets were found in the previous images.
+
+    The region is the bounding box of the last targets, moved by their estimated motion (in pixels per image)
+    and grown on every side by a margin (relative to the size of the box) and by the estimated motion.
+    The whole image is searched when there are no previous targets and every `full_search_interval` images,
+    `Vision` also searches the whole image again when no targets are found in the region.
+
+    Used by `Vision` when tracking is enabled:
+
+    .. code-block:: python
+
+        vision = ovl.Vision(threshold=ovl.HSV.yellow, ...)
+        tracker = vision.enable_tracking(margin=0.5, full_search_interval=30)
+
+        targets, image = vision.detect(image)
+        print(tracker.tracked_images, tracker.full_searches)
+
+    """
+
+    def __init__(self, margin: float = DEFAULT_TRACKING_MARGIN,
+                 full_search_interval: int = DEFAULT_FULL_SEARCH_INTERVAL,
+                 motion_smoothing: float = DEFAULT_TRACKING_MOTION_SMOOTHING,
+                 minimal_size: int = MINIMAL_TRACKING_REGION_SIZE):
+        """
+        :param margin: the amount the bounding box of the last targets is grown on every side,
+         relative to its width and height
+        :param full_search_interval: the maximum amount of images searched only in a region
+         before searching the whole image
+        :param motion_smoothing: the weight of the latest motion in the estimated motion (0 to 1),
+         lower values are less affected by noise but adjust to changes in motion slower
+        :param minimal_size: the minimal width and height of the region in pixels
+        """
+        if full_search_interval < 1:
+            raise ValueError(f"The full search interval must be at least 1, got {full_search_interval}")
+        if not 0 < motion_smoothing <= 1:
+            raise ValueError(f"Motion smoothing must be between 0 (exclusive) and 1, got {motion_smoothing}")
+        self.margin = margin
+        self.full_search_interval = full_search_interval
+        self.motion_smoothing = motion_smoothing
+        self.minimal_size = minimal_size
+        self.box: Union[Region, None] = None
+        self.motion = (0., 0.)
+        self.images_since_full_search = 0
+        self.tracked_images = 0
+        self.full_searches = 0
+
+    def reset(self) -> None:
+        """
+        Forgets the last targets, the next image is searched whole
+        """
+        self.box = None
+        self.motion = (0., 0.)
+        self.images_since_full_search = 0
+
+    def region(self, image_dimensions: Tuple[int, int]) -> Union[Region, None]:
+        """
+        Returns the region of the next image the targets should be searched in
+
+        :param image_dimensions: the (width, height) of the image
+        :return: the region (x, y, width, height), None if the whole image should be searched
+        """
+        if self.box is None or self.images_since_full_search + 1 >= self.full_search_interval:
+            return None
+        image_width, image_height = image_dimensions
+        x, y, width, height = self.box
+        motion_x, motion_y = self.motion
+        center_x = x + width / 2 + motion_x
+        center_y = y + height / 2 + motion_y
+        half_width = max(width * (0.5 + self.margin) + abs(motion_x), self.minimal_size / 2)
+        half_height = max(height * (0.5 + self.margin) + abs(motion_y), self.minimal_size / 2)
+        left = max(int(center_x - half_width), 0)
+        top = max(int(center_y - half_height), 0)
+        right = min(math.ceil(center_x + half_width), image_width)
+        bottom = min(math.ceil(center_y + half_height), image_height)
+        if right <= left or bottom <= top:
+            return None
+        if right - left == image_width and bottom - top == image_height:
+            return None
+        return left, top, right - left, bottom - top
+
+    @staticmethod
+    def touches_edge(box: Region, region: Region, image_dimensions: Tuple[int, int]) -> bool:
+        """
+        Checks if a bounding box of targets touches an edge of the region that is not an edge of the image,
+        in which case the targets might continue outside the region
+        """
+        x, y, width, height = box
+        region_x, region_y, region_width, region_height = region
+        image_width, image_height = image_dimensions
+        return ((x <= region_x and region_x > 0) or (y <= region_y and region_y > 0) or
+                (x + width >= region_x + region_width and region_x + region_width < image_width) or
+                (y + height >= region_y + region_height and region_y + region_height < image_height))
+
+    def update(self, box: Union[Region, None], full_search: bool) -> None:
+        """
+        Updates the tracker with the bounding box of the targets found in the latest image
+
+        :param box: the bounding box (x, y, width, height) of the targets, None if no targets were found
+        :param full_search: if the whole image was searched
+        """
+        if full_search:
+            self.full_searches += 1
+            self.images_since_full_search = 0
+        else:
+            self.tracked_images += 1
+            self.images_since_full_search += 1
+        if box is None:
+            self.reset()
+            return
+        if self.box is not None:
+            last_x, last_y, last_width, last_height = self.box
+            x, y, width, height = box
+            measured_x = (x + width / 2) - (last_x + last_width / 2)
+            measured_y = (y + height / 2) - (last_y + last_height / 2)
+            self.motion = (self.motion[0] + self.motion_smoothing * (measured_x - self.motion[0]),
+                           self.motion[1] + self.motion_smoothing * (measured_y - self.motion[1]))
+        self.box = box
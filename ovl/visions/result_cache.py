@@ -0,0 +1,145 @@
+import enum
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple, Union
+
+import numpy as np
+
+from ..utils.constants import DEFAULT_RESULT_CACHE_SIZE, DEFAULT_CONTENT_HASH_STEP
+
+_NO_DIRECTIONS = object()
+
+
+class ResultCacheKey(enum.Enum):
+    """
+    How a `ResultCache` recognizes an image it has seen:
+
+    IDENTITY - the same image object with the same camera sequence number (images taken using `Vision.get_image`
+     with an `ovl.Camera`), used for cameras that return the same image when no new image was taken.
+     Images without a known sequence number are recognized by their content, since image buffers
+     (like frame pools or `cv2.VideoCapture.read(image=buffer)`) reuse the same object for different images
+    CONTENT - a hash of a sample of the image's pixels (every content_hash_step-th pixel of every
+     content_hash_step-th row), also recognizes copies of an image
+    """
+    IDENTITY = "identity"
+    CONTENT = "content"
+
+
+class _CacheEntry:
+    __slots__ = ("image", "targets", "filtered_image", "directions")
+
+    def __init__(self, image, targets, filtered_image):
+        self.image = image
+        self.targets = targets
+        self.filtered_image = filtered_image
+        self.directions = _NO_DIRECTIONS
+
+
+class ResultCache:
+    """
+    Remembers the results (targets, filtered image and directions) of the latest images a `Vision` processed,
+    so an image that is processed again returns the same results without recalculating them.
+
+    Used by `Vision` when the result cache is enabled:
+
+    .. code-block:: python
+
+        vision = ovl.Vision(threshold=ovl.HSV.yellow, camera=cv2.VideoCapture(0), ...)
+        cache = vision.enable_result_cache()
+
+        while True:
+            image = vision.get_image()
+            targets, filtered_image = vision.detect(image)
+            directions = vision.get_directions(targets, filtered_image)
+
+        print(cache.hits, cache.misses)
+
+    """
+
+    def __init__(self, size: int = DEFAULT_RESULT_CACHE_SIZE, key: ResultCacheKey = ResultCacheKey.IDENTITY,
+                 content_hash_step: int = DEFAULT_CONTENT_HASH_STEP):
+        """
+        :param size: the amount of latest images whose results are kept
+        :param key: how images are recognized, see `ResultCacheKey`
+        :param content_hash_step: the distance between sampled pixels (and rows) when hashing the image content,
+         1 hashes every pixel
+        """
+        if size < 1:
+            raise ValueError(f"Result cache size must be at least 1, got {size}")
+        self.size = size
+        self.key = key
+        self.content_hash_step = content_hash_step
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._last_entry: Union[_CacheEntry, None] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def image_key(self, image: np.ndarray, sequence_number: Union[int, None] = None) -> Hashable:
+        """
+        Returns the key an image is cached by
+
+        :param image: the image given to `Vision.detect`
+        :param sequence_number: the camera sequence number of the image, None if it is not known
+        """
+        if self.key is ResultCacheKey.IDENTITY and sequence_number is not None:
+            return ResultCacheKey.IDENTITY, id(image), sequence_number
+        step = self.content_hash_step
+        sample = np.ascontiguousarray(image[::step, ::step])
+        return ResultCacheKey.CONTENT, image.shape, image.dtype.str, hash(sample.tobytes())
+
+    def get(self, key: Hashable, image: np.ndarray) -> Union[_CacheEntry, None]:
+        """
+        Returns the cached results of an image, counting the hit or the miss
+
+        :param key: the key of the image (see `ResultCache.image_key`)
+        :param image: the image
+        :return: the cache entry, None if the image is not cached
+        """
+        entry = self._entries.get(key)
+        if entry is None or (key[0] is ResultCacheKey.IDENTITY and entry.image is not image):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        self._last_entry = entry
+        return entry
+
+    def put(self, key: Hashable, image: np.ndarray, targets, filtered_image: np.ndarray) -> None:
+        """
+        Caches the results of an image, the oldest cached image is removed if the cache is full
+        """
+        # only images cached by identity are kept, so their id can't be reused while they are cached
+        kept_image = image if key[0] is ResultCacheKey.IDENTITY else None
+        self._entries[key] = self._last_entry = _CacheEntry(kept_image, targets, filtered_image)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def cached_directions(self, targets, filtered_image: np.ndarray) -> Tuple[bool, Any]:
+        """
+        Returns the cached directions of the targets of the latest cached image (or cache hit)
+
+        :return: if the directions were cached and the directions
+        """
+        entry = self._last_entry
+        if entry is None or entry.targets is not targets or entry.filtered_image is not filtered_image or \
+                entry.directions is _NO_DIRECTIONS:
+            return False, None
+        return True, entry.directions
+
+    def put_directions(self, targets, filtered_image: np.ndarray, directions: Any) -> None:
+        """
+        Caches the directions calculated for the targets of the latest cached image
+        """
+        entry = self._last_entry
+        if entry is not None and entry.targets is targets and entry.filtered_image is filtered_image:
+            entry.directions = directions
+
+    def clear(self) -> None:
+        """
+        Removes all cached results, the hit and miss counters are kept
+        """
+        self._entries.clear()
+        self._last_entry = None
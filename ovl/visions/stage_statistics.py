@@ -0,0 +1,18 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class StageStatistics:
+    """
+    A snapshot of the timings of a single pipeline stage, all times are in milliseconds
+
+    count - the amount of times the stage ran
+    mean, p50, p95, p99 - the mean and percentiles of the latest timings (see `PipelineProfiler`)
+    max - the longest the stage ever took
+    """
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
@@ -1,8 +1,10 @@
+import asyncio
+import copy
 import math
 import types
 from functools import reduce
 from logging import getLogger
-from typing import List, Union, Any, Callable, Tuple, Iterable
+from typing import List, Union, Any, Callable, Tuple, Iterable, Iterator, Dict
 
 import cv2
 import numpy as np
@@ -10,13 +12,26 @@ import numpy as np
 from ovl import OMIT_DIMENSION_VALUES, DEFAULT_FAILED_DETECTION_VALUE, VISION_LOGGER
 from ..camera.camera import Camera, configure_camera
 from ..camera.camera_configuration import CameraConfiguration
+from ..camera.camera_group import GroupCamera
+from ..camera.replay_camera import ReplayCamera
 from ..detectors.detector import Detector
+from ..detectors.threshold_detector import ThresholdDetector
 from ..directions.directing_functions import center_directions
 from ..directions.director import Director
 from ..exceptions.exceptions import CameraError, ImageError
 from ..partials.filter_applier import apply
 from ..thresholds.threshold import Threshold
-from ..utils.constants import DEFAULT_IMAGE_HEIGHT, DEFAULT_IMAGE_WIDTH, BASE_LOGGER
+from ..utils.color_space import ColorSpace, convert_color_space, plan_color_spaces
+from .batch_detection import BatchResult, BatchSource, iterate_batch_detection
+from .pipeline_profiler import PipelineProfiler
+from .pipelined_runner import PipelinedRunner
+from .region_tracker import Region, RegionTracker, targets_bounding_box, translate_targets
+from .result_cache import ResultCache, ResultCacheKey
+from .stage_statistics import StageStatistics
+from ..utils.constants import DEFAULT_IMAGE_HEIGHT, DEFAULT_IMAGE_WIDTH, BASE_LOGGER, DEFAULT_NEXT_IMAGE_TIMEOUT, \
+    DEFAULT_TIMING_WINDOW, DEFAULT_PIPELINE_QUEUE_SIZE, DEFAULT_BATCH_CHUNK_SIZE, DEFAULT_TRACKING_MARGIN, \
+    DEFAULT_FULL_SEARCH_INTERVAL, DEFAULT_RESULT_CACHE_SIZE, DEFAULT_CONTENT_HASH_STEP
+from ..utils.frame_context import FrameContext, ImageOrContext
 from ..utils.get_function_name import get_function_name
 from ..utils.types import Target
 from ..utils.vision_detector_arguments import arguments_to_detector
@@ -57,7 +72,9 @@ class Vision:
                  width=DEFAULT_IMAGE_WIDTH, height=DEFAULT_IMAGE_HEIGHT,
                  camera: Union[int, str, Camera, cv2.VideoCapture, Any] = None,
                  camera_configuration: CameraConfiguration = None, image_filters: List[types.FunctionType] = None,
-                 ovl_camera: bool = False, haar_classifier: str = None, logger_name: str = None):
+                 ovl_camera: bool = False, haar_classifier: str = None, logger_name: str = None,
+                 camera_profile: str = None, track_color_space: bool = False, collect_timings: bool = False,
+                 track_targets: bool = False, cache_results: bool = False):
         """
         :param detector: a Detector object responsible for detecting targets
         :param threshold: threshold is a shortcut for detecting
@@ -66,13 +83,25 @@ class Vision:
         :param director: a functions that receive a list or a single contour and returns director
         :param width: the width (in pixels) of images taken with the camera
         :param height: the height (in pixels)
-        :param camera: a Camera object (cv2.VideoCapture, ovl.Camera) or source from which to open a camera
+        :param camera: a Camera object (cv2.VideoCapture, ovl.Camera, a camera of an ovl.CameraGroup,
+         ovl.ReplayCamera) or source from which to open a camera
         :param camera_configuration: Special camera settings like calibration or offset used for
                                 image correction and various direction calculations.
         :param image_filters: a list of image altering functions that are applied on the image.
         :param ovl_camera: a boolean that makes the camera opened to be ovl.Camera instead of cv2.VideoCapture
         :param haar_classifier:
         :param target_selector: decides how many/what targets are selected after targets have been filtered
+        :param camera_profile: the name of the `ovl.Camera` configuration profile this vision needs,
+         switched to when a MultiVision or an AmbientVision switches to this vision
+        :param track_color_space: if the color space of the image should be tracked through the image filters
+         and the threshold, so the image is converted between color spaces as few times as possible
+         (see `Vision.apply_image_filters_in_color_space`)
+        :param collect_timings: if the time every stage of the pipeline takes should be measured,
+         see `Vision.stats`
+        :param track_targets: if only the region around the last targets should be searched,
+         see `Vision.enable_tracking`
+        :param cache_results: if the results of images that were already processed should be reused,
+         see `Vision.enable_result_cache`
         """
         if not (detector is None and threshold is None and haar_classifier is None):
             mutually_exclusive_arguments = {"threshold": (threshold, morphological_functions),
@@ -92,9 +121,24 @@ class Vision:
         self.camera = None
         self.camera_port = None
         self.camera_configuration = camera_configuration
+        self.camera_profile = camera_profile
+        self.track_color_space = track_color_space
+        self.filtered_image_color_space = ColorSpace.BGR
         self.logger = getLogger(logger_name or VISION_LOGGER)
 
-        if isinstance(camera, (cv2.VideoCapture, Camera)) or camera is None:
+        self.profiler = None
+        if collect_timings:
+            self.enable_timings()
+        self.tracker = None
+        if track_targets:
+            self.enable_tracking()
+        self.result_cache = None
+        self._camera_image_id = None
+        self._camera_sequence_number = None
+        if cache_results:
+            self.enable_result_cache()
+
+        if isinstance(camera, (cv2.VideoCapture, Camera, GroupCamera, ReplayCamera)) or camera is None:
             self.camera = camera
         else:
             self.camera_setup(camera, width, height, camera_configuration, ovl_camera=ovl_camera)
@@ -102,6 +146,14 @@ class Vision:
     def __repr__(self):
         return str(self)
 
+    def __getstate__(self):
+        # cameras can't be copied to other processes, timings and cached results are kept separately by every copy
+        state = self.__dict__.copy()
+        state["camera"] = None
+        state["profiler"] = None
+        state["result_cache"] = None
+        return state
+
     def __str__(self):
         filters = [get_function_name(filter_function) for filter_function in self.target_filters]
         image_filters = [get_function_name(image_filter) for image_filter in self.image_filters]
@@ -123,6 +175,9 @@ class Vision:
         """
         Gets an image from `self.camera` and applies image filters
 
+        When the camera is an `ovl.Camera` (or a camera of an `ovl.CameraGroup`, an `ovl.ReplayCamera`)
+        waits for an image that was not returned before, so the same image is never processed twice.
+
         :return: the image
         :raises: ImageError if the image fau
 
@@ -131,6 +186,12 @@ class Vision:
             raise CameraError("No camera given, (Camera is None)")
         if not self.camera.isOpened():
             raise CameraError("The Vision's camera is not open (Has it been closed or disconnected?)")
+        if isinstance(self.camera, (Camera, GroupCamera, ReplayCamera)):
+            image = self.camera.get_next_image(timeout=DEFAULT_NEXT_IMAGE_TIMEOUT)
+            # pooled images are reused for later frames, the sequence number tells them apart in the result cache
+            self._camera_image_id = id(image)
+            self._camera_sequence_number = getattr(self.camera, "consumed_sequence_number", None)
+            return image
         output = self.camera.read()
         if len(output) == 2:
             success, image = output
@@ -140,6 +201,34 @@ class Vision:
         else:
             return output
 
+    async def get_image_async(self) -> np.ndarray:
+        """
+        Gets an image from `self.camera` without blocking the running event loop
+
+        `ovl.Camera` (and cameras of an `ovl.CameraGroup`) wake the event loop as soon as a new image is taken,
+        other cameras are read in the event loop's default executor.
+
+        :return: the image
+        """
+        if not isinstance(self.camera, (Camera, GroupCamera)):
+            return await asyncio.get_running_loop().run_in_executor(None, self.get_image)
+        if not self.camera.isOpened():
+            raise CameraError("The Vision's camera is not open (Has it been closed or disconnected?)")
+        return await self.camera.get_next_image_async(timeout=DEFAULT_NEXT_IMAGE_TIMEOUT)
+
+    def activate_camera_profile(self) -> None:
+        """
+        Switches `self.camera` to the vision's camera profile (`Vision.camera_profile`), if it has one,
+        images taken with the previous profile are not returned to the vision.
+
+        See `Camera.switch_profile` for more information
+        """
+        if self.camera_profile is None:
+            return
+        if not isinstance(self.camera, Camera):
+            raise CameraError(f"Camera profiles can only be used with an ovl.Camera, got {type(self.camera)}")
+        self.camera.switch_profile(self.camera_profile)
+
     def apply_target_filter(self, filter_function, targets):
         """
         Applies a filter function on the target list, this is used to remove targets
@@ -166,10 +255,21 @@ class Vision:
         Applies all target filters on a list of targets, one after the other.
         Applies the first filter and passes the output to the second filter,
 
+        Targets grouped by class (a dictionary of class name to targets, see `MultiClassThresholdDetector`)
+        are filtered separately for every class.
+
         :param targets: List of targets (numpy arrays or bounding boxes) to
         :return: a list of all ratios given by the filter functions in order.
 
         """
+        if isinstance(targets, dict):
+            return {class_name: self.apply_target_filters(class_targets)
+                    for class_name, class_targets in targets.items()}
+        if self.profiler is not None:
+            for index, target_filter in enumerate(self.target_filters):
+                targets = self.profiler.time(f"target_filter.{index}.{get_function_name(target_filter)}",
+                                             target_filter, targets)
+            return list(targets)
         return list(reduce(apply, self.target_filters, targets))
 
     def apply_image_filters(self, image: np.ndarray) -> np.ndarray:
@@ -181,8 +281,52 @@ class Vision:
         :param image: the image that the image filters should be applied on (numpy array)
         :return: the image with the filters applied
         """
+        if self.profiler is not None:
+            for index, image_filter in enumerate(self.image_filters):
+                image = self.profiler.time(f"image_filter.{index}.{get_function_name(image_filter)}", image_filter,
+                                           image)
+            return image
         return reduce(apply, self.image_filters, image)
 
+    def _detector_color_space(self) -> Union[ColorSpace, None]:
+        """
+        The color space the detector needs its images in: the color space of the threshold of a `ThresholdDetector`
+        (None for thresholds that work in any color space, like `BinaryThreshold`),
+        BGR for other detectors and thresholds, since their color space isn't known
+        """
+        if isinstance(self.detector, ThresholdDetector) and isinstance(self.detector.threshold, Threshold):
+            return self.detector.threshold.color_space
+        return ColorSpace.BGR
+
+    def apply_image_filters_in_color_space(self, image: np.ndarray, color_space: ColorSpace = ColorSpace.BGR
+                                           ) -> Tuple[np.ndarray, ColorSpace]:
+        """
+        Applies all the image filters, converting the image between color spaces as few times as possible.
+
+        Image filters declare the color spaces they can be applied on (see `image_filter`),
+        and thresholds declare the color space they threshold in (see `Threshold.color_space`),
+        for example a pipeline of `adaptive_brightness` and a `Color` converts the image to HSV once,
+        instead of BGR to HSV and back in the filter and to HSV again in the threshold.
+
+        :param image: the image that the image filters should be applied on (numpy array)
+        :param color_space: the color space of the image
+        :return: the image with the filters applied and the color space it is in
+        """
+        stages = [(getattr(image_filter, "color_spaces", (ColorSpace.BGR,)),
+                   getattr(image_filter, "output_color_space", None),
+                   getattr(image_filter, "native_color_space", None)) for image_filter in self.image_filters]
+        filter_color_spaces = plan_color_spaces(color_space, stages, self._detector_color_space())
+        for index, (image_filter, filter_color_space) in enumerate(zip(self.image_filters, filter_color_spaces)):
+            image = convert_color_space(image, color_space, filter_color_space)
+            color_space_arguments = getattr(image_filter, "color_spaces", {}).get(filter_color_space, {})
+            if self.profiler is None:
+                image = image_filter(image, **color_space_arguments)
+            else:
+                image = self.profiler.time(f"image_filter.{index}.{get_function_name(image_filter)}",
+                                           image_filter, image, **color_space_arguments)
+            color_space = getattr(image_filter, "output_color_space", None) or filter_color_space
+        return image, color_space
+
     def get_directions(self, targets: Iterable["Target"], image: np.ndarray) -> Any:
         """
         Calculates the directions, based on targets found in the given image
@@ -191,7 +335,208 @@ class Vision:
         :param image: the image
         :return: returns the direction
         """
-        return self.director.direct(targets, image)
+        if self.result_cache is not None:
+            cached, directions = self.result_cache.cached_directions(targets, image)
+            if cached:
+                return directions
+        if self.profiler is not None:
+            directions = self.profiler.time("direct", self.director.direct, targets, image)
+        else:
+            directions = self.director.direct(targets, image)
+        if self.result_cache is not None:
+            self.result_cache.put_directions(targets, image, directions)
+        return directions
+
+    def run_pipelined(self, queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE, drop_oldest: bool = True
+                      ) -> PipelinedRunner:
+        """
+        Runs the pipeline on images from `self.camera`, with every stage running in its own thread:
+        capture, image filters, detection (the detector and target filters) and directing.
+        The stages are connected by bounded queues, the results are returned in the order the images were taken.
+
+        .. code-block:: python
+
+            vision = ovl.Vision(threshold=ovl.HSV.yellow, camera=ovl.Camera(0), ...)
+
+            for directions, targets, image in vision.run_pipelined():
+                connection.send(directions)
+
+        See `PipelinedRunner` for more information
+
+        :param queue_size: the maximum amount of images waiting between every 2 stages
+        :param drop_oldest: if a stage should drop the oldest waiting image when the next stage falls behind
+         (keeping the results fresh), otherwise the stage waits and no image is dropped
+        :return: a `PipelinedRunner`, iterating it yields directions, targets and the filtered image
+        """
+        return PipelinedRunner(self, queue_size=queue_size, drop_oldest=drop_oldest)
+
+    def detect_batch(self, source: BatchSource, workers: int = None, stream: bool = False,
+                     chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE, max_pending: int = None,
+                     return_images: bool = True) -> Union[List[BatchResult], Iterator[BatchResult]]:
+        """
+        Detects targets in a set of images (like a recorded match) using a pool of processes,
+        the results are the same as calling `Vision.detect` on every image (except for tracking and pyramid detection,
+        see below) and are returned in the order of the images.
+
+        Every process receives a copy of the vision once when it starts (without the camera and the timings),
+        so only the images (and the results) are sent between the processes.
+
+        Images are split between several processes, so state that is carried from image to image is not shared:
+        tracking is disabled (every image is searched whole) and pyramid detection (`ThresholdDetector` with
+        max_downscale > 1) starts from the maximal downscale in every process and adapts only to the images
+        the process detected, so with pyramid detection the results might differ slightly from calling
+        `Vision.detect` on the images in order.
+        Image files and frame logs are read by the processes themselves, only their paths are sent.
+
+        .. code-block:: python
+
+            vision = ovl.Vision(threshold=ovl.HSV.yellow, target_filters=[ovl.area_filter(min_area=200)])
+
+            for targets, filtered_image in vision.detect_batch("match_12.avi", workers=8, stream=True):
+                print(len(targets))
+
+        Note: the image filters, target filters and detector must be picklable,
+        functions loaded with image_filter, target_filter and predicate_target_filter are,
+        lambdas and functions defined inside other functions are not.
+
+        :param source: the images - a directory of images, a video file, a `FrameLogReader`
+         or an iterable of images and image paths
+        :param workers: the amount of processes, None uses the amount of cpus, 1 detects in this process
+        :param stream: if the results should be returned as a generator (as they are ready)
+         instead of a list of all the results
+        :param chunk_size: the amount of images sent to a process at once
+        :param max_pending: the maximum amount of chunks being detected at once (and so kept in memory),
+         defaults to twice the workers
+        :param return_images: if the filtered images should be returned, otherwise None is returned in their place,
+         which saves sending the filtered images back from the processes
+        :return: a list (or a generator if stream) of the results (targets, filtered image) of every image
+        """
+        batch_vision = copy.copy(self)
+        batch_vision.tracker = None
+        results = iterate_batch_detection(batch_vision, source, workers=workers, chunk_size=chunk_size,
+                                          max_pending=max_pending, return_images=return_images)
+        return results if stream else list(results)
+
+    def enable_tracking(self, margin: float = DEFAULT_TRACKING_MARGIN,
+                        full_search_interval: int = DEFAULT_FULL_SEARCH_INTERVAL) -> RegionTracker:
+        """
+        Starts tracking the targets: after targets are found, the detector and the target filters run only
+        on the region of the next image around them (grown by a margin and by the estimated motion of the targets),
+        the targets are moved back to the coordinates of the whole image.
+
+        The whole image is searched when no targets were found in the region, when the targets touch the edge
+        of the region and every `full_search_interval` images.
+
+        Tracking requires a detector that returns contours or rectangles (x, y, width, height),
+        and is not used when arguments are passed to the detector through `Vision.detect`.
+
+        .. code-block:: python
+
+            vision = ovl.Vision(threshold=ovl.HSV.yellow, target_filters=[ovl.area_filter(min_area=200)], ...)
+            vision.enable_tracking(margin=0.5, full_search_interval=30)
+
+        :param margin: the amount the bounding box of the last targets is grown on every side,
+         relative to its width and height
+        :param full_search_interval: the maximum amount of images searched only in a region
+         before searching the whole image
+        :return: the `RegionTracker` choosing the regions
+        """
+        self.tracker = RegionTracker(margin=margin, full_search_interval=full_search_interval)
+        return self.tracker
+
+    def disable_tracking(self) -> None:
+        """
+        Stops tracking the targets, the detector runs on the whole image
+        """
+        self.tracker = None
+
+    def enable_result_cache(self, size: int = DEFAULT_RESULT_CACHE_SIZE,
+                            key: ResultCacheKey = ResultCacheKey.IDENTITY,
+                            content_hash_step: int = DEFAULT_CONTENT_HASH_STEP) -> ResultCache:
+        """
+        Starts caching the results of the latest images, so an image that is given to `Vision.detect` again
+        (for example when the camera returns the same image because no new image was taken yet)
+        returns the same targets and filtered image, and `Vision.get_directions` returns the same directions,
+        without recalculating them.
+
+        Images are recognized by identity (the same image object and camera sequence number) or by content,
+        see `ResultCacheKey`, images without a camera sequence number are always recognized by content.
+        Results are not cached when arguments are passed to the detector through `Vision.detect`.
+
+        .. code-block:: python
+
+            vision = ovl.Vision(threshold=ovl.HSV.yellow, camera=cv2.VideoCapture(0), ...)
+            cache = vision.enable_result_cache(key=ovl.ResultCacheKey.CONTENT)
+            ...
+            print(f"{cache.hits} images were processed again")
+
+        Note: images of an `ovl.Camera` that are changed in place after being processed (for example drawn on)
+        are recognized as the same image when using ResultCacheKey.IDENTITY.
+
+        :param size: the amount of latest images whose results are kept
+        :param key: how images are recognized, see `ResultCacheKey`
+        :param content_hash_step: the distance between sampled pixels when hashing the image content
+        :return: the `ResultCache`, holding the hit and miss counters
+        """
+        self.result_cache = ResultCache(size=size, key=key, content_hash_step=content_hash_step)
+        return self.result_cache
+
+    def disable_result_cache(self) -> None:
+        """
+        Stops caching the results of images
+        """
+        self.result_cache = None
+
+    def enable_timings(self, window: int = DEFAULT_TIMING_WINDOW) -> PipelineProfiler:
+        """
+        Starts measuring the time every stage of the pipeline takes, see `Vision.stats`
+
+        :param window: the amount of latest timings of every stage used to calculate the percentiles
+        :return: the `PipelineProfiler` collecting the timings
+        """
+        self.profiler = PipelineProfiler(window)
+        if self.detector is not None:
+            self.detector.profiler = self.profiler
+        return self.profiler
+
+    def disable_timings(self) -> None:
+        """
+        Stops measuring the time every stage of the pipeline takes
+        """
+        self.profiler = None
+        if self.detector is not None:
+            self.detector.profiler = None
+
+    def stats(self) -> Dict[str, StageStatistics]:
+        """
+        Returns the timings of every stage of the pipeline (count, mean, p50, p95, p99 and max in milliseconds),
+        timings are collected only when the vision was created with collect_timings=True
+        or after calling `Vision.enable_timings`.
+
+        The stages are:
+            detect - the whole `Vision.detect` call
+            image_filters - all the image filters, and image_filter.<position>.<name> - each image filter
+            detector - the detector, for a `ThresholdDetector` also:
+             threshold, morphological_functions and find_contours
+            target_filters - all the target filters, and target_filter.<position>.<name> - each target filter
+             (the position of the filter in the list, so the same filter used twice is timed separately)
+            direct - the director (`Vision.get_directions`)
+
+        .. code-block:: python
+
+            vision = ovl.Vision(threshold=ovl.HSV.yellow, collect_timings=True, ...)
+
+            for _ in range(1000):
+                targets, image = vision.detect(vision.get_image())
+
+            for stage, statistics in vision.stats().items():
+                print(f"{stage}: p50 {statistics.p50:.2f}ms p99 {statistics.p99:.2f}ms")
+
+        :return: a dictionary of stage names to `StageStatistics`, empty if timings are not collected
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.statistics()
 
     def camera_setup(self, source=0, image_width=None, image_height=None,
                      camera_configuration: CameraConfiguration = None, ovl_camera=False):
@@ -232,7 +577,7 @@ class Vision:
         self.camera = camera
         return camera
 
-    def detect(self, image, *args, **kwargs) -> Tuple[Iterable["Target"], "np.ndarray"]:
+    def detect(self, image: ImageOrContext, *args, **kwargs) -> Tuple[Iterable["Target"], "np.ndarray"]:
         """
         This is the function that performs processing, detection and filtering on a given image, essentially passing
         the image through the detection related part of the pipeline
@@ -243,11 +588,145 @@ class Vision:
 
         args and kwargs are passed to the detect function (passed to the detect method of the detector)
 
-        :param image: image in which the vision should detect an object
+        When tracking color spaces (track_color_space=True) the filtered image is returned in the color space
+        it ended up in, which is saved in `Vision.filtered_image_color_space` (HSV when using a color threshold).
+
+        The image can also be a `FrameContext` shared by several visions,
+        derived images (like the HSV image or images filtered by the same image filters) are then computed once
+        for all of them.
+
+        :param image: image (or FrameContext) in which the vision should detect an object
         :return: targets and the filtered image
 
         """
-        filtered_image = self.apply_image_filters(image)
-        targets = self.detector.detect(filtered_image, *args, **kwargs)
-        filtered_targets = self.apply_target_filters(targets)
-        return filtered_targets, filtered_image
+        if isinstance(image, FrameContext):
+            return self._detect_context(image, *args, **kwargs)
+        if self.result_cache is not None and not args and not kwargs:
+            return self._detect_cached(image)
+        if self.profiler is not None:
+            return self._detect_profiled(image, *args, **kwargs)
+        filtered_image, color_space = self._filter_image(image)
+        return self._detect_targets(filtered_image, color_space, *args, **kwargs), filtered_image
+
+    def _detect_cached(self, image) -> Tuple[Iterable["Target"], "np.ndarray"]:
+        """
+        Detects like `Vision.detect`, returning the cached results if the image was already processed,
+        see `Vision.enable_result_cache`
+        """
+        cache = self.result_cache
+        sequence_number = self._camera_sequence_number if id(image) == self._camera_image_id else None
+        key = cache.image_key(image, sequence_number)
+        entry = cache.get(key, image)
+        if entry is not None:
+            return entry.targets, entry.filtered_image
+        if self.profiler is not None:
+            targets, filtered_image = self._detect_profiled(image)
+        else:
+            filtered_image, color_space = self._filter_image(image)
+            targets = self._detect_targets(filtered_image, color_space)
+        cache.put(key, image, targets, filtered_image)
+        return targets, filtered_image
+
+    def _detect_context(self, context: FrameContext, *args, **kwargs) -> Tuple[Iterable["Target"], "np.ndarray"]:
+        """
+        Detects like `Vision.detect` in the image of a `FrameContext`,
+        taking the filtered image and the images the detector needs from the context
+        """
+        if self.track_color_space or self.result_cache is not None:
+            return self.detect(context.bgr, *args, **kwargs)
+        profiler = self.profiler
+        if self.tracker is not None and not args and not kwargs:
+            if profiler is None:
+                filtered_context = context.filtered_by(self.image_filters)
+                return self._detect_targets(filtered_context.image, ColorSpace.BGR), filtered_context.image
+            with profiler.measure("detect"):
+                with profiler.measure("image_filters"):
+                    filtered_context = context.filtered_by(self.image_filters)
+                targets = self._detect_targets(filtered_context.image, ColorSpace.BGR)
+            return targets, filtered_context.image
+        if profiler is None:
+            filtered_context = context.filtered_by(self.image_filters)
+            targets = self.detector.detect_context(filtered_context, *args, **kwargs)
+            return self.apply_target_filters(targets), filtered_context.image
+        with profiler.measure("detect"):
+            with profiler.measure("image_filters"):
+                filtered_context = context.filtered_by(self.image_filters)
+            with profiler.measure("detector"):
+                targets = self.detector.detect_context(filtered_context, *args, **kwargs)
+            with profiler.measure("target_filters"):
+                targets = self.apply_target_filters(targets)
+        return targets, filtered_context.image
+
+    def _detect_profiled(self, image, *args, **kwargs) -> Tuple[Iterable["Target"], "np.ndarray"]:
+        """
+        Detects like `Vision.detect` while timing every stage, see `Vision.stats`
+        """
+        profiler = self.profiler
+        with profiler.measure("detect"):
+            with profiler.measure("image_filters"):
+                filtered_image, color_space = self._filter_image(image)
+            targets = self._detect_targets(filtered_image, color_space, *args, **kwargs)
+        return targets, filtered_image
+
+    def _detect_targets(self, image: np.ndarray, color_space: ColorSpace, *args, **kwargs):
+        """
+        Detects and filters targets in a filtered image,
+        when tracking only the region around the last targets is searched (see `Vision.enable_tracking`)
+        """
+        tracker = self.tracker
+        if tracker is None or args or kwargs:
+            return self._detect_in_region(image, color_space, None, *args, **kwargs)
+        image_dimensions = (image.shape[1], image.shape[0])
+        region = tracker.region(image_dimensions)
+        if region is not None:
+            targets = self._detect_in_region(image, color_space, region)
+            box = targets_bounding_box(targets)
+            if box is not None and not tracker.touches_edge(box, region, image_dimensions):
+                tracker.update(box, full_search=False)
+                return targets
+        targets = self._detect_in_region(image, color_space, None)
+        tracker.update(targets_bounding_box(targets), full_search=True)
+        return targets
+
+    def _detect_in_region(self, image: np.ndarray, color_space: ColorSpace, region: Union[Region, None],
+                          *args, **kwargs):
+        """
+        Runs the detector and the target filters on a region (x, y, width, height) of the image,
+        the targets are returned in the coordinates of the whole image
+        """
+        if region is not None:
+            x, y, width, height = region
+            image = image[y:y + height, x:x + width]
+        if self.profiler is None:
+            targets = self._run_detector(image, color_space, *args, **kwargs)
+            if region is not None:
+                targets = translate_targets(targets, (x, y))
+            return self.apply_target_filters(targets)
+        with self.profiler.measure("detector"):
+            targets = self._run_detector(image, color_space, *args, **kwargs)
+            if region is not None:
+                targets = translate_targets(targets, (x, y))
+        with self.profiler.measure("target_filters"):
+            return self.apply_target_filters(targets)
+
+    def _filter_image(self, image: np.ndarray) -> Tuple[np.ndarray, ColorSpace]:
+        """
+        Applies the image filters, tracking the color space of the image if `Vision.track_color_space`
+
+        :return: the filtered image and its color space
+        """
+        if not self.track_color_space:
+            return self.apply_image_filters(image), ColorSpace.BGR
+        filtered_image, color_space = self.apply_image_filters_in_color_space(image)
+        self.filtered_image_color_space = color_space
+        return filtered_image, color_space
+
+    def _run_detector(self, image: np.ndarray, color_space: ColorSpace, *args, **kwargs):
+        """
+        Detects targets in a filtered image, converting the image to the color space the detector needs
+        """
+        if not self.track_color_space:
+            return self.detector.detect(image, *args, **kwargs)
+        if isinstance(self.detector, ThresholdDetector):
+            return self.detector.detect(image, *args, color_space=color_space, **kwargs)
+        return self.detector.detect(convert_color_space(image, color_space, ColorSpace.BGR), *args, **kwargs)